@@ -0,0 +1,61 @@
+"""Measure build time and query latency of the autocomplete name index.
+
+Names are drawn from a small vocabulary so that short prefixes match large
+parts of the catalog, the worst case of a prefix index.
+
+    python -m benchmarks.autocomplete --names 100000 --queries 2000
+"""
+import argparse
+import random
+import statistics
+import string
+import time
+
+from src.services.autocomplete import KINDS, NameIndex
+
+
+def generate(names: int, seed: int) -> list[tuple[str, str, str]]:
+    generator = random.Random(seed)
+    vocabulary = [
+        ''.join(generator.choices(string.ascii_lowercase, k=generator.randint(3, 9))).title()
+        for _ in range(5000)
+    ]
+    kinds = list(KINDS)
+    return [
+        (generator.choice(kinds), str(number), ' '.join(generator.choices(vocabulary, k=generator.randint(1, 4))))
+        for number in range(names)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--names', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rows = generate(args.names, args.seed)
+    generator = random.Random(args.seed)
+    popularity = {(kind, obj_id): generator.paretovariate(1) for kind, obj_id, _ in rows}
+    index = NameIndex()
+    started = time.perf_counter()
+    index.build(rows, popularity)
+    build_seconds = time.perf_counter() - started
+
+    durations = []
+    for _ in range(args.queries):
+        name = generator.choice(rows)[2]
+        q = name[:generator.randint(1, min(len(name), 6))]
+        started = time.perf_counter()
+        index.search(q, limit=10)
+        durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    print(f'names {args.names}, build {build_seconds:.2f} s')
+    print(
+        f'query ms: p50 {statistics.median(durations):.2f}, '
+        f'p95 {durations[int(len(durations) * 0.95)]:.2f}, max {durations[-1]:.2f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Measure publish cost and delivery time of the change feed by number of clients.
+
+    python -m benchmarks.change_feed --clients 10 100 1000 --events 1000
+"""
+import argparse
+import asyncio
+import time
+
+from src.services.changes import ChangeFeed
+from src.services.events import PATCH, CatalogEvent
+
+
+async def run(clients: int, events: int) -> tuple[float, float]:
+    feed = ChangeFeed(capacity=10000, client_buffer=events)
+    received = [0] * clients
+
+    async def consume(number: int) -> None:
+        async for chunk in feed.stream(last_event_id=None, heartbeat=60, max_duration=60):
+            received[number] += chunk.count('\nid: ') + chunk.startswith('id: ')
+            if received[number] >= events:
+                return
+
+    tasks = [asyncio.create_task(consume(number)) for number in range(clients)]
+    await asyncio.sleep(0.1)
+    publish_seconds = 0.0
+    started = time.perf_counter()
+    for number in range(events):
+        publish_started = time.perf_counter()
+        feed.publish(CatalogEvent(entity='games', action=PATCH, entity_id=str(number)))
+        publish_seconds += time.perf_counter() - publish_started
+        if number % 100 == 99:
+            await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return publish_seconds / events * 1_000_000, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--events', type=int, default=1000)
+    args = parser.parse_args()
+    for clients in args.clients:
+        publish_us, total_seconds = asyncio.run(run(clients, args.events))
+        print(f'clients {clients}: publish {publish_us:.1f} us/event, all delivered in {total_seconds:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
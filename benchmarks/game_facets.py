@@ -0,0 +1,71 @@
+"""Measure build time and facet count latency of the game facets index.
+
+Generates a synthetic catalog with power law entity popularity and random
+final prices, then counts facets for random price ranges.
+
+    python -m benchmarks.game_facets --games 100000 --queries 500
+"""
+import argparse
+import itertools
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from src.services.facets import GameFacets
+
+ENTITIES = {
+    'genres': (40, 3),
+    'publishers': (5000, 1),
+    'platforms': (8, 2)
+}
+PRICE_BUCKETS = [Decimal(5), Decimal(10), Decimal(20), Decimal(40)]
+
+
+def generate(games: int, seed: int) -> list[tuple]:
+    generator = random.Random(seed)
+    choices = {}
+    for relation, (count, per_game) in ENTITIES.items():
+        population = range(count)
+        choices[relation] = (population, list(itertools.accumulate(1 / (rank + 1) for rank in population)), per_game)
+    rows = []
+    for game in range(games):
+        relations = []
+        for relation, (population, cum_weights, per_game) in choices.items():
+            chosen = generator.choices(population, cum_weights=cum_weights, k=generator.randint(1, per_game))
+            relations.extend((relation, f'{relation}_{entity}') for entity in set(chosen))
+        final_price = Decimal(generator.randint(0, 7000)) / 100
+        rows.append((f'game_{game}', final_price, generator.randint(1990, 2024), relations))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rows = generate(args.games, args.seed)
+    index = GameFacets(price_buckets=PRICE_BUCKETS)
+    started = time.perf_counter()
+    index.build(rows)
+    build_seconds = time.perf_counter() - started
+
+    generator = random.Random(args.seed)
+    durations = []
+    for _ in range(args.queries):
+        low, high = sorted(Decimal(generator.randint(0, 7000)) / 100 for _ in range(2))
+        started = time.perf_counter()
+        index.counts(min_final_price=low, max_final_price=high)
+        durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    print(f'games {args.games}, build {build_seconds:.2f} s')
+    print(
+        f'counts ms: p50 {statistics.median(durations):.2f}, '
+        f'p95 {durations[int(len(durations) * 0.95)]:.2f}, max {durations[-1]:.2f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
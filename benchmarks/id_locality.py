@@ -0,0 +1,62 @@
+"""Compare primary key index growth for uuid1, uuid4 and uuid7 ids on SQLite.
+
+Bulk loads rows in batches, like a catalog import, into a table keyed by a
+CHAR(32) id (the default storage) and reports the size of the primary key
+index and the load time:
+
+    python -m benchmarks.id_locality --rows 200000 --batch 1000
+
+uuid7 ids append to the right edge of the btree. uuid4 ids land anywhere.
+uuid1 leads with the low 32 bits of its 100 ns timestamp: a short burst from
+one process looks sequential, but the prefix wraps every ~7 minutes and
+differs between processes, so long running loads scatter like uuid4.
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from src.models.ids import ID_GENERATORS
+
+
+def run(generator, rows: int, batch: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        connection = sqlite3.connect(os.path.join(directory, 'bench.db'))
+        connection.execute('CREATE TABLE games (id CHAR(32) PRIMARY KEY, name VARCHAR(75))')
+        started = time.perf_counter()
+        for start in range(0, rows, batch):
+            with connection:
+                connection.executemany(
+                    'INSERT INTO games (id, name) VALUES (?, ?)',
+                    [(generator().hex, f'game_{number}') for number in range(start, min(start + batch, rows))]
+                )
+        duration = time.perf_counter() - started
+        index_pages, index_bytes, unused_bytes = connection.execute(
+            "SELECT count(*), sum(pgsize), sum(unused) FROM dbstat WHERE name LIKE 'sqlite_autoindex_games%'"
+        ).fetchone()
+        connection.close()
+    return {
+        'seconds': duration,
+        'index_pages': index_pages,
+        'index_kib': index_bytes / 1024,
+        'fill': 1 - unused_bytes / index_bytes
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args()
+    print(f'{"generator":<10}{"load, s":>10}{"index pages":>13}{"index, KiB":>12}{"page fill":>11}')
+    for name, generator in ID_GENERATORS.items():
+        result = run(generator, args.rows, args.batch)
+        print(
+            f'{name:<10}{result["seconds"]:>10.2f}{result["index_pages"]:>13}'
+            f'{result["index_kib"]:>12.0f}{result["fill"]:>11.0%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
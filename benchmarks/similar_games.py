@@ -0,0 +1,68 @@
+"""Measure build time and query latency of the similar games index.
+
+Generates a synthetic catalog where entity popularity follows a power law,
+like real catalogs: a few platforms and genres cover most games, developers
+and publishers have a long tail.
+
+    python -m benchmarks.similar_games --games 100000 --queries 2000
+"""
+import argparse
+import itertools
+import random
+import statistics
+import time
+
+from src.services.similar import SimilarGames
+
+ENTITIES = {
+    'genres': (40, 3),
+    'developers': (20000, 1),
+    'publishers': (5000, 1),
+    'platforms': (8, 2)
+}
+WEIGHTS = {'genres': 1.0, 'developers': 2.0, 'publishers': 1.5, 'platforms': 0.5}
+
+
+def generate(games: int, seed: int) -> list[tuple[str, str, str]]:
+    generator = random.Random(seed)
+    links = []
+    for relation, (count, per_game) in ENTITIES.items():
+        population = range(count)
+        cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in population))
+        for game in range(games):
+            chosen = generator.choices(population, cum_weights=cum_weights, k=generator.randint(1, per_game))
+            for entity in set(chosen):
+                links.append((f'game_{game}', relation, f'{relation}_{entity}'))
+    return links
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--max-posting', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    links = generate(args.games, args.seed)
+    index = SimilarGames(weights=WEIGHTS, max_posting=args.max_posting)
+    started = time.perf_counter()
+    index.build(links)
+    build_seconds = time.perf_counter() - started
+
+    sample = random.Random(args.seed).sample(range(args.games), min(args.queries, args.games))
+    durations = []
+    for game in sample:
+        started = time.perf_counter()
+        index.similar(f'game_{game}', limit=10)
+        durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    print(f'games {args.games}, links {len(links)}, build {build_seconds:.2f} s')
+    print(
+        f'query ms: p50 {statistics.median(durations):.2f}, '
+        f'p95 {durations[int(len(durations) * 0.95)]:.2f}, max {durations[-1]:.2f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
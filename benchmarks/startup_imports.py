@@ -0,0 +1,35 @@
+"""Measure the import time of the app against the startup budget.
+
+Imports the module in fresh interpreters with `-X importtime` and reports
+the median total and the slowest modules of the median run:
+
+    python -m benchmarks.startup_imports --runs 5 --budget 2.0
+
+Exits with status 1 when the median exceeds the budget. Wall-clock time
+depends on the machine and its load, so this is not part of the test suite;
+tests/test_startup.py checks that heavy subsystems stay deferred.
+"""
+import argparse
+import statistics
+import sys
+
+from src.core.profiling import format_report, profile_imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='src.main')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=2.0, help='seconds')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    profiles = sorted((profile_imports(args.module) for _ in range(args.runs)), key=lambda item: item.total_seconds)
+    median = statistics.median(profile.total_seconds for profile in profiles)
+    print(format_report(profiles[len(profiles) // 2], top=args.top))
+    print(f'median of {args.runs} runs: {median:.3f} s, budget {args.budget:.3f} s')
+    if median > args.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
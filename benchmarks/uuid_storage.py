@@ -0,0 +1,76 @@
+"""Compare CHAR(32) and BINARY(16) uuid storage on SQLite.
+
+Builds an association-like table (entity_id, game_id) with its reverse index
+in both storage modes, then reports database size and point lookup speed:
+
+    python -m benchmarks.uuid_storage --rows 200000 --lookups 20000
+
+Postgres stores native `uuid` in both modes, so only SQLite is measured.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import Column, Index, MetaData, Table, create_engine
+from sqlalchemy_utils import UUIDType
+
+
+def build_table(binary: bool) -> Table:
+    metadata = MetaData()
+    table = Table(
+        'links',
+        metadata,
+        Column('entity_id', UUIDType(binary=binary), primary_key=True),
+        Column('game_id', UUIDType(binary=binary), primary_key=True)
+    )
+    Index('ix_links_game_id_entity_id', table.c.game_id, table.c.entity_id)
+    return table
+
+
+def run(binary: bool, rows: int, lookups: int) -> dict:
+    table = build_table(binary)
+    entity_ids = [uuid.uuid1() for _ in range(max(rows // 100, 1))]
+    game_ids = [uuid.uuid1() for _ in range(rows)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        engine = create_engine(f'sqlite:///{path}')
+        table.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(table.insert(), [
+                {'entity_id': random.choice(entity_ids), 'game_id': game_id} for game_id in game_ids
+            ])
+        with engine.connect() as connection:
+            connection.exec_driver_sql('VACUUM')
+        size = os.path.getsize(path)
+        # Bind raw stored values, so the timing is the index seek, not ORM work.
+        sample = [
+            game_id.bytes if binary else game_id.hex
+            for game_id in random.sample(game_ids, min(lookups, rows))
+        ]
+        raw_connection = engine.raw_connection()
+        cursor = raw_connection.cursor()
+        started = time.perf_counter()
+        for game_id in sample:
+            cursor.execute('SELECT entity_id FROM links WHERE game_id = ?', (game_id,)).fetchall()
+        duration = time.perf_counter() - started
+        raw_connection.close()
+        engine.dispose()
+    return {'size': size, 'lookup_us': duration / len(sample) * 1_000_000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--lookups', type=int, default=10_000)
+    args = parser.parse_args()
+    print(f'{"storage":<12}{"db size, KiB":>14}{"lookup, us":>12}')
+    for name, binary in (('CHAR(32)', False), ('BINARY(16)', True)):
+        result = run(binary, args.rows, args.lookups)
+        print(f'{name:<12}{result["size"] / 1024:>14.0f}{result["lookup_us"]:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
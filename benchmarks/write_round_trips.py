@@ -0,0 +1,114 @@
+"""Count statements and time per write of the repositories on SQLite.
+
+Runs genre and game creates and patches through the repositories, once as they
+are and once followed by the full `refresh` the write path used to make:
+
+    python -m benchmarks.write_round_trips --writes 200
+
+Every statement is a round trip to the database server on Postgres.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.db.db import Base
+from src.schemas.games import GameCreate, GameUpdate
+from src.schemas.genres import GenreCreate
+from src.services.base import game_crud, genre_crud
+
+
+async def no_lookup(db, number):
+    return None
+
+
+async def genre_create(db, number, obj):
+    return await genre_crud.create(db=db, obj_in=GenreCreate(name=f'genre_{number}', description='genre'))
+
+
+async def genre_lookup(db, number):
+    return await genre_crud.get_by_slug(db=db, slug=f'genre-{number}')
+
+
+async def genre_patch(db, number, genre):
+    return await genre_crud.patch(db=db, genre_obj=genre, obj_in={'description': f'patched_{number}'})
+
+
+async def game_create(db, number, obj):
+    obj_in = GameCreate(
+        name=f'game_{number}',
+        price='10.00',
+        description='game',
+        release_date=date(2020, 1, 1),
+        genres=[f'genre_{number}'],
+        developers=[],
+        publishers=[],
+        platforms=[]
+    )
+    return await game_crud.create(db=db, obj_in=obj_in)
+
+
+async def game_lookup(db, number):
+    return await game_crud.get_by_name(db=db, obj_in={'name': f'game_{number}'})
+
+
+async def game_patch(db, number, game):
+    return await game_crud.patch(db=db, obj=game, obj_in=GameUpdate(description=f'patched_{number}'))
+
+
+OPERATIONS = (
+    ('genre create', no_lookup, genre_create),
+    ('genre patch', genre_lookup, genre_patch),
+    ('game create', no_lookup, game_create),
+    ('game patch', game_lookup, game_patch)
+)
+
+
+async def run(writes: int, reload: bool) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f'sqlite+aiosqlite:///{os.path.join(directory, "bench.db")}')
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            'before_cursor_execute',
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+        results = {}
+        for name, lookup, write in OPERATIONS:
+            count = 0
+            duration = 0.0
+            for number in range(writes):
+                async with session_maker() as db:
+                    obj = await lookup(db, number)
+                    started_statements = len(statements)
+                    started = time.perf_counter()
+                    obj = await write(db, number, obj)
+                    if reload:
+                        await db.refresh(obj)
+                    duration += time.perf_counter() - started
+                    count += len(statements) - started_statements
+            results[name] = (count / writes, duration / writes * 1000)
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writes', type=int, default=100)
+    args = parser.parse_args()
+    print(f'{"write":<14}{"path":<10}{"statements":>12}{"ms":>8}')
+    for path, reload in (('refresh', True), ('in hand', False)):
+        for name, (count, milliseconds) in asyncio.run(run(args.writes, reload)).items():
+            print(f'{name:<14}{path:<10}{count:>12.1f}{milliseconds:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,11 @@ from .endpoints.publishers import router as publishers_router
 from .endpoints.developers import router as developers_router
 from .endpoints.platforms import router as platforms_router
 from .endpoints.games import router as games_router
+from .endpoints.campaigns import router as campaigns_router
+from .endpoints.stats import router as stats_router
+from .endpoints.autocomplete import router as autocomplete_router
+from .endpoints.catalog import router as catalog_router
+from .endpoints.metrics import router as metrics_router
 
 
 
@@ -53,3 +58,33 @@ api_router.include_router(
     prefix='/games',
     tags=['games']
 )
+
+api_router.include_router(
+    campaigns_router,
+    prefix='/campaigns',
+    tags=['campaigns']
+)
+
+api_router.include_router(
+    autocomplete_router,
+    prefix='/autocomplete',
+    tags=['autocomplete']
+)
+
+api_router.include_router(
+    catalog_router,
+    prefix='/catalog',
+    tags=['catalog']
+)
+
+api_router.include_router(
+    stats_router,
+    prefix='/stats',
+    tags=['stats']
+)
+
+api_router.include_router(
+    metrics_router,
+    prefix='/metrics',
+    tags=['metrics']
+)
@@ -8,10 +8,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.db import get_session
 from src.schemas import auth as auth_schema, users as user_schema
 from src.services.authorization import get_token
+from src.core.deadline import DeadlineRoute
 
 logger = logging.getLogger()
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post(
@@ -0,0 +1,38 @@
+import logging.config
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.db import get_session
+from src.models.models import User
+from src.schemas import autocomplete as autocomplete_schema
+from src.services.authorization import get_current_user
+from src.services.autocomplete import MAX_SUGGESTIONS, autocomplete
+from src.core.deadline import DeadlineRoute
+
+logger = logging.getLogger('autocomplete')
+
+router = APIRouter(route_class=DeadlineRoute)
+
+
+@router.get(
+    '/',
+    response_model=autocomplete_schema.SuggestionMulti,
+    status_code=status.HTTP_200_OK,
+    description='Suggest games, publishers and developers by name.'
+)
+async def get_suggestions(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        q: str = Query(..., min_length=1, max_length=75),
+        limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS)
+) -> Any:
+    """
+    Names starting with `q` or with a word starting with `q`, most popular
+    first, topped up by names containing `q`.
+    """
+    suggestions = await autocomplete(db=db, q=q, limit=limit)
+    logger.debug('Return %s suggestions for %r to user with id %s', len(suggestions), q, current_user.id)
+    return suggestions
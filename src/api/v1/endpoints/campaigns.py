@@ -0,0 +1,118 @@
+import logging.config
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.db import get_session
+from src.models.models import User
+from src.schemas import campaigns as campaigns_schema
+from src.services.authorization import get_current_user
+from src.services.base import campaign_crud
+from src.services.campaign_scheduler import get_campaign_scheduler
+from src.tools.campaigns import check_campaign_by_id
+from src.tools.users import check_staff_permission
+from src.core.deadline import DeadlineRoute
+
+logger = logging.getLogger('campaigns')
+
+router = APIRouter(route_class=DeadlineRoute)
+
+
+@router.post(
+    '/',
+    response_model=campaigns_schema.CampaignInDB,
+    status_code=status.HTTP_201_CREATED,
+    description='Schedule new pricing campaign.'
+)
+async def create_campaign(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        campaign_in: campaigns_schema.CampaignCreate
+) -> Any:
+    """
+    Schedule discount of games selected by ids and by genre, publisher or
+    platform for the window from `starts_at` to `ends_at`.
+    """
+    check_staff_permission(cur_user_obj=current_user)
+    campaign = await campaign_crud.create(db=db, obj_in=campaign_in)
+    get_campaign_scheduler().wake()
+    logger.info('Schedule campaign %s, by user - %s', campaign.name, current_user.username)
+    return campaign
+
+
+@router.get(
+    '/',
+    response_model=campaigns_schema.CampaignMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get list of pricing campaigns.'
+)
+async def get_campaigns(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        campaign_status: str | None = Query(None, alias='status'),
+        skip: int = 0,
+        limit: int = 100
+) -> Any:
+    """
+    Retrieve campaigns ordered by start, optionally by status.
+    """
+    check_staff_permission(cur_user_obj=current_user)
+    campaigns = await campaign_crud.get_multi(db=db, skip=skip, limit=limit, status=campaign_status)
+    logger.info('Return list of campaigns to user with id %s', current_user.id)
+    return campaigns
+
+
+@router.get(
+    '/{campaign_id}',
+    response_model=campaigns_schema.CampaignInDB,
+    status_code=status.HTTP_200_OK,
+    description='Get pricing campaign by id.'
+)
+async def get_campaign(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        campaign_id: str
+) -> Any:
+    """
+    Get campaign by id.
+    """
+    check_staff_permission(cur_user_obj=current_user)
+    campaign_obj = await check_campaign_by_id(db=db, campaign_id=campaign_id)
+    logger.info('Return campaign with id %s to user with id %s', campaign_obj.id, current_user.id)
+    return campaign_obj
+
+
+@router.delete(
+    '/{campaign_id}',
+    description='Cancel pricing campaign.',
+    responses={
+        status.HTTP_200_OK: {
+            'model': campaigns_schema.CampaignDelete,
+            'description': 'Cancel pricing campaign.'
+        }
+    }
+)
+async def delete_campaign(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        campaign_id: str
+) -> Any:
+    """
+    Delete campaign, discounts of an active campaign are restored first.
+    """
+    check_staff_permission(cur_user_obj=current_user)
+    campaign_obj = await check_campaign_by_id(db=db, campaign_id=campaign_id)
+    await campaign_crud.delete(db=db, obj=campaign_obj)
+    get_campaign_scheduler().wake()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            'info': f'Campaign {campaign_id} has been deleted.'
+        }
+    )
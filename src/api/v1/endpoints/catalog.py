@@ -0,0 +1,48 @@
+import logging.config
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import app_settings
+from src.db.db import get_session
+from src.models.models import User
+from src.services.authorization import get_current_user
+from src.services.changes import change_feed
+from src.core.deadline import DeadlineRoute
+
+logger = logging.getLogger('catalog')
+
+router = APIRouter(route_class=DeadlineRoute)
+
+
+@router.get(
+    '/changes/stream',
+    response_class=StreamingResponse,
+    description='Stream create, patch and delete events of the catalog as server-sent events.'
+)
+async def get_changes_stream(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        last_event_id: str | None = Header(None)
+) -> StreamingResponse:
+    """
+    Changes of games, genres, publishers, developers and platforms, those
+    of other workers arrive through the outbox relay. Reconnect with
+    `Last-Event-ID` to continue after the last received event, a `reset`
+    event means changes were missed.
+    """
+    # The session lives until the response ends, return its connection to
+    # the pool instead of holding it for the whole stream.
+    await db.close()
+    logger.info('Stream catalog changes to user with id %s', current_user.id)
+    return StreamingResponse(
+        change_feed.stream(
+            last_event_id=last_event_id,
+            heartbeat=app_settings.change_feed_heartbeat,
+            max_duration=app_settings.change_feed_max_duration
+        ),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -1,21 +1,26 @@
 import logging.config
-from typing import Any
+import uuid
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Response, Header
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.db import get_session
-from src.models.models import User
+from src.models.models import User, Developer
 from src.schemas import pub_dev as pub_dev_schema
+from src.schemas import games as games_schema
 from src.services.authorization import get_current_user
 from src.tools.developers import check_developer_by_id, check_duplicating_developer
+from src.tools.games import get_linked_game_cards
 from src.tools.users import check_staff_permission
 from src.services.base import developer_crud
+from src.core.deadline import DeadlineRoute
+from src.tools.base import set_total_count_header, check_if_match, set_etag_header
 
 logger = logging.getLogger('developers')
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post(
@@ -55,13 +60,17 @@ async def get_developers(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
+        response: Response,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        with_total: bool = False
 ) -> Any:
     """
     Retrieve developers.
     """
     developers = await developer_crud.get_multi(db=db, skip=skip, limit=limit)
+    if with_total:
+        await set_total_count_header(response=response, db=db, model=Developer)
     logger.info('Return list of developers to user with id %s', current_user.id)
     return developers
 
@@ -76,16 +85,50 @@ async def get_developer(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        developer_id: str
+        developer_id: str,
+        response: Response
 ) -> Any:
     """
     Get developer by id.
     """
     developer_obj = await check_developer_by_id(db=db, developer_id=developer_id)
     logger.info('Return developer info with id %s to user with id %s', developer_obj.id, current_user.id)
+    set_etag_header(response=response, obj=developer_obj)
     return developer_obj
 
 
+@router.get(
+    '/{developer_id}/games',
+    response_model=games_schema.GameCardMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get page of developer games, cursor of the next page is in X-Next-Cursor header.'
+)
+async def get_developer_games(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        response: Response,
+        developer_id: str,
+        after: Optional[uuid.UUID] = None,
+        limit: int = Query(50, ge=1, le=500)
+) -> Any:
+    """
+    Retrieve games of developer with keyset pagination.
+    """
+    cards = await get_linked_game_cards(
+        db=db,
+        response=response,
+        entity='developers',
+        entity_id=developer_id,
+        after=after,
+        limit=limit
+    )
+    if not cards:
+        await check_developer_by_id(db=db, developer_id=developer_id)
+    logger.info('Return games of developer with id %s to user with id %s', developer_id, current_user.id)
+    return cards
+
+
 @router.patch(
     '/{developer_id}',
     response_model=pub_dev_schema.PubDevInDB,
@@ -97,13 +140,16 @@ async def patch_developer(
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
         developer_id: str,
-        developer_in: pub_dev_schema.PubDevUpdate
+        developer_in: pub_dev_schema.PubDevUpdate,
+        response: Response,
+        if_match: str | None = Header(None)
 ) -> Any:
     """
     Patch developer info.
     """
     check_staff_permission(cur_user_obj=current_user)
     developer_obj = await check_developer_by_id(db=db, developer_id=developer_id)
+    check_if_match(if_match=if_match, obj=developer_obj)
     developer_name_before = developer_obj.name
     await check_duplicating_developer(developer_in=developer_in, db=db, developer_obj=developer_obj)
     developer_obj_patched = await developer_crud.patch(
@@ -116,6 +162,7 @@ async def patch_developer(
         developer_name_before,
         developer_obj_patched.name if developer_name_before != developer_obj_patched.name else developer_name_before
     )
+    set_etag_header(response=response, obj=developer_obj_patched)
     return developer_obj_patched
 
 
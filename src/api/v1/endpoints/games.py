@@ -1,21 +1,41 @@
 import logging.config
+import uuid
+from decimal import Decimal
 from typing import Any
 
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, Query, Response, Header
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.db import get_session
-from src.models.models import User
+from src.models.models import User, Game
 from src.schemas import games as games_schema
 from src.services.authorization import get_current_user
-from src.tools.games import check_game_by_id, check_duplicating_game
+from src.tools.base import (
+    set_total_count_header,
+    unique_violation_as_400,
+    check_if_match,
+    set_etag_header,
+    etag_matches,
+    entity_tag
+)
+from src.tools.games import (
+    check_game_by_id,
+    check_cursor_sort,
+    get_games_batch,
+    get_similar_games,
+    get_game_facets,
+    GAME_NAME_CONSTRAINT
+)
 from src.tools.users import check_staff_permission
 from src.services.base import game_crud
+from src.services.game_cards import game_card_crud
+from src.services.autocomplete import name_index
+from src.core.deadline import DeadlineRoute
 
 logger = logging.getLogger('games')
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post(
@@ -34,13 +54,8 @@ async def create_game(
     Create new game.
     """
     check_staff_permission(current_user)
-    game_obj = await game_crud.get_by_name(db=db, obj_in=game_in)
-    if game_obj:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail='Game with this name exists.'
-        )
-    game = await game_crud.create(db=db, obj_in=game_in)
+    async with unique_violation_as_400(db, GAME_NAME_CONSTRAINT, 'Game with this name exists.'):
+        game = await game_crud.create(db=db, obj_in=game_in)
     logger.info('Create game - %s, by user - %s,', game.name, current_user.username)
     return game
 
@@ -55,17 +70,174 @@ async def get_games(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
+        response: Response,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        sort: games_schema.GameSort | None = None,
+        min_final_price: Decimal | None = None,
+        max_final_price: Decimal | None = None,
+        after: uuid.UUID | None = None,
+        with_total: bool = False
 ) -> Any:
     """
-    Retrieve games.
+    Retrieve games, optionally sorted and filtered by final price.
+    With `added` sorting `after` continues from the given game id and
+    X-Next-Cursor holds the cursor of the next page.
     """
-    games = await game_crud.get_multi(db=db, skip=skip, limit=limit)
+    check_cursor_sort(sort=sort, after=after)
+    games = await game_crud.get_multi(
+        db=db,
+        skip=skip,
+        limit=limit,
+        sort=sort,
+        min_final_price=min_final_price,
+        max_final_price=max_final_price,
+        after=after
+    )
+    if sort in (games_schema.GameSort.ADDED, games_schema.GameSort.RECENTLY_ADDED) and len(games) == limit:
+        response.headers['X-Next-Cursor'] = str(games[-1].id)
+    if with_total:
+        await set_total_count_header(
+            response=response,
+            db=db,
+            model=Game,
+            filters=game_crud.price_filters(min_final_price=min_final_price, max_final_price=max_final_price),
+            cache_key=('final_price', min_final_price, max_final_price)
+        )
     logger.info('Return list of games to user with id %s', current_user.id)
     return games
 
 
+@router.get(
+    '/catalog/',
+    response_model=games_schema.GameCardMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get catalog page of game cards, optionally searched by name.'
+)
+async def get_game_cards(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        q: str | None = None,
+        skip: int = 0,
+        limit: int = 50
+) -> Any:
+    """
+    Retrieve game cards.
+    """
+    cards = await game_card_crud.get_multi(db=db, skip=skip, limit=limit, q=q)
+    logger.info('Return catalog page to user with id %s', current_user.id)
+    return cards
+
+
+@router.get(
+    '/facets',
+    response_model=games_schema.GameFacets,
+    status_code=status.HTTP_200_OK,
+    description='Get numbers of games per genre, platform, publisher, price bucket and release year.'
+)
+async def get_games_facets(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        min_final_price: Decimal | None = None,
+        max_final_price: Decimal | None = None,
+        limit: int = Query(20, ge=1, le=100)
+) -> Any:
+    """
+    Facet counts of the games list with the same final price filters.
+    Genres, platforms and publishers hold the `limit` values with most games.
+    """
+    facets = await get_game_facets(
+        db=db,
+        min_final_price=min_final_price,
+        max_final_price=max_final_price,
+        limit=limit
+    )
+    logger.info('Return game facets to user with id %s', current_user.id)
+    return facets
+
+
+@router.get(
+    '/batch',
+    response_model=games_schema.GameBatch,
+    status_code=status.HTTP_200_OK,
+    description='Get games by list of ids.'
+)
+async def get_games_by_ids(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        ids: list[str] = Query(..., max_items=games_schema.GET_BATCH_MAX_IDS)
+) -> Any:
+    """
+    Get games by ids, `ids` may be repeated or comma separated.
+    """
+    games = await get_games_batch(db=db, game_ids=ids, max_ids=games_schema.GET_BATCH_MAX_IDS)
+    logger.info('Return batch of %s games to user with id %s', len(games['games']), current_user.id)
+    return games
+
+
+@router.post(
+    '/batch',
+    response_model=games_schema.GameBatch,
+    status_code=status.HTTP_200_OK,
+    description='Get games by long list of ids.'
+)
+async def post_games_by_ids(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        batch_in: games_schema.GameBatchRequest
+) -> Any:
+    """
+    Get games by ids passed in request body.
+    """
+    games = await get_games_batch(
+        db=db,
+        game_ids=batch_in.ids,
+        max_ids=games_schema.POST_BATCH_MAX_IDS
+    )
+    logger.info('Return batch of %s games to user with id %s', len(games['games']), current_user.id)
+    return games
+
+
+@router.post(
+    '/discounts',
+    response_model=games_schema.GameDiscountBulkResult,
+    status_code=status.HTTP_200_OK,
+    description='Set discount of many games at once.'
+)
+async def apply_games_discount(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        discount_in: games_schema.GameDiscountBulk
+) -> Any:
+    """
+    Set absolute or percent discount of games selected by ids and by
+    genre, publisher or platform, all given selectors must match.
+    """
+    check_staff_permission(cur_user_obj=current_user)
+    updated = await game_crud.apply_discount(
+        db=db,
+        kind=discount_in.kind,
+        value=discount_in.value,
+        game_ids=discount_in.ids,
+        genre_id=discount_in.genre_id,
+        publisher_id=discount_in.publisher_id,
+        platform_id=discount_in.platform_id
+    )
+    logger.info(
+        'Set %s discount %s of %s games, by user - %s',
+        discount_in.kind.value,
+        discount_in.value,
+        updated,
+        current_user.username
+    )
+    return {'updated': updated}
+
+
 @router.get(
     '/{game_id}',
     response_model=games_schema.GameInDB,
@@ -76,16 +248,49 @@ async def get_game(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        game_id: str
+        game_id: str,
+        response: Response,
+        if_none_match: str | None = Header(None)
 ) -> Any:
     """
-    Get game by id.
+    Get game by id, `If-None-Match` with the current ETag is answered with 304.
     """
+    if if_none_match is not None:
+        version = await game_crud.get_version(db=db, game_id=game_id)
+        if version is not None and etag_matches(if_none_match, version, weak=True):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={'ETag': entity_tag(version)}
+            )
     game_obj = await check_game_by_id(db=db, game_id=game_id)
+    name_index.touch('games', str(game_obj.id))
     logger.info('Return game info with id %s to user with id %s', game_obj.id, current_user.id)
+    set_etag_header(response=response, obj=game_obj)
     return game_obj
 
 
+@router.get(
+    '/{game_id}/similar',
+    response_model=games_schema.SimilarGameMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get games similar to the game.'
+)
+async def get_game_similar(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        game_id: str,
+        limit: int = Query(10, ge=1, le=50)
+) -> Any:
+    """
+    Games sharing the most genres, developers, publishers and platforms with
+    the game, rarer shared entities weigh more.
+    """
+    similar = await get_similar_games(db=db, game_id=game_id, limit=limit)
+    logger.info('Return %s games similar to %s to user with id %s', len(similar), game_id, current_user.id)
+    return similar
+
+
 @router.patch(
     '/{game_id}',
     response_model=games_schema.GameInDB,
@@ -97,25 +302,29 @@ async def patch_game(
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
         game_id: str,
-        game_in: games_schema.GameUpdate
+        game_in: games_schema.GameUpdate,
+        response: Response,
+        if_match: str | None = Header(None)
 ) -> Any:
     """
     Patch game info.
     """
     check_staff_permission(cur_user_obj=current_user)
     game_obj = await check_game_by_id(db=db, game_id=game_id)
+    check_if_match(if_match=if_match, obj=game_obj)
     game_name_before = game_obj.name
-    await check_duplicating_game(db=db, game_in=game_in, game_obj=game_obj)
-    game_obj_patched = await game_crud.patch(
-        db=db,
-        obj_in=game_in,
-        obj=game_obj
-    )
+    async with unique_violation_as_400(db, GAME_NAME_CONSTRAINT, 'Game with this name already exists'):
+        game_obj_patched = await game_crud.patch(
+            db=db,
+            obj_in=game_in,
+            obj=game_obj
+        )
     logger.info(
         'Partial update platform %s (new name is %s) info.',
         game_name_before,
         game_obj_patched.name if game_name_before != game_obj_patched.name else game_name_before
     )
+    set_etag_header(response=response, obj=game_obj_patched)
     return game_obj_patched
 
 
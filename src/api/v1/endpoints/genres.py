@@ -1,23 +1,38 @@
 import logging.config
-from typing import Any
+import uuid
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Response, Header
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.models import User
+from src.models.models import User, Genre
 from src.schemas import genres as genre_schema
 from src.db.db import get_session
+from src.schemas import games as games_schema
 from src.services.authorization import get_current_user
 from src.services.base import genre_crud
-from src.tools.base import check_required_fields
+from src.tools.base import (
+    check_required_fields,
+    set_total_count_header,
+    unique_violation_as_400,
+    check_if_match,
+    set_etag_header
+)
+from src.tools.games import get_linked_game_cards
 from src.tools.users import check_staff_permission
-from src.tools.genres import check_genre_by_id, check_duplicating_genre
+from src.tools.genres import (
+    check_genre_by_id,
+    check_genre_by_slug,
+    check_duplicating_genre,
+    GENRE_SLUG_CONSTRAINT
+)
+from src.core.deadline import DeadlineRoute
 
 
 logger = logging.getLogger('genres')
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post(
@@ -42,7 +57,8 @@ async def create_genre(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Genre with this name exists.'
         )
-    genre = await genre_crud.create(db=db, obj_in=genre_in)
+    async with unique_violation_as_400(db, GENRE_SLUG_CONSTRAINT, 'Genre with this slug exists.'):
+        genre = await genre_crud.create(db=db, obj_in=genre_in)
     logger.info('Create genre - %s, by user - %s', genre.name, current_user.username)
     return genre
 
@@ -57,17 +73,43 @@ async def get_genres(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
+        response: Response,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        with_total: bool = False
 ) -> Any:
     """
     Retrieve genres.
     """
     genres = await genre_crud.get_multi(db=db, skip=skip, limit=limit)
+    if with_total:
+        await set_total_count_header(response=response, db=db, model=Genre)
     logger.info('Return list of genres to user with id %s', current_user.id)
     return genres
 
 
+@router.get(
+    '/by-slug/{slug}',
+    response_model=genre_schema.GenreInDB,
+    status_code=status.HTTP_200_OK,
+    description='Get genre info by slug.'
+)
+async def get_genre_by_slug(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        slug: str,
+        response: Response
+) -> Any:
+    """
+    Get genre by slug.
+    """
+    genre_obj = await check_genre_by_slug(db=db, slug=slug)
+    logger.info('Return genre info with slug %s to user with id %s', slug, current_user.id)
+    set_etag_header(response=response, obj=genre_obj)
+    return genre_obj
+
+
 @router.get(
     '/{genre_id}',
     response_model=genre_schema.GenreInDB,
@@ -78,16 +120,50 @@ async def get_genre(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        genre_id: str
+        genre_id: str,
+        response: Response
 ) -> Any:
     """
     Get genre by id.
     """
     genre_obj = await check_genre_by_id(db=db, genre_id=genre_id)
     logger.info('Return genre info with id %s to user with id %s', genre_id, current_user.id)
+    set_etag_header(response=response, obj=genre_obj)
     return genre_obj
 
 
+@router.get(
+    '/{genre_id}/games',
+    response_model=games_schema.GameCardMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get page of genre games, cursor of the next page is in X-Next-Cursor header.'
+)
+async def get_genre_games(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        response: Response,
+        genre_id: str,
+        after: Optional[uuid.UUID] = None,
+        limit: int = Query(50, ge=1, le=500)
+) -> Any:
+    """
+    Retrieve games of genre with keyset pagination.
+    """
+    cards = await get_linked_game_cards(
+        db=db,
+        response=response,
+        entity='genres',
+        entity_id=genre_id,
+        after=after,
+        limit=limit
+    )
+    if not cards:
+        await check_genre_by_id(db=db, genre_id=genre_id)
+    logger.info('Return games of genre with id %s to user with id %s', genre_id, current_user.id)
+    return cards
+
+
 @router.patch(
     '/{genre_id}',
     response_model=genre_schema.GenreInDB,
@@ -99,25 +175,30 @@ async def patch_genre(
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
         genre_id: str,
-        genre_in: genre_schema.GenreUpdate
+        genre_in: genre_schema.GenreUpdate,
+        response: Response,
+        if_match: str | None = Header(None)
 ) -> Any:
     """
     Patch genre info.
     """
     check_staff_permission(cur_user_obj=current_user)
     genre_obj = await check_genre_by_id(db=db, genre_id=genre_id)
+    check_if_match(if_match=if_match, obj=genre_obj)
     genre_name_before = genre_obj.name
     await check_duplicating_genre(genre_in=genre_in, db=db, genre_obj=genre_obj)
-    genre_obj_patched = await genre_crud.patch(
-        db=db,
-        obj_in=genre_in,
-        genre_obj=genre_obj
-    )
+    async with unique_violation_as_400(db, GENRE_SLUG_CONSTRAINT, 'Genre with this slug already exists'):
+        genre_obj_patched = await genre_crud.patch(
+            db=db,
+            obj_in=genre_in,
+            genre_obj=genre_obj
+        )
     logger.info(
         'Partial update genre %s (new name is %s) info.',
         genre_name_before,
         genre_obj_patched.name if genre_name_before != genre_obj_patched.name else genre_name_before
     )
+    set_etag_header(response=response, obj=genre_obj_patched)
     return genre_obj_patched
 
 
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.core.metrics import metrics
+from src.tools.base import check_metrics_enabled
+
+router = APIRouter()
+
+
+@router.get(
+    '/',
+    response_class=PlainTextResponse,
+    description='Application metrics in Prometheus text format.'
+)
+async def get_metrics() -> str:
+    """
+    Render metrics, disabled unless METRICS_ENABLED is set: they expose
+    internal state, enable them where the API is not reachable publicly.
+    """
+    check_metrics_enabled()
+    return metrics.render()
@@ -1,21 +1,26 @@
 import logging.config
-from typing import Any
+import uuid
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Response, Header
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.db import get_session
-from src.models.models import User
+from src.models.models import User, Platform
 from src.schemas import platforms as platforms_schema
+from src.schemas import games as games_schema
 from src.services.authorization import get_current_user
 from src.tools.platforms import check_platform_by_id, check_duplicating_platform
+from src.tools.games import get_linked_game_cards
 from src.tools.users import check_staff_permission
 from src.services.base import platform_crud
+from src.core.deadline import DeadlineRoute
+from src.tools.base import set_total_count_header, check_if_match, set_etag_header
 
 logger = logging.getLogger('platforms')
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post(
@@ -55,13 +60,17 @@ async def get_platforms(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
+        response: Response,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        with_total: bool = False
 ) -> Any:
     """
     Retrieve platforms.
     """
     platforms = await platform_crud.get_multi(db=db, skip=skip, limit=limit)
+    if with_total:
+        await set_total_count_header(response=response, db=db, model=Platform)
     logger.info('Return list of platforms to user with id %s', current_user.id)
     return platforms
 
@@ -76,16 +85,50 @@ async def get_platform(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        platform_id: str
+        platform_id: str,
+        response: Response
 ) -> Any:
     """
     Get platform by id.
     """
     platform_obj = await check_platform_by_id(db=db, platform_id=platform_id)
     logger.info('Return platform info with id %s to user with id %s', platform_obj.id, current_user.id)
+    set_etag_header(response=response, obj=platform_obj)
     return platform_obj
 
 
+@router.get(
+    '/{platform_id}/games',
+    response_model=games_schema.GameCardMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get page of platform games, cursor of the next page is in X-Next-Cursor header.'
+)
+async def get_platform_games(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        response: Response,
+        platform_id: str,
+        after: Optional[uuid.UUID] = None,
+        limit: int = Query(50, ge=1, le=500)
+) -> Any:
+    """
+    Retrieve games of platform with keyset pagination.
+    """
+    cards = await get_linked_game_cards(
+        db=db,
+        response=response,
+        entity='platforms',
+        entity_id=platform_id,
+        after=after,
+        limit=limit
+    )
+    if not cards:
+        await check_platform_by_id(db=db, platform_id=platform_id)
+    logger.info('Return games of platform with id %s to user with id %s', platform_id, current_user.id)
+    return cards
+
+
 @router.patch(
     '/{platform_id}',
     response_model=platforms_schema.PlatformInDB,
@@ -97,13 +140,16 @@ async def patch_platform(
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
         platform_id: str,
-        platform_in: platforms_schema.PlatformUpdate
+        platform_in: platforms_schema.PlatformUpdate,
+        response: Response,
+        if_match: str | None = Header(None)
 ) -> Any:
     """
     Patch platform info.
     """
     check_staff_permission(cur_user_obj=current_user)
     platform_obj = await check_platform_by_id(db=db, platform_id=platform_id)
+    check_if_match(if_match=if_match, obj=platform_obj)
     platform_name_before = platform_obj.name
     await check_duplicating_platform(platform_in=platform_in, db=db, platform_obj=platform_obj)
     platform_obj_patched = await platform_crud.patch(
@@ -116,6 +162,7 @@ async def patch_platform(
         platform_name_before,
         platform_obj_patched.name if platform_name_before != platform_obj_patched.name else platform_name_before
     )
+    set_etag_header(response=response, obj=platform_obj_patched)
     return platform_obj_patched
 
 
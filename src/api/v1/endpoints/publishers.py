@@ -1,21 +1,26 @@
 import logging.config
-from typing import Any
+import uuid
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Response, Header
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.db import get_session
-from src.models.models import User
+from src.models.models import User, Publisher
 from src.schemas import pub_dev as pub_dev_schema
+from src.schemas import games as games_schema
 from src.services.authorization import get_current_user
 from src.tools.publishers import check_publisher_by_id, check_duplicating_publisher
+from src.tools.games import get_linked_game_cards
 from src.tools.users import check_staff_permission
 from src.services.base import publisher_crud
+from src.core.deadline import DeadlineRoute
+from src.tools.base import set_total_count_header, check_if_match, set_etag_header
 
 logger = logging.getLogger('publishers')
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post(
@@ -55,13 +60,17 @@ async def get_publishers(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
+        response: Response,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        with_total: bool = False
 ) -> Any:
     """
     Retrieve publishers.
     """
     publishers = await publisher_crud.get_multi(db=db, skip=skip, limit=limit)
+    if with_total:
+        await set_total_count_header(response=response, db=db, model=Publisher)
     logger.info('Return list of publishers to user with id %s', current_user.id)
     return publishers
 
@@ -76,16 +85,50 @@ async def get_publisher(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        publisher_id: str
+        publisher_id: str,
+        response: Response
 ) -> Any:
     """
     Get publisher by id.
     """
     publisher_obj = await check_publisher_by_id(db=db, publisher_id=publisher_id)
     logger.info('Return publisher info with id %s to user with id %s', publisher_obj.id, current_user.id)
+    set_etag_header(response=response, obj=publisher_obj)
     return publisher_obj
 
 
+@router.get(
+    '/{publisher_id}/games',
+    response_model=games_schema.GameCardMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get page of publisher games, cursor of the next page is in X-Next-Cursor header.'
+)
+async def get_publisher_games(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        response: Response,
+        publisher_id: str,
+        after: Optional[uuid.UUID] = None,
+        limit: int = Query(50, ge=1, le=500)
+) -> Any:
+    """
+    Retrieve games of publisher with keyset pagination.
+    """
+    cards = await get_linked_game_cards(
+        db=db,
+        response=response,
+        entity='publishers',
+        entity_id=publisher_id,
+        after=after,
+        limit=limit
+    )
+    if not cards:
+        await check_publisher_by_id(db=db, publisher_id=publisher_id)
+    logger.info('Return games of publisher with id %s to user with id %s', publisher_id, current_user.id)
+    return cards
+
+
 @router.patch(
     '/{publisher_id}',
     response_model=pub_dev_schema.PubDevInDB,
@@ -97,13 +140,16 @@ async def patch_publisher(
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
         publisher_id: str,
-        publisher_in: pub_dev_schema.PubDevUpdate
+        publisher_in: pub_dev_schema.PubDevUpdate,
+        response: Response,
+        if_match: str | None = Header(None)
 ) -> Any:
     """
     Patch publisher info.
     """
     check_staff_permission(cur_user_obj=current_user)
     publisher_obj = await check_publisher_by_id(db=db, publisher_id=publisher_id)
+    check_if_match(if_match=if_match, obj=publisher_obj)
     publisher_name_before = publisher_obj.name
     await check_duplicating_publisher(publisher_in=publisher_in, db=db, publisher_obj=publisher_obj)
     publisher_obj_patched = await publisher_crud.patch(
@@ -116,6 +162,7 @@ async def patch_publisher(
         publisher_name_before,
         publisher_obj_patched.name if publisher_name_before != publisher_obj_patched.name else publisher_name_before
     )
+    set_etag_header(response=response, obj=publisher_obj_patched)
     return publisher_obj_patched
 
 
@@ -0,0 +1,78 @@
+import logging.config
+from typing import Any
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.db import get_session
+from src.models.models import User
+from src.schemas import stats as stats_schema
+from src.services.authorization import get_current_user
+from src.services.stats import catalog_stats
+from src.tools.users import check_staff_permission
+from src.core.deadline import DeadlineRoute
+
+logger = logging.getLogger('stats')
+
+router = APIRouter(route_class=DeadlineRoute)
+
+
+@router.get(
+    '/games-per/{entity}',
+    response_model=stats_schema.EntityGamesCountMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get number of games of every genre, publisher, developer or platform.'
+)
+async def get_games_per_entity(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        entity: stats_schema.StatsEntity
+) -> Any:
+    """
+    Number of games of every entity, most games first.
+    """
+    check_staff_permission(cur_user_obj=current_user)
+    rows = await catalog_stats.games_per_entity(db=db, entity=entity.value)
+    logger.info('Return games per %s to user with id %s', entity.value, current_user.id)
+    return rows
+
+
+@router.get(
+    '/prices',
+    response_model=stats_schema.PriceStats,
+    status_code=status.HTTP_200_OK,
+    description='Get average price and discount of games.'
+)
+async def get_price_stats(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Number of games and discounted games, average price, discount and final price.
+    """
+    check_staff_permission(cur_user_obj=current_user)
+    stats = await catalog_stats.prices(db=db)
+    logger.info('Return price stats to user with id %s', current_user.id)
+    return stats
+
+
+@router.get(
+    '/releases',
+    response_model=stats_schema.ReleaseMonthMulti,
+    status_code=status.HTTP_200_OK,
+    description='Get number of games released per month.'
+)
+async def get_release_stats(
+        *,
+        db: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Histogram of release dates by month, oldest month first.
+    """
+    check_staff_permission(cur_user_obj=current_user)
+    months = await catalog_stats.releases_per_month(db=db)
+    logger.info('Return release stats to user with id %s', current_user.id)
+    return months
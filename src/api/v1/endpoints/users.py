@@ -1,10 +1,9 @@
 import logging.config
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Header
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi_mail import MessageSchema, MessageType
 
 from src.db.db import get_session
 from src.schemas import users as user_schema
@@ -28,11 +27,14 @@ from src.tools.patch_password import (
     change_password_for_user,
 )
 from src.core.config import app_settings
+from src.core.mail import send_reset_password_email
+from src.core.deadline import DeadlineRoute
+from src.tools.base import set_total_count_header, check_if_match, set_etag_header
 
 
 logger = logging.getLogger('users')
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post(
@@ -70,13 +72,17 @@ async def get_users(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
+        response: Response,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        with_total: bool = False
 ) -> Any:
     """
     Retrieve users.
     """
     users = await user_crud.get_multi(db=db, skip=skip, limit=limit)
+    if with_total:
+        await set_total_count_header(response=response, db=db, model=User)
     logger.info('Return list of users to user with id %s', current_user.id)
     return users
 
@@ -91,13 +97,15 @@ async def get_user(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        user_id: str
+        user_id: str,
+        response: Response
 ) -> Any:
     """
     Get user by id.
     """
     user_obj = await check_user_by_id(db=db, user_id=user_id)
     logger.info('Return user info with id %s to user with id %s', user_id, current_user.id)
+    set_etag_header(response=response, obj=user_obj)
     return user_obj
 
 
@@ -112,13 +120,16 @@ async def patch_user(
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
         user_id: str,
-        user_in: user_schema.UserUpgrade
+        user_in: user_schema.UserUpgrade,
+        response: Response,
+        if_match: str | None = Header(None)
 ) -> Any:
     """
     Patch user info.
     """
     check_staff_permission(cur_user_obj=current_user)
     user_obj = await check_user_by_id(db=db, user_id=user_id)
+    check_if_match(if_match=if_match, obj=user_obj)
     await check_for_duplicating_user(db=db, user_in=user_in, user_obj=user_obj)
     user_obj_patched = await user_crud.patch(
         db=db,
@@ -126,6 +137,7 @@ async def patch_user(
         obj_in=user_in
     )
     logger.info(f'Partial update {user_obj.username} info.')
+    set_etag_header(response=response, obj=user_obj_patched)
     return user_obj_patched
 
 
@@ -167,13 +179,15 @@ async def delete_user(
 async def get_personal_info(
         *,
         db: AsyncSession = Depends(get_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        response: Response
 ) -> Any:
     """
     Get personal current user info.
     """
     user_obj = await check_user_by_id(db=db, user_id=current_user.id)
     logger.info('Return personal user info to user with id %s', current_user.id)
+    set_etag_header(response=response, obj=user_obj)
     return user_obj
 
 
@@ -186,11 +200,14 @@ async def patch_personal_info(
         *,
         db: AsyncSession = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        user_in: user_schema.UserUpgrade
+        user_in: user_schema.UserUpgrade,
+        response: Response,
+        if_match: str | None = Header(None)
 ) -> Any:
     """
     Get personal current user info.
     """
+    check_if_match(if_match=if_match, obj=current_user)
     await check_for_duplicating_user(db=db, user_in=user_in, user_obj=current_user)
     user_obj_patched = await user_crud.patch(
         db=db,
@@ -198,6 +215,7 @@ async def patch_personal_info(
         obj_in=user_in
     )
     logger.info(f'Partial update {current_user.username} info.')
+    set_etag_header(response=response, obj=user_obj_patched)
     return user_obj_patched
 
 
@@ -209,29 +227,19 @@ async def patch_personal_info(
 async def forget_password(
         *,
         db: AsyncSession = Depends(get_session),
+        request: Request,
         user_in: user_schema.ForgetPasswordRequestBody
 ) -> Any:
     """
     Send email for password reset.
     """
-    from src.main import app, fast_mail
     user_obj = await check_user_by_email(db=db, user_in=user_in)
     reset_code = await get_reset_code(db=db, user_in=user_in)
     url = ('http://'+app_settings.project_host + ':' +
            str(app_settings.project_port) +
-           app.url_path_for('confirm_reset_token', reset_code=reset_code))
-    email_data = {
-        'username': user_obj.username,
-        'url': url
-    }
+           request.app.url_path_for('confirm_reset_token', reset_code=reset_code))
     email = user_in.dict().get('email')
-    message = MessageSchema(
-        subject='Reset password',
-        recipients=[email],
-        template_body=email_data,
-        subtype=MessageType.html
-    )
-    await fast_mail.send_message(message, template_name='email.html')
+    await send_reset_password_email(email=email, username=user_obj.username, url=url)
     return {'info': f'reset password email has been sent to {email}'}
 
 
@@ -1,13 +1,9 @@
 import os.path
-from logging import config as logging_config
+from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import BaseSettings, PostgresDsn, Field
-from fastapi_mail import ConnectionConfig
-
-from .logger import LOGGING
-
-logging_config.dictConfig(LOGGING)
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -30,6 +26,40 @@ class AppSettings(BaseSettings):
     mail_port: int
     mail_server: str
     mail_from_name: str
+    db_warmup_connections: int = 5
+    shutdown_drain_timeout: float = 10.0
+    metrics_enabled: bool = False
+    request_deadline_seconds: float = 30.0
+    count_cache_ttl: float = 30.0
+    exact_count_threshold: int = 10000
+    compact_uuids: bool = False
+    id_generator: str = 'uuid7'
+    id_generators: dict[str, str] = {}
+    idempotency_store: str = 'memory'
+    idempotency_ttl: float = 24 * 60 * 60
+    idempotency_lock_timeout: float = 60.0
+    idempotency_wait_timeout: float = 10.0
+    campaign_scheduler: bool = True
+    campaign_tick_interval: float = 30.0
+    campaign_lease_ttl: float = 90.0
+    stats_cache_ttl: float = 300.0
+    similar_weights: dict[str, float] = {
+        'genres': 1.0,
+        'developers': 2.0,
+        'publishers': 1.5,
+        'platforms': 0.5
+    }
+    similar_max_posting: int = 1000
+    similar_rebuild_interval: float = 60 * 60.0
+    facet_price_buckets: list[Decimal] = [Decimal(5), Decimal(10), Decimal(20), Decimal(40)]
+    change_feed_capacity: int = 10000
+    change_feed_client_buffer: int = 1000
+    change_feed_heartbeat: float = 15.0
+    change_feed_max_duration: float = 5 * 60.0
+    outbox_poll_interval: float = 1.0
+    outbox_notified_poll_interval: float = 30.0
+    outbox_retention: float = 24 * 60 * 60.0
+    outbox_purge_interval: float = 10 * 60.0
 
     class Config:
         env_file = os.path.dirname(BASE_DIR) + '/.env'
@@ -37,15 +67,25 @@ class AppSettings(BaseSettings):
 
 app_settings = AppSettings()
 
-mail_config = ConnectionConfig(
-    MAIL_USERNAME=app_settings.mail_username,
-    MAIL_PASSWORD=app_settings.mail_password,
-    MAIL_FROM=app_settings.mail_from,
-    MAIL_PORT=app_settings.mail_port,
-    MAIL_SERVER=app_settings.mail_server,
-    MAIL_FROM_NAME=app_settings.mail_from_name,
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True,
-    TEMPLATE_FOLDER=Path(__file__).parent.parent / 'templates'
-)
+
+@lru_cache()
+def get_mail_config():
+    """Build mail connection config on first use.
+
+    `fastapi_mail` pulls in jinja2, aiosmtplib and email validation, so it is
+    imported here instead of at module level to keep worker boot fast.
+    """
+    from fastapi_mail import ConnectionConfig
+
+    return ConnectionConfig(
+        MAIL_USERNAME=app_settings.mail_username,
+        MAIL_PASSWORD=app_settings.mail_password,
+        MAIL_FROM=app_settings.mail_from,
+        MAIL_PORT=app_settings.mail_port,
+        MAIL_SERVER=app_settings.mail_server,
+        MAIL_FROM_NAME=app_settings.mail_from_name,
+        MAIL_STARTTLS=True,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=True,
+        TEMPLATE_FOLDER=Path(__file__).parent.parent / 'templates'
+    )
@@ -0,0 +1,88 @@
+"""Per-route request deadlines.
+
+Every route of a router created with ``route_class=DeadlineRoute`` is cancelled
+after ``app_settings.request_deadline_seconds`` (or the value set with the
+``deadline`` decorator). The remaining time is exposed to the DB layer, which
+turns it into a statement timeout, see ``src.db.db``.
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from fastapi import Request, status
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from sqlalchemy.exc import DBAPIError
+
+from src.core.config import app_settings
+from src.core.metrics import metrics
+
+request_deadline: ContextVar[Optional[float]] = ContextVar('request_deadline', default=None)
+
+deadline_exceeded = metrics.counter(
+    'request_deadline_exceeded_total',
+    'Requests cancelled because their deadline expired.'
+)
+statement_timeouts = metrics.counter(
+    'db_statement_timeouts_total',
+    'Statements cancelled by the database because of the request deadline.'
+)
+
+
+def deadline(seconds: float) -> Callable:
+    """Override default request deadline for the decorated endpoint.
+
+    Must be applied below the router decorator.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__deadline__ = seconds
+        return endpoint
+    return decorator
+
+
+def remaining_seconds() -> Optional[float]:
+    """Time left until current request deadline, None outside of a deadline."""
+    expires_at = request_deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+class DeadlineRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        timeout = getattr(self.endpoint, '__deadline__', app_settings.request_deadline_seconds)
+        if not timeout:
+            return handler
+
+        async def deadline_handler(request):
+            token = request_deadline.set(time.monotonic() + timeout)
+            try:
+                return await asyncio.wait_for(handler(request), timeout=timeout)
+            except asyncio.TimeoutError:
+                deadline_exceeded.inc(route=self.path)
+                return ORJSONResponse(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    content={'detail': 'Request deadline exceeded.'}
+                )
+            finally:
+                request_deadline.reset(token)
+
+        return deadline_handler
+
+
+def is_statement_timeout(error: DBAPIError) -> bool:
+    message = str(error.orig)
+    return 'canceling statement due to statement timeout' in message or 'interrupted' in message
+
+
+async def statement_timeout_handler(request: Request, error: DBAPIError) -> ORJSONResponse:
+    """Answer 503 when the DB cancelled a statement that outlived the deadline."""
+    if not is_statement_timeout(error):
+        raise error
+    statement_timeouts.inc(path=request.url.path)
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': 'Database statement timed out.'}
+    )
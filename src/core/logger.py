@@ -1,3 +1,5 @@
+from logging import config as logging_config
+
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 LOG_DEFAULT_HANDLERS = ['console', ]
 
@@ -82,4 +84,8 @@ LOGGING = {
         'formatter': 'verbose',
         'handlers': LOG_DEFAULT_HANDLERS,
     },
-}
\ No newline at end of file
+}
+
+
+def setup_logging() -> None:
+    logging_config.dictConfig(LOGGING)
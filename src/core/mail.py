@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+from src.core.config import get_mail_config
+
+
+@lru_cache()
+def get_fast_mail():
+    """Create FastMail client (and its jinja2 template env) on first use."""
+    from fastapi_mail import FastMail
+
+    return FastMail(config=get_mail_config())
+
+
+async def send_reset_password_email(email: str, username: str, url: str) -> None:
+    from fastapi_mail import MessageSchema, MessageType
+
+    message = MessageSchema(
+        subject='Reset password',
+        recipients=[email],
+        template_body={
+            'username': username,
+            'url': url
+        },
+        subtype=MessageType.html
+    )
+    await get_fast_mail().send_message(message, template_name='email.html')
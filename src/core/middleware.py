@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import json
+from typing import Callable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.services.idempotency import IdempotencyStore, StoredResponse, get_idempotency_store
+
+
+class InFlightRequests:
+    """Counter of HTTP requests being handled, used to drain on shutdown."""
+
+    def __init__(self):
+        self.count = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def enter(self) -> None:
+        self.count += 1
+        self._idle.clear()
+
+    def leave(self) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait until there are no requests in flight; False if timed out."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+in_flight = InFlightRequests()
+
+
+class InFlightRequestsMiddleware:
+    def __init__(self, app: ASGIApp, tracker: InFlightRequests = in_flight):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        self.tracker.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.leave()
+
+
+IDEMPOTENCY_HEADER = b'idempotency-key'
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+# Signup and catalog writes. Authorization routes are left out, their stored
+# bodies would keep bearer tokens in the store for `idempotency_ttl`.
+IDEMPOTENT_PATHS = (
+    '/api/v1/users/',
+    '/api/v1/games/',
+    '/api/v1/genres/',
+    '/api/v1/publishers/',
+    '/api/v1/developers/',
+    '/api/v1/platforms/',
+    '/api/v1/campaigns/'
+)
+
+
+class IdempotencyMiddleware:
+    """Replay stored responses of POST requests retried with the same `Idempotency-Key`.
+
+    The key is scoped by the Authorization header and bound to a fingerprint of
+    the method, path, query and body, reusing it for another request is
+    rejected with 422. A retry that arrives while the first attempt runs waits
+    for it up to `wait_timeout` seconds and gets 409 after that. Responses with
+    5xx status are not stored, so such requests may be retried. Only paths
+    starting with one of `paths` are handled, the header is ignored elsewhere.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            wait_timeout: float,
+            get_store: Callable[[], IdempotencyStore] = get_idempotency_store,
+            paths: tuple[str, ...] = IDEMPOTENT_PATHS
+    ):
+        self.app = app
+        self.wait_timeout = wait_timeout
+        self.paths = paths
+        self.get_store = get_store
+
+    @staticmethod
+    async def _send_json(send: Send, status_code: int, detail: str) -> None:
+        body = json.dumps({'detail': detail}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    async def _replay(send: Send, response) -> None:
+        headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in response.headers]
+        headers.append((b'idempotent-replayed', b'true'))
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': response.body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] != 'POST' or not scope['path'].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope['headers'])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not raw_key or len(raw_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            await self._send_json(send, 400, 'Idempotency-Key must have 1 to 255 characters.')
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                break
+        body = b''.join(chunks)
+        fingerprint = hashlib.sha256(
+            b'\n'.join((scope['method'].encode(), scope['path'].encode(), scope['query_string'], body))
+        ).hexdigest()
+        key = hashlib.sha256(headers.get(b'authorization', b'') + b'\n' + raw_key).hexdigest()
+
+        store = self.get_store()
+        stored = await store.begin(key, fingerprint)
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                await self._send_json(send, 422, 'Idempotency-Key was already used for another request.')
+                return
+            if stored.response is None:
+                stored = await store.wait(key, self.wait_timeout)
+            if stored is None or stored.response is None:
+                await self._send_json(send, 409, 'Request with this Idempotency-Key is in progress.')
+                return
+            await self._replay(send, stored.response)
+            return
+
+        body_sent = False
+
+        async def replay_body() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        status_code = None
+        response_headers = []
+        response_body = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status_code, response_headers
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                response_headers = [
+                    (name.decode('latin-1'), value.decode('latin-1')) for name, value in message.get('headers', [])
+                ]
+            elif message['type'] == 'http.response.body':
+                response_body.append(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_body, capture)
+        except BaseException:
+            await store.release(key)
+            raise
+        if status_code is None or status_code >= 500:
+            await store.release(key)
+            return
+        await store.complete(key, StoredResponse(status_code, response_headers, b''.join(response_body)))
@@ -0,0 +1,88 @@
+"""Import-time profiling of the application.
+
+Run ``python -m src.core.profiling [module] [top]`` from the project root to get
+a report of the slowest imports (defaults to ``src.main``).
+"""
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from src.core.config import BASE_DIR
+
+PROJECT_DIR = os.path.dirname(BASE_DIR)
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    timings: list[ImportTiming] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        for timing in self.timings:
+            if timing.module == self.module and timing.depth == 0:
+                return timing.cumulative_us / 1_000_000
+        return sum(timing.self_us for timing in self.timings) / 1_000_000
+
+    def slowest(self, top: int = 20) -> list[ImportTiming]:
+        return sorted(self.timings, key=lambda timing: timing.self_us, reverse=True)[:top]
+
+    def is_imported(self, module: str) -> bool:
+        return any(timing.module == module for timing in self.timings)
+
+
+def parse_importtime(output: str, module: str) -> ImportProfile:
+    profile = ImportProfile(module=module)
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        profile.timings.append(
+            ImportTiming(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip()) - 1) // 2
+            )
+        )
+    return profile
+
+
+def profile_imports(module: str = 'src.main') -> ImportProfile:
+    """Import `module` in a fresh interpreter with `-X importtime`."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return parse_importtime(result.stderr, module)
+
+
+def format_report(profile: ImportProfile, top: int = 20) -> str:
+    lines = [
+        f'Import of {profile.module}: {profile.total_seconds * 1000:.1f} ms',
+        f'{"self, ms":>10} {"cumul, ms":>10}  module'
+    ]
+    for timing in profile.slowest(top):
+        lines.append(
+            f'{timing.self_us / 1000:>10.1f} {timing.cumulative_us / 1000:>10.1f}  {timing.module}'
+        )
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else 'src.main'
+    top_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(format_report(profile_imports(target), top=top_count))
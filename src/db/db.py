@@ -1,19 +1,71 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+import asyncio
+import logging
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    create_async_engine,
+    async_sessionmaker,
+    AsyncSession,
+    AsyncEngine
+)
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from src.core.config import app_settings
+from src.core.deadline import remaining_seconds
+
+logger = logging.getLogger('db')
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(app_settings.database_dsn, echo=True, future=True)
-async_session = async_sessionmaker(
-    engine, expire_on_commit=False
-)
+@lru_cache()
+def get_engine() -> AsyncEngine:
+    """Create engine on first use, so importing models does not load the DB driver."""
+    return create_async_engine(app_settings.database_dsn, echo=True, future=True)
+
+
+@lru_cache()
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        get_engine(), expire_on_commit=False
+    )
 
 
 async def get_session() -> AsyncSession:
-    async with async_session() as session:
+    async with get_session_maker()() as session:
         yield session
+        # Kept by memoized repository lookups, see src/services/lookups.py.
+        stats = session.info.get('lookup_stats')
+        if stats:
+            logger.debug('Repository lookups: %(query)s queried, %(reused)s reused', stats)
+
+
+@event.listens_for(Session, 'after_begin')
+def apply_statement_timeout(session, transaction, connection) -> None:
+    """Limit statements of the transaction by the current request deadline."""
+    remaining = remaining_seconds()
+    if remaining is None:
+        return
+    if connection.dialect.name == 'postgresql':
+        timeout_ms = max(int(remaining * 1000), 1)
+        connection.exec_driver_sql(f'SET LOCAL statement_timeout = {timeout_ms}')
+    elif connection.dialect.name == 'sqlite':
+        # SQLite has no statement timeout, interrupt the connection instead.
+        driver_connection = connection.connection.driver_connection
+        sqlite_connection = getattr(driver_connection, '_connection', driver_connection)
+        session.info['sqlite_interrupt'] = asyncio.get_running_loop().call_later(
+            max(remaining, 0),
+            sqlite_connection.interrupt
+        )
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def cancel_sqlite_interrupt(session, transaction) -> None:
+    if transaction.parent is None:
+        handle = session.info.pop('sqlite_interrupt', None)
+        if handle is not None:
+            handle.cancel()
+
@@ -0,0 +1,34 @@
+"""15_add_game_final_price
+
+Revision ID: 3c9a8f0e6d21
+Revises: b7e2c4d91f3a
+Create Date: 2026-10-19 14:42:37.118520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a8f0e6d21'
+down_revision = 'b7e2c4d91f3a'
+branch_labels = None
+depends_on = None
+
+FINAL_PRICE = (
+    'CASE WHEN price > COALESCE(discount, 0) '
+    'THEN price - COALESCE(discount, 0) ELSE 0 END'
+)
+
+
+def upgrade() -> None:
+    for table in ('games', 'game_cards'):
+        op.add_column(table, sa.Column('final_price', sa.Float(precision=2, asdecimal=True), nullable=True))
+        op.execute(f'UPDATE {table} SET final_price = {FINAL_PRICE}')
+        op.create_index(op.f(f'ix_{table}_final_price'), table, ['final_price'], unique=False)
+
+
+def downgrade() -> None:
+    for table in ('game_cards', 'games'):
+        op.drop_index(op.f(f'ix_{table}_final_price'), table_name=table)
+        op.drop_column(table, 'final_price')
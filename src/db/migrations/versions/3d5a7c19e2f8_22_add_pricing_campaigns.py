@@ -0,0 +1,71 @@
+"""22_add_pricing_campaigns
+
+Revision ID: 3d5a7c19e2f8
+Revises: 0b7e92c4d5a3
+Create Date: 2026-10-19 19:21:47.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.models.types import uuid_type
+
+
+# revision identifiers, used by Alembic.
+revision = '3d5a7c19e2f8'
+down_revision = '0b7e92c4d5a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'pricing_campaigns',
+        sa.Column('id', uuid_type(), nullable=False),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('value', sa.Float(precision=2, asdecimal=True), nullable=False),
+        sa.Column('starts_at', sa.DateTime(), nullable=False),
+        sa.Column('ends_at', sa.DateTime(), nullable=False),
+        sa.Column('game_ids', sa.JSON(), nullable=True),
+        sa.Column('genre_id', uuid_type(), nullable=True),
+        sa.Column('publisher_id', uuid_type(), nullable=True),
+        sa.Column('platform_id', uuid_type(), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_pricing_campaigns_status_starts_at', 'pricing_campaigns', ['status', 'starts_at'], unique=False
+    )
+    op.create_index(
+        'ix_pricing_campaigns_status_ends_at', 'pricing_campaigns', ['status', 'ends_at'], unique=False
+    )
+    op.create_table(
+        'campaign_games',
+        sa.Column('campaign_id', uuid_type(), nullable=False),
+        sa.Column('game_id', uuid_type(), nullable=False),
+        sa.Column('previous_discount', sa.Float(precision=2, asdecimal=True), nullable=True),
+        sa.ForeignKeyConstraint(['campaign_id'], ['pricing_campaigns.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('campaign_id', 'game_id')
+    )
+    op.create_index(
+        'ix_campaign_games_game_id_campaign_id', 'campaign_games', ['game_id', 'campaign_id'], unique=False
+    )
+    op.create_table(
+        'leases',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('holder', sa.String(length=255), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('leases')
+    op.drop_index('ix_campaign_games_game_id_campaign_id', table_name='campaign_games')
+    op.drop_table('campaign_games')
+    op.drop_index('ix_pricing_campaigns_status_ends_at', table_name='pricing_campaigns')
+    op.drop_index('ix_pricing_campaigns_status_starts_at', table_name='pricing_campaigns')
+    op.drop_table('pricing_campaigns')
@@ -0,0 +1,36 @@
+"""24_add_catalog_outbox
+
+Revision ID: 5b2e9d7f1c36
+Revises: 8f1c4e6b2a9d
+Create Date: 2026-10-19 21:04:31.562918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e9d7f1c36'
+down_revision = '8f1c4e6b2a9d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'catalog_outbox',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+        sa.Column('origin', sa.String(length=255), nullable=False),
+        sa.Column('entity', sa.String(length=64), nullable=False),
+        sa.Column('action', sa.String(length=16), nullable=False),
+        sa.Column('entity_id', sa.String(length=64), nullable=True),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_catalog_outbox_created_at'), 'catalog_outbox', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_catalog_outbox_created_at'), table_name='catalog_outbox')
+    op.drop_table('catalog_outbox')
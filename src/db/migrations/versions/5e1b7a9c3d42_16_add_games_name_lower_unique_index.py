@@ -0,0 +1,75 @@
+"""16_add_games_name_lower_unique_index
+
+Revision ID: 5e1b7a9c3d42
+Revises: 3c9a8f0e6d21
+Create Date: 2026-10-19 15:20:11.402913
+
+Names were unique per platform only, so existing games may differ in case
+alone. All but the first game by id of such a group get a ` (<n>)` suffix,
+in games and game_cards, before the index is created; renames are logged.
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e1b7a9c3d42'
+down_revision = '3c9a8f0e6d21'
+branch_labels = None
+depends_on = None
+
+NAME_LENGTH = 75
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def rename_duplicates(bind) -> None:
+    games = sa.table('games', sa.column('id'), sa.column('name'))
+    game_cards = sa.table('game_cards', sa.column('game_id'), sa.column('name'))
+    duplicated = sa.select(
+        sa.func.lower(games.c.name)
+    ).group_by(
+        sa.func.lower(games.c.name)
+    ).having(
+        sa.func.count() > 1
+    )
+    rows = bind.execute(
+        sa.select(games.c.id, games.c.name).where(
+            sa.func.lower(games.c.name).in_(duplicated)
+        ).order_by(sa.func.lower(games.c.name), games.c.id)
+    ).all()
+    kept = set()
+    for game_id, name in rows:
+        if name.lower() not in kept:
+            kept.add(name.lower())
+            continue
+        number = 2
+        while True:
+            suffix = f' ({number})'
+            new_name = name[:NAME_LENGTH - len(suffix)] + suffix
+            taken = bind.execute(
+                sa.select(games.c.id).where(sa.func.lower(games.c.name) == new_name.lower()).limit(1)
+            ).first()
+            if taken is None:
+                break
+            number += 1
+        bind.execute(sa.update(games).where(games.c.id == game_id).values(name=new_name))
+        bind.execute(sa.update(game_cards).where(game_cards.c.game_id == game_id).values(name=new_name))
+        logger.warning('Renamed game %s from %r to %r, its name differed from another in case only',
+                       game_id, name, new_name)
+
+
+def upgrade() -> None:
+    rename_duplicates(op.get_bind())
+    op.create_index(
+        'uq_games_name_lower',
+        'games',
+        [sa.text('lower(name)')],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_games_name_lower', table_name='games')
@@ -0,0 +1,47 @@
+"""23_add_name_trigram_indexes
+
+Revision ID: 8f1c4e6b2a9d
+Revises: 3d5a7c19e2f8
+Create Date: 2026-10-19 20:12:08.417320
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8f1c4e6b2a9d'
+down_revision = '3d5a7c19e2f8'
+branch_labels = None
+depends_on = None
+
+TABLES = ('games', 'publishers', 'developers')
+
+
+def upgrade() -> None:
+    # Trigram indexes exist on Postgres only, other databases scan names.
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f'ix_{table}_name_trgm',
+                table,
+                ['name'],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={'name': 'gin_trgm_ops'},
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                f'ix_{table}_name_trgm',
+                table_name=table,
+                postgresql_concurrently=True
+            )
@@ -0,0 +1,60 @@
+"""17_add_genres_slug_unique_index
+
+Revision ID: a8d4f2b61c07
+Revises: 5e1b7a9c3d42
+Create Date: 2026-10-19 15:48:03.227614
+
+Slugs were not unique, names that slugify alike share one. All but the
+earliest genre of such a group get a `-<n>` suffix before the index is
+created; renames are logged.
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d4f2b61c07'
+down_revision = '5e1b7a9c3d42'
+branch_labels = None
+depends_on = None
+
+SLUG_LENGTH = 75
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def rename_duplicates(bind) -> None:
+    genres = sa.table('genres', sa.column('id'), sa.column('slug'), sa.column('created_at'))
+    duplicated = sa.select(genres.c.slug).group_by(genres.c.slug).having(sa.func.count() > 1)
+    rows = bind.execute(
+        sa.select(genres.c.id, genres.c.slug).where(
+            genres.c.slug.in_(duplicated)
+        ).order_by(genres.c.slug, genres.c.created_at, genres.c.id)
+    ).all()
+    kept = set()
+    for genre_id, slug in rows:
+        if slug not in kept:
+            kept.add(slug)
+            continue
+        number = 2
+        while True:
+            suffix = f'-{number}'
+            new_slug = slug[:SLUG_LENGTH - len(suffix)] + suffix
+            taken = bind.execute(sa.select(genres.c.id).where(genres.c.slug == new_slug).limit(1)).first()
+            if taken is None:
+                break
+            number += 1
+        bind.execute(sa.update(genres).where(genres.c.id == genre_id).values(slug=new_slug))
+        logger.warning('Changed slug of genre %s from %r to %r, it collided with another genre',
+                       genre_id, slug, new_slug)
+
+
+def upgrade() -> None:
+    rename_duplicates(op.get_bind())
+    op.create_index(op.f('ix_genres_slug'), 'genres', ['slug'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_genres_slug'), table_name='genres')
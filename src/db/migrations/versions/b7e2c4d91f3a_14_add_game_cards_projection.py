@@ -0,0 +1,86 @@
+"""14_add_game_cards_projection
+
+Revision ID: b7e2c4d91f3a
+Revises: 969b5dfdc97e
+Create Date: 2026-10-19 14:05:12.412733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy_utils
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c4d91f3a'
+down_revision = '969b5dfdc97e'
+branch_labels = None
+depends_on = None
+
+RELATIONS = {
+    'genre': 'genres',
+    'developer': 'developers',
+    'publisher': 'publishers',
+    'platform': 'platforms'
+}
+
+
+def backfill() -> None:
+    connection = op.get_bind()
+    cards = {
+        row.id: {
+            'game_id': row.id,
+            'name': row.name,
+            'price': row.price,
+            'discount': row.discount,
+            'description': row.description,
+            'release_date': row.release_date,
+            **{f'{prefix}_{kind}': [] for prefix in RELATIONS for kind in ('ids', 'names')}
+        }
+        for row in connection.execute(sa.text(
+            'SELECT id, name, price, discount, description, release_date FROM games'
+        ))
+    }
+    for prefix, table in RELATIONS.items():
+        rows = connection.execute(sa.text(
+            f'SELECT link.game_id, entity.id, entity.name FROM {table}_games AS link '
+            f'JOIN {table} AS entity ON entity.id = link.{prefix}_id'
+        ))
+        for game_id, entity_id, entity_name in rows:
+            if game_id in cards:
+                cards[game_id][f'{prefix}_ids'].append(str(entity_id))
+                cards[game_id][f'{prefix}_names'].append(entity_name)
+    game_cards = sa.table(
+        'game_cards',
+        *(sa.column(name) for name in ('game_id', 'name', 'price', 'discount', 'description', 'release_date')),
+        *(sa.column(f'{prefix}_{kind}', sa.JSON) for prefix in RELATIONS for kind in ('ids', 'names'))
+    )
+    if cards:
+        op.bulk_insert(game_cards, list(cards.values()))
+
+
+def upgrade() -> None:
+    op.create_table('game_cards',
+    sa.Column('game_id', sqlalchemy_utils.types.uuid.UUIDType(binary=False), nullable=False),
+    sa.Column('name', sa.String(length=75), nullable=False),
+    sa.Column('price', sa.Float(precision=2, asdecimal=True), nullable=False),
+    sa.Column('discount', sa.Float(precision=2, asdecimal=True), nullable=True),
+    sa.Column('description', sa.String(length=500), nullable=False),
+    sa.Column('release_date', sa.DateTime(), nullable=False),
+    sa.Column('genre_ids', sa.JSON(), nullable=False),
+    sa.Column('genre_names', sa.JSON(), nullable=False),
+    sa.Column('developer_ids', sa.JSON(), nullable=False),
+    sa.Column('developer_names', sa.JSON(), nullable=False),
+    sa.Column('publisher_ids', sa.JSON(), nullable=False),
+    sa.Column('publisher_names', sa.JSON(), nullable=False),
+    sa.Column('platform_ids', sa.JSON(), nullable=False),
+    sa.Column('platform_names', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('game_id')
+    )
+    op.create_index(op.f('ix_game_cards_name'), 'game_cards', ['name'], unique=False)
+    backfill()
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_game_cards_name'), table_name='game_cards')
+    op.drop_table('game_cards')
@@ -0,0 +1,45 @@
+"""18_add_association_game_id_indexes
+
+Revision ID: c2e7d5a09b18
+Revises: a8d4f2b61c07
+Create Date: 2026-10-19 16:31:45.902174
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e7d5a09b18'
+down_revision = 'a8d4f2b61c07'
+branch_labels = None
+depends_on = None
+
+ASSOCIATIONS = {
+    'genres_games': 'genre_id',
+    'developers_games': 'developer_id',
+    'publishers_games': 'publisher_id',
+    'platforms_games': 'platform_id'
+}
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can not run inside a transaction on Postgres.
+    with op.get_context().autocommit_block():
+        for table, column in ASSOCIATIONS.items():
+            op.create_index(
+                f'ix_{table}_game_id_{column}',
+                table,
+                ['game_id', column],
+                unique=False,
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in ASSOCIATIONS.items():
+            op.drop_index(
+                f'ix_{table}_game_id_{column}',
+                table_name=table,
+                postgresql_concurrently=True
+            )
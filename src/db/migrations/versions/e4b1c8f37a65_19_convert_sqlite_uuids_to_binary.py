@@ -0,0 +1,73 @@
+"""19_convert_sqlite_uuids_to_binary
+
+Revision ID: e4b1c8f37a65
+Revises: c2e7d5a09b18
+Create Date: 2026-10-19 17:05:12.640381
+
+Postgres already stores ids as native `uuid`, so this revision only touches
+SQLite, and only when it runs with COMPACT_UUIDS=true: the app binds ids in
+the configured form, so converting without it would hide every row. CHAR(32)
+hex ids are rewritten as 16-byte BLOBs in batches, each committed on its
+own. The declared column type is kept, SQLite stores BLOBs in TEXT affinity
+columns as is.
+
+The app binds ids in one form, so lookups and joins miss rows not yet
+converted: stop the app while this runs. Downgrade converts BLOBs back to hex
+whatever the setting.
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.core.config import app_settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b1c8f37a65'
+down_revision = 'c2e7d5a09b18'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def uuid_columns(bind) -> list[tuple[str, str]]:
+    inspector = sa.inspect(bind)
+    return [
+        (table, column['name'])
+        for table in inspector.get_table_names()
+        if table != 'alembic_version'
+        for column in inspector.get_columns(table)
+        if str(column['type']) == 'CHAR(32)'
+    ]
+
+
+def convert(bind, table: str, column: str, source: str, to_value) -> None:
+    select_batch = sa.text(
+        f'SELECT rowid, "{column}" FROM "{table}" WHERE typeof("{column}") = :source LIMIT :limit'
+    )
+    update_row = sa.text(f'UPDATE "{table}" SET "{column}" = :value WHERE rowid = :row_id')
+    while True:
+        rows = bind.execute(select_batch, {'source': source, 'limit': BATCH_SIZE}).all()
+        if not rows:
+            return
+        bind.execute(update_row, [{'value': to_value(value), 'row_id': row_id} for row_id, value in rows])
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite' or not app_settings.compact_uuids:
+        return
+    with op.get_context().autocommit_block():
+        for table, column in uuid_columns(bind):
+            convert(bind, table, column, 'text', lambda value: uuid.UUID(value).bytes)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    with op.get_context().autocommit_block():
+        for table, column in uuid_columns(bind):
+            convert(bind, table, column, 'blob', lambda value: uuid.UUID(bytes=value).hex)
@@ -0,0 +1,32 @@
+"""20_add_version_columns
+
+Revision ID: f61d3b8a2c94
+Revises: e4b1c8f37a65
+Create Date: 2026-10-19 17:52:26.318407
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f61d3b8a2c94'
+down_revision = 'e4b1c8f37a65'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'genres', 'publishers', 'developers', 'games', 'platforms')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+        # The ORM sets versions itself, a server default would make it fetch
+        # the value back with RETURNING on every update.
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('version', server_default=None)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'version')
@@ -1,10 +1,52 @@
+import logging
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
-from fastapi_mail import FastMail
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm.exc import StaleDataError
 
-from src.core.config import app_settings, mail_config
+from src.core.config import app_settings
+from src.core.deadline import statement_timeout_handler
+from src.core.logger import setup_logging
+from src.core.middleware import IdempotencyMiddleware, InFlightRequestsMiddleware, in_flight
 from src.api.v1 import base
+from src.db.db import get_engine, get_session_maker
+from src.services.campaign_scheduler import get_campaign_scheduler
+from src.services.changes import change_feed
+from src.services.outbox import get_outbox_relay
+from src.services.similar import similar_games
+from src.services.warmup import warm_up
+from src.tools.base import stale_data_handler
+
+logger = logging.getLogger('lifespan')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    engine = get_engine()
+    try:
+        await get_outbox_relay().start()
+    except Exception:
+        logger.exception('Outbox relay failed to start, other workers changes are not applied')
+    try:
+        await warm_up(engine, connections=app_settings.db_warmup_connections)
+    except Exception:
+        logger.exception('Warmup failed, continue with cold pool')
+    if app_settings.campaign_scheduler:
+        get_campaign_scheduler().start()
+    similar_games.start(get_session_maker(), interval=app_settings.similar_rebuild_interval)
+    yield
+    # Streams would hold the drain below for up to change_feed_max_duration.
+    change_feed.close()
+    await similar_games.stop()
+    await get_outbox_relay().stop()
+    await get_campaign_scheduler().stop()
+    if not await in_flight.drain(timeout=app_settings.shutdown_drain_timeout):
+        logger.warning('Shutdown with %s requests still in flight', in_flight.count)
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -14,8 +56,11 @@ app = FastAPI(
     default_response_class=ORJSONResponse,
     swagger_ui_oauth2_redirect_url='/authorization/token'
 )
-
-fast_mail = FastMail(config=mail_config)
+app.router.lifespan_context = lifespan
+app.add_middleware(IdempotencyMiddleware, wait_timeout=app_settings.idempotency_wait_timeout)
+app.add_middleware(InFlightRequestsMiddleware, tracker=in_flight)
+app.add_exception_handler(DBAPIError, statement_timeout_handler)
+app.add_exception_handler(StaleDataError, stale_data_handler)
 
 app.include_router(base.api_router, prefix='/api/v1')
 
@@ -0,0 +1,54 @@
+import os
+import threading
+import time
+import uuid
+from typing import Callable
+
+from src.core.config import app_settings
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    48 bits of unix milliseconds lead, so new ids sort after older ones and
+    inserts append to the right edge of the primary key btree. The 12 bits after
+    the version are a counter seeded at random each millisecond, which keeps ids
+    of one process monotonic within the same millisecond.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        timestamp, counter = _last_ms, _counter
+    value = (timestamp & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= int.from_bytes(os.urandom(8), 'big') & 0x3FFFFFFFFFFFFFFF
+    return uuid.UUID(int=value)
+
+
+ID_GENERATORS: dict[str, Callable[[], uuid.UUID]] = {
+    'uuid1': uuid.uuid1,
+    'uuid4': uuid.uuid4,
+    'uuid7': uuid7
+}
+
+
+def id_generator(table: str) -> Callable[[], uuid.UUID]:
+    """Id default of `table`: `id_generators[table]` if set, else `id_generator`."""
+    name = app_settings.id_generators.get(table, app_settings.id_generator)
+    if name not in ID_GENERATORS:
+        raise ValueError(f'Unknown id generator {name!r} for table {table!r}, use one of {sorted(ID_GENERATORS)}')
+    return ID_GENERATORS[name]
@@ -1,14 +1,31 @@
 import uuid
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional, List
 
-from sqlalchemy import String, DateTime, Integer, event, ForeignKey, Float
-from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy_utils import UUIDType, EmailType, ChoiceType
+from sqlalchemy import (
+    BigInteger,
+    String,
+    DateTime,
+    Integer,
+    LargeBinary,
+    event,
+    ForeignKey,
+    Float,
+    JSON,
+    Index,
+    case,
+    func,
+    select
+)
+from sqlalchemy.orm import relationship, Mapped, mapped_column, column_property
+from sqlalchemy_utils import EmailType, ChoiceType
 from slugify import slugify
 
 from src.db.db import Base
 from .enums import UserRoles
+from .ids import id_generator
+from .types import uuid_type
 
 
 class User(Base):
@@ -16,7 +33,9 @@ class User(Base):
 
     __tablename__ = 'users'
 
-    id: Mapped[uuid] = mapped_column(UUIDType(binary=False), primary_key=True, default=uuid.uuid1)
+    id: Mapped[uuid] = mapped_column(uuid_type(), primary_key=True, default=id_generator('users'))
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    __mapper_args__ = {'version_id_col': version}
     username: Mapped[str] = mapped_column(String(125), nullable=False, unique=True)
     email: Mapped[str] = mapped_column(EmailType(255), nullable=False, unique=True)
     hashed_password: Mapped[str] = mapped_column(String(125), nullable=False)
@@ -45,14 +64,21 @@ class Genre(Base):
 
     __tablename__ = 'genres'
 
-    id: Mapped[uuid] = mapped_column(UUIDType(binary=False), primary_key=True, default=uuid.uuid1)
+    id: Mapped[uuid] = mapped_column(uuid_type(), primary_key=True, default=id_generator('genres'))
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    __mapper_args__ = {'version_id_col': version}
     name: Mapped[str] = mapped_column(String(75), nullable=False, unique=True)
-    slug: Mapped[str] = mapped_column(String(75))
+    slug: Mapped[str] = mapped_column(String(75), unique=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=datetime.utcnow)
     description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     # parent_id = Column(UUIDType(binary=False), ForeignKey('categories.id'))
     # children = relationship('Genre', backref=backref('parent', remote_side=[id]))
-    games: Mapped[List['Game']] = relationship(secondary='genres_games', back_populates='genres', lazy='joined')
+    games: Mapped[List['Game']] = relationship(
+        secondary='genres_games',
+        back_populates='genres',
+        lazy='raise',
+        passive_deletes=True
+    )
 
     @staticmethod
     def generate_slug(target, value, oldvalue, initiator):
@@ -68,13 +94,16 @@ class Publisher(Base):
 
     __tablename__ = 'publishers'
 
-    id: Mapped[uuid] = mapped_column(UUIDType(binary=False), primary_key=True, default=uuid.uuid1)
+    id: Mapped[uuid] = mapped_column(uuid_type(), primary_key=True, default=id_generator('publishers'))
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    __mapper_args__ = {'version_id_col': version}
     name: Mapped[str] = mapped_column(String(150), nullable=False)
     country: Mapped[Optional[str]] = mapped_column(String(150))
     games: Mapped[List['Game']] = relationship(
         secondary='publishers_games',
         back_populates='publishers',
-        lazy='joined'
+        lazy='raise',
+        passive_deletes=True
     )
 
     def __repr__(self):
@@ -86,13 +115,16 @@ class Developer(Base):
 
     __tablename__ = 'developers'
 
-    id: Mapped[uuid] = mapped_column(UUIDType(binary=False), primary_key=True, default=uuid.uuid1)
+    id: Mapped[uuid] = mapped_column(uuid_type(), primary_key=True, default=id_generator('developers'))
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    __mapper_args__ = {'version_id_col': version}
     name: Mapped[str] = mapped_column(String(150), nullable=False)
     country: Mapped[Optional[str]] = mapped_column(String(150), nullable=True)
     games: Mapped[List['Game']] = relationship(
         secondary='developers_games',
         back_populates='developers',
-        lazy='joined'
+        lazy='raise',
+        passive_deletes=True
     )
 
     def __repr__(self):
@@ -104,10 +136,13 @@ class Game(Base):
 
     __tablename__ = 'games'
 
-    id: Mapped[uuid] = mapped_column(UUIDType(binary=False), primary_key=True, default=uuid.uuid1)
+    id: Mapped[uuid] = mapped_column(uuid_type(), primary_key=True, default=id_generator('games'))
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    __mapper_args__ = {'version_id_col': version}
     name: Mapped[str] = mapped_column(String(75), nullable=False)
     price: Mapped[float] = mapped_column(Float(precision=2, asdecimal=True))
     discount: Mapped[float] = mapped_column(Float(precision=2, asdecimal=True), nullable=True, default=0.00)
+    final_price: Mapped[Optional[float]] = mapped_column(Float(precision=2, asdecimal=True), nullable=True, index=True)
     description: Mapped[str] = mapped_column(String(500), nullable=False)
     genres: Mapped[List['Genre']] = relationship(secondary='genres_games', back_populates='games', lazy='joined')
     release_date: Mapped[datetime] = mapped_column(DateTime, index=True, nullable=False)
@@ -127,6 +162,26 @@ class Game(Base):
         lazy='joined'
     )
 
+    @staticmethod
+    def calculate_final_price(price, discount) -> Optional[Decimal]:
+        if price is None:
+            return None
+        return max(Decimal(str(price)) - Decimal(str(discount or 0)), Decimal('0.00'))
+
+    @staticmethod
+    def final_price_expression(price, discount):
+        """SQL counterpart of `calculate_final_price` for set-based updates."""
+        discount = func.coalesce(discount, 0)
+        return case((price > discount, price - discount), else_=0)
+
+    @staticmethod
+    def update_final_price_by_price(target, value, oldvalue, initiator):
+        target.final_price = Game.calculate_final_price(value, target.discount)
+
+    @staticmethod
+    def update_final_price_by_discount(target, value, oldvalue, initiator):
+        target.final_price = Game.calculate_final_price(target.price, value)
+
     def __repr__(self):
         return f'<Game>: id:{self.id}, name:{self.name}'
 
@@ -135,6 +190,9 @@ class GenreGame(Base):
     """Genres to games many-to-many model."""
 
     __tablename__ = 'genres_games'
+    __table_args__ = (
+        Index('ix_genres_games_game_id_genre_id', 'game_id', 'genre_id'),
+    )
 
     genre_id: Mapped[uuid] = mapped_column(ForeignKey('genres.id'), primary_key=True)
     game_id: Mapped[uuid] = mapped_column(ForeignKey('games.id'), primary_key=True)
@@ -144,27 +202,69 @@ class DeveloperGame(Base):
     """Developers to games many-to-many model."""
 
     __tablename__ = 'developers_games'
+    __table_args__ = (
+        Index('ix_developers_games_game_id_developer_id', 'game_id', 'developer_id'),
+    )
 
-    developer_id: Mapped[uuid] = mapped_column(UUIDType(binary=False), ForeignKey('developers.id'), primary_key=True)
-    game_id: Mapped[uuid] = mapped_column(UUIDType(binary=False), ForeignKey('games.id'), primary_key=True)
+    developer_id: Mapped[uuid] = mapped_column(uuid_type(), ForeignKey('developers.id'), primary_key=True)
+    game_id: Mapped[uuid] = mapped_column(uuid_type(), ForeignKey('games.id'), primary_key=True)
 
 
 class PublisherGame(Base):
     """Publishers to games many-to-many model."""
 
     __tablename__ = 'publishers_games'
+    __table_args__ = (
+        Index('ix_publishers_games_game_id_publisher_id', 'game_id', 'publisher_id'),
+    )
 
-    publisher_id: Mapped[uuid] = mapped_column(UUIDType(binary=False), ForeignKey('publishers.id'), primary_key=True)
-    game_id: Mapped[uuid] = mapped_column(UUIDType(binary=False), ForeignKey('games.id'), primary_key=True)
+    publisher_id: Mapped[uuid] = mapped_column(uuid_type(), ForeignKey('publishers.id'), primary_key=True)
+    game_id: Mapped[uuid] = mapped_column(uuid_type(), ForeignKey('games.id'), primary_key=True)
 
 
 class PlatformGame(Base):
     """Platforms to games many-to-many model."""
 
     __tablename__ = 'platforms_games'
+    __table_args__ = (
+        Index('ix_platforms_games_game_id_platform_id', 'game_id', 'platform_id'),
+    )
 
-    platform_id: Mapped[uuid] = mapped_column(UUIDType(binary=False), ForeignKey('platforms.id'), primary_key=True)
-    game_id: Mapped[uuid] = mapped_column(UUIDType(binary=False), ForeignKey('games.id'), primary_key=True)
+    platform_id: Mapped[uuid] = mapped_column(uuid_type(), ForeignKey('platforms.id'), primary_key=True)
+    game_id: Mapped[uuid] = mapped_column(uuid_type(), ForeignKey('games.id'), primary_key=True)
+
+
+class GameCard(Base):
+    """Denormalized game projection for catalog listings.
+
+    One row per game with its scalar fields and compact arrays of related
+    entities, maintained on write by the repositories.
+    """
+
+    __tablename__ = 'game_cards'
+
+    game_id: Mapped[uuid] = mapped_column(
+        uuid_type(),
+        ForeignKey('games.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    name: Mapped[str] = mapped_column(String(75), nullable=False, index=True)
+    price: Mapped[float] = mapped_column(Float(precision=2, asdecimal=True))
+    discount: Mapped[float] = mapped_column(Float(precision=2, asdecimal=True), nullable=True)
+    final_price: Mapped[Optional[float]] = mapped_column(Float(precision=2, asdecimal=True), nullable=True, index=True)
+    description: Mapped[str] = mapped_column(String(500), nullable=False)
+    release_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    genre_ids: Mapped[list] = mapped_column(JSON, default=list)
+    genre_names: Mapped[list] = mapped_column(JSON, default=list)
+    developer_ids: Mapped[list] = mapped_column(JSON, default=list)
+    developer_names: Mapped[list] = mapped_column(JSON, default=list)
+    publisher_ids: Mapped[list] = mapped_column(JSON, default=list)
+    publisher_names: Mapped[list] = mapped_column(JSON, default=list)
+    platform_ids: Mapped[list] = mapped_column(JSON, default=list)
+    platform_names: Mapped[list] = mapped_column(JSON, default=list)
+
+    def __repr__(self):
+        return f'<GameCard>: game_id:{self.game_id}, name:{self.name}'
 
 
 class Platform(Base):
@@ -172,16 +272,151 @@ class Platform(Base):
 
     __tablename__ = 'platforms'
 
-    id: Mapped[uuid] = mapped_column(UUIDType(binary=False), primary_key=True, default=uuid.uuid1)
+    id: Mapped[uuid] = mapped_column(uuid_type(), primary_key=True, default=id_generator('platforms'))
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    __mapper_args__ = {'version_id_col': version}
     name: Mapped[str] = mapped_column(String(75), nullable=False)
     games: Mapped[List['Game']] = relationship(
         secondary='platforms_games',
         back_populates='platforms',
-        lazy='joined'
+        lazy='raise',
+        passive_deletes=True
     )
 
     def __repr__(self):
         return f'<Platform>: id:{self.id}, name:{self.name}'
 
 
+class IdempotencyKey(Base):
+    """Outcome of a POST request sent with Idempotency-Key header.
+
+    `status_code` is empty while the first attempt is in progress.
+    """
+
+    __tablename__ = 'idempotency_keys'
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    headers: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+
+    def __repr__(self):
+        return f'<IdempotencyKey>: key:{self.key}, status_code:{self.status_code}'
+
+
+class OutboxEvent(Base):
+    """Catalog change stored in the transaction that made it.
+
+    Rows are relayed to the other workers in id order, `origin` is the worker
+    that wrote the row and already published the change itself.
+    """
+
+    __tablename__ = 'catalog_outbox'
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)
+    origin: Mapped[str] = mapped_column(String(255), nullable=False)
+    entity: Mapped[str] = mapped_column(String(64), nullable=False)
+    action: Mapped[str] = mapped_column(String(16), nullable=False)
+    entity_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<OutboxEvent>: id:{self.id}, entity:{self.entity}, action:{self.action}'
+
+
+class PricingCampaign(Base):
+    """Discount of selected games scheduled for a time window.
+
+    Games are selected by `game_ids` and by linked genre, publisher and
+    platform. `status` moves from `scheduled` to `active` to `finished`, or to
+    `missed` when the whole window passed before the campaign could start.
+    """
+
+    __tablename__ = 'pricing_campaigns'
+    __table_args__ = (
+        Index('ix_pricing_campaigns_status_starts_at', 'status', 'starts_at'),
+        Index('ix_pricing_campaigns_status_ends_at', 'status', 'ends_at'),
+    )
+
+    id: Mapped[uuid] = mapped_column(uuid_type(), primary_key=True, default=id_generator('pricing_campaigns'))
+    name: Mapped[str] = mapped_column(String(150), nullable=False)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    value: Mapped[float] = mapped_column(Float(precision=2, asdecimal=True), nullable=False)
+    starts_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    ends_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    game_ids: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    genre_id: Mapped[Optional[uuid]] = mapped_column(uuid_type(), nullable=True)
+    publisher_id: Mapped[Optional[uuid]] = mapped_column(uuid_type(), nullable=True)
+    platform_id: Mapped[Optional[uuid]] = mapped_column(uuid_type(), nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default='scheduled')
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<PricingCampaign>: id:{self.id}, name:{self.name}, status:{self.status}'
+
+
+class CampaignGame(Base):
+    """Game discounted by a campaign with the discount it had before."""
+
+    __tablename__ = 'campaign_games'
+    __table_args__ = (
+        Index('ix_campaign_games_game_id_campaign_id', 'game_id', 'campaign_id'),
+    )
+
+    campaign_id: Mapped[uuid] = mapped_column(
+        ForeignKey('pricing_campaigns.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    game_id: Mapped[uuid] = mapped_column(ForeignKey('games.id', ondelete='CASCADE'), primary_key=True)
+    previous_discount: Mapped[Optional[float]] = mapped_column(Float(precision=2, asdecimal=True), nullable=True)
+
+
+class Lease(Base):
+    """Named lock held by one worker until `expires_at` unless renewed."""
+
+    __tablename__ = 'leases'
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(255), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<Lease>: name:{self.name}, holder:{self.holder}'
+
+
+Index('uq_games_name_lower', func.lower(Game.name), unique=True)
+# Trigram indexes serve infix name searches, they need the pg_trgm extension.
+for _model in (Game, Publisher, Developer):
+    Index(
+        f'ix_{_model.__tablename__}_name_trgm',
+        _model.name,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'}
+    ).ddl_if(dialect='postgresql')
+
+
+def games_count_property(link, entity_id):
+    """Deferred number of games linked to the entity, read from the association table.
+
+    Writes to the entity row do not change the count, so a loaded value
+    survives flushes instead of being reloaded after every update.
+    """
+    return column_property(
+        select(func.count()).where(link == entity_id).correlate_except(link.table).scalar_subquery(),
+        deferred=True,
+        expire_on_flush=False
+    )
+
+
+Genre.games_count = games_count_property(GenreGame.genre_id, Genre.id)
+Publisher.games_count = games_count_property(PublisherGame.publisher_id, Publisher.id)
+Developer.games_count = games_count_property(DeveloperGame.developer_id, Developer.id)
+Platform.games_count = games_count_property(PlatformGame.platform_id, Platform.id)
+
 event.listen(Genre.name, 'set', Genre.generate_slug, retval=False)
+event.listen(Game.price, 'set', Game.update_final_price_by_price, retval=False)
+event.listen(Game.discount, 'set', Game.update_final_price_by_discount, retval=False)
@@ -0,0 +1,42 @@
+import uuid
+
+from sqlalchemy import types
+from sqlalchemy_utils import UUIDType
+
+from src.core.config import app_settings
+
+
+class _StoredBinary(types.BINARY):
+    """BINARY(16) that hands stored values over unchanged, hex strings included."""
+
+    def result_processor(self, dialect, coltype):
+        return None
+
+
+class CompactUUIDType(UUIDType):
+    """UUIDType that reads both hex strings and 16-byte values.
+
+    Postgres always stores native `uuid`. On other databases values are written
+    as BINARY(16) when `compact_uuids` is on and as CHAR(32) otherwise. Both
+    forms are read, but comparisons bind the configured form only, so the
+    stored ids must be converted with writers stopped, see migration 19.
+    """
+
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        impl = super().load_dialect_impl(dialect)
+        if isinstance(impl, types.BINARY):
+            return dialect.type_descriptor(_StoredBinary(16))
+        return impl
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes) and not self.binary:
+            return uuid.UUID(bytes=value)
+        if isinstance(value, str) and self.binary:
+            return uuid.UUID(value)
+        return super().process_result_value(value, dialect)
+
+
+def uuid_type() -> CompactUUIDType:
+    return CompactUUIDType(binary=app_settings.compact_uuids)
@@ -0,0 +1,16 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    kind: str
+    id: UUID
+    name: str
+
+    class Config:
+        orm_mode = True
+
+
+class SuggestionMulti(BaseModel):
+    __root__: list[Suggestion]
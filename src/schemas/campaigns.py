@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel, validator, root_validator
+
+from .games import GameDiscountBulk, DiscountKind
+from .users import ORM
+
+
+class CampaignCreate(GameDiscountBulk):
+    name: str
+    starts_at: datetime
+    ends_at: datetime
+
+    @validator('starts_at', 'ends_at')
+    def convert_to_utc(cls, v):
+        if v.tzinfo is not None:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+    @root_validator(skip_on_failure=True)
+    def check_window(cls, values):
+        if values['ends_at'] <= values['starts_at']:
+            raise ValueError('campaign must end after it starts')
+        return values
+
+
+class CampaignInDB(ORM):
+    id: UUID
+    name: str
+    kind: DiscountKind
+    value: Decimal
+    starts_at: datetime
+    ends_at: datetime
+    game_ids: list[UUID] | None
+    genre_id: UUID | None
+    publisher_id: UUID | None
+    platform_id: UUID | None
+    status: str
+    created_at: datetime
+
+
+class CampaignMulti(BaseModel):
+    __root__: list[CampaignInDB]
+
+
+class CampaignDelete(BaseModel):
+    info: str
@@ -1,8 +1,9 @@
+import enum
 from datetime import date, datetime
 from decimal import Decimal
+from uuid import UUID
 
-from pydantic.types import UUID1
-from pydantic import BaseModel, condecimal, validator
+from pydantic import BaseModel, condecimal, conlist, validator, root_validator
 
 from .users import ORM
 from .genres import Genre
@@ -46,8 +47,17 @@ class GameUpdate(GameCreate):
         return v
 
 
+class GameSort(str, enum.Enum):
+    FINAL_PRICE = 'final_price'
+    FINAL_PRICE_DESC = '-final_price'
+    ADDED = 'added'
+    RECENTLY_ADDED = '-added'
+
+
 class GameInDB(GameCreate):
-    id: UUID1
+    id: UUID
+    version: int
+    final_price: Decimal | None
     genres: list[Genre]
     developers: list[PubDev]
     publishers: list[PubDev]
@@ -55,12 +65,97 @@ class GameInDB(GameCreate):
 
 
 class Game(GameCreate):
-    id: UUID1
+    id: UUID
 
 
 class GameMulti(BaseModel):
     __root__: list[GameInDB]
 
 
+class GameCard(ORM):
+    game_id: UUID
+    name: str
+    price: Decimal
+    discount: Decimal | None
+    final_price: Decimal | None
+    release_date: date
+    genre_ids: list[str]
+    genre_names: list[str]
+    developer_ids: list[str]
+    developer_names: list[str]
+    publisher_ids: list[str]
+    publisher_names: list[str]
+    platform_ids: list[str]
+    platform_names: list[str]
+
+
+class GameCardMulti(BaseModel):
+    __root__: list[GameCard]
+
+
+class SimilarGame(BaseModel):
+    score: float
+    game: GameCard
+
+
+class SimilarGameMulti(BaseModel):
+    __root__: list[SimilarGame]
+
+
+class FacetCount(BaseModel):
+    value: str
+    name: str
+    count: int
+
+
+class GameFacets(BaseModel):
+    total: int
+    genres: list[FacetCount]
+    platforms: list[FacetCount]
+    publishers: list[FacetCount]
+    prices: list[FacetCount]
+    release_years: list[FacetCount]
+
+
+# Ids one batch request may ask for, after comma separated values are split.
+GET_BATCH_MAX_IDS = 100
+POST_BATCH_MAX_IDS = 1000
+
+
+class GameBatchRequest(BaseModel):
+    ids: conlist(str, min_items=1, max_items=POST_BATCH_MAX_IDS)
+
+
+class GameBatch(BaseModel):
+    games: list[GameInDB]
+    missing: list[str]
+
+
+class DiscountKind(str, enum.Enum):
+    ABSOLUTE = 'absolute'
+    PERCENT = 'percent'
+
+
+class GameDiscountBulk(BaseModel):
+    kind: DiscountKind = DiscountKind.ABSOLUTE
+    value: condecimal(ge=Decimal('0.00'))
+    ids: conlist(UUID, max_items=10000) | None = None
+    genre_id: UUID | None = None
+    publisher_id: UUID | None = None
+    platform_id: UUID | None = None
+
+    @root_validator(skip_on_failure=True)
+    def check_selection(cls, values):
+        if values['kind'] == DiscountKind.PERCENT and values['value'] > 100:
+            raise ValueError('percent discount must not exceed 100')
+        if not any(values.get(key) is not None for key in ('ids', 'genre_id', 'publisher_id', 'platform_id')):
+            raise ValueError('select games by ids, genre_id, publisher_id or platform_id')
+        return values
+
+
+class GameDiscountBulkResult(BaseModel):
+    updated: int
+
+
 class GameDelete(BaseModel):
     info: str
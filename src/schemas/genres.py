@@ -1,6 +1,6 @@
 from datetime import datetime
+from uuid import UUID
 
-from pydantic.types import UUID1
 from pydantic import BaseModel
 
 from .users import ORM
@@ -17,14 +17,15 @@ class GenreUpdate(ORM):
 
 
 class GenreInDB(GenreCreate):
-    id: UUID1
+    id: UUID
+    version: int
     created_at: datetime
     slug: str
-    games: list = []
+    games_count: int = 0
 
 
 class Genre(GenreCreate):
-    id: UUID1
+    id: UUID
     created_at: datetime
     slug: str
 
@@ -1,6 +1,6 @@
 from datetime import datetime
+from uuid import UUID
 
-from pydantic.types import UUID1
 from pydantic import BaseModel
 
 from .users import ORM
@@ -15,12 +15,13 @@ class PlatformUpdate(PlatformCreate):
 
 
 class PlatformInDB(PlatformCreate):
-    id: UUID1
-    games: list = []
+    id: UUID
+    version: int
+    games_count: int = 0
 
 
 class Platform(PlatformCreate):
-    id: UUID1
+    id: UUID
 
 
 class PlatformMulti(BaseModel):
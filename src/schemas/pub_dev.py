@@ -1,4 +1,5 @@
-from pydantic.types import UUID1
+from uuid import UUID
+
 from pydantic import BaseModel
 
 from .users import ORM
@@ -15,12 +16,13 @@ class PubDevUpdate(PubDevCreate):
 
 
 class PubDevInDB(PubDevCreate):
-    id: UUID1
-    games: list = []
+    id: UUID
+    version: int
+    games_count: int = 0
 
 
 class PubDev(PubDevCreate):
-    id: UUID1
+    id: UUID
 
 
 class PubDevMulti(BaseModel):
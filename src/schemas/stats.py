@@ -0,0 +1,39 @@
+import enum
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class StatsEntity(str, enum.Enum):
+    GENRES = 'genres'
+    PUBLISHERS = 'publishers'
+    DEVELOPERS = 'developers'
+    PLATFORMS = 'platforms'
+
+
+class EntityGamesCount(BaseModel):
+    id: UUID
+    name: str
+    games_count: int
+
+
+class EntityGamesCountMulti(BaseModel):
+    __root__: list[EntityGamesCount]
+
+
+class PriceStats(BaseModel):
+    games: int
+    discounted_games: int
+    average_price: Decimal | None
+    average_discount: Decimal | None
+    average_final_price: Decimal | None
+
+
+class ReleaseMonth(BaseModel):
+    month: str
+    games: int
+
+
+class ReleaseMonthMulti(BaseModel):
+    __root__: list[ReleaseMonth]
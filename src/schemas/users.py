@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import Optional
+from uuid import UUID
 
-from pydantic import EmailStr, UUID1, BaseModel, validator
+from pydantic import EmailStr, BaseModel, validator
 from fastapi import HTTPException, status
 
 from .auth import Token
@@ -36,7 +37,8 @@ class UserRegisterResponse(User):
 
 
 class UserInDB(User):
-    id: UUID1
+    id: UUID
+    version: int
     created_at: datetime
     role: UserRoles
 
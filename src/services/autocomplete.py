@@ -0,0 +1,204 @@
+import asyncio
+import bisect
+import heapq
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.metrics import metrics
+from src.models.models import Game, Publisher, Developer
+from .events import CatalogEvent, DELETE, catalog_events
+from .game_cards import ENTITY_LINKS
+from .warmup import register_primer
+
+KINDS = {
+    'games': Game,
+    'publishers': Publisher,
+    'developers': Developer
+}
+MIN_INFIX_LENGTH = 3
+MAX_SUGGESTIONS = 25
+# Rankings of prefixes up to this length scan large ranges and are cached.
+SHORT_PREFIX_LENGTH = 2
+SHORT_PREFIX_TTL = 30
+WORD_START = re.compile(r'(?:^|(?<=[\s\-_:.,/]))\w', re.UNICODE)
+
+autocomplete_requests = metrics.counter(
+    'autocomplete_requests_total',
+    'Autocomplete queries by source of the answer (index, infix).'
+)
+
+
+def normalize(text: str) -> str:
+    return ' '.join(text.casefold().split())
+
+
+@dataclass
+class Suggestion:
+    kind: str
+    id: str
+    name: str
+
+
+class NameIndex:
+    """Per-worker prefix index of game, publisher and developer names.
+
+    Every word start of a normalized name is a key of a sorted list, so a
+    prefix query is a bisect plus a scan of the matching range, and "witch"
+    finds "The Witcher". Matches are ranked by popularity: the number of games
+    of a company and the number of detail views of a game in this worker.
+    Rankings of short prefixes are cached for `SHORT_PREFIX_TTL` seconds or
+    until a name changes, so views move them with a delay.
+    """
+
+    def __init__(self):
+        self._keys: list[tuple[str, str]] = []
+        self._entries: dict[str, Suggestion] = {}
+        self._popularity: dict[str, float] = {}
+        self._short: dict[str, tuple[float, list[str]]] = {}
+        self._lock = asyncio.Lock()
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_id(kind: str, obj_id: str) -> str:
+        return f'{kind}:{obj_id}'
+
+    @staticmethod
+    def _index_keys(name: str) -> set[str]:
+        name = normalize(name)
+        return {name[match.start():] for match in WORD_START.finditer(name)}
+
+    def build(self, rows: list[tuple[str, str, str]], popularity: Optional[dict[tuple[str, str], float]] = None):
+        """Replace the index with (kind, id, name) rows."""
+        entries = {}
+        keys = []
+        for kind, obj_id, name in rows:
+            entry_id = self._entry_id(kind, str(obj_id))
+            entries[entry_id] = Suggestion(kind=kind, id=str(obj_id), name=name)
+            keys.extend((key, entry_id) for key in self._index_keys(name))
+        keys.sort()
+        self._keys = keys
+        self._entries = entries
+        self._short.clear()
+        self._popularity = {
+            self._entry_id(kind, str(obj_id)): value
+            for (kind, obj_id), value in (popularity or {}).items()
+        }
+        self.ready = True
+
+    async def load(self, db: AsyncSession) -> None:
+        rows = []
+        popularity = {}
+        for kind, model in KINDS.items():
+            results = await db.execute(select(model.id, model.name))
+            rows.extend((kind, obj_id, name) for obj_id, name in results)
+            if kind in ENTITY_LINKS:
+                link = ENTITY_LINKS[kind]
+                results = await db.execute(select(link, func.count()).group_by(link))
+                popularity.update(((kind, str(obj_id)), count) for obj_id, count in results)
+        self.build(rows, popularity)
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self.ready:
+            return
+        async with self._lock:
+            if not self.ready:
+                await self.load(db)
+
+    def set(self, kind: str, obj_id: str, name: str) -> None:
+        self.remove(kind, obj_id)
+        entry_id = self._entry_id(kind, obj_id)
+        self._entries[entry_id] = Suggestion(kind=kind, id=obj_id, name=name)
+        for key in self._index_keys(name):
+            bisect.insort(self._keys, (key, entry_id))
+        self._short.clear()
+
+    def remove(self, kind: str, obj_id: str) -> None:
+        entry_id = self._entry_id(kind, obj_id)
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for key in self._index_keys(entry.name):
+            position = bisect.bisect_left(self._keys, (key, entry_id))
+            if position < len(self._keys) and self._keys[position] == (key, entry_id):
+                del self._keys[position]
+        self._short.clear()
+
+    def touch(self, kind: str, obj_id: str, amount: float = 1) -> None:
+        entry_id = self._entry_id(kind, obj_id)
+        self._popularity[entry_id] = self._popularity.get(entry_id, 0) + amount
+
+    def _rank(self, prefix: str, limit: int) -> list[str]:
+        matches = set()
+        position = bisect.bisect_left(self._keys, (prefix, ''))
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            matches.add(self._keys[position][1])
+            position += 1
+        return heapq.nsmallest(
+            limit,
+            matches,
+            key=lambda entry_id: (
+                -self._popularity.get(entry_id, 0),
+                len(self._entries[entry_id].name),
+                self._entries[entry_id].name
+            )
+        )
+
+    def search(self, q: str, limit: int = 10) -> list[Suggestion]:
+        prefix = normalize(q)
+        if not prefix:
+            return []
+        if len(prefix) > SHORT_PREFIX_LENGTH or limit > MAX_SUGGESTIONS:
+            return [self._entries[entry_id] for entry_id in self._rank(prefix, limit)]
+        now = time.monotonic()
+        cached = self._short.get(prefix)
+        if cached is None or cached[0] <= now:
+            cached = (now + SHORT_PREFIX_TTL, self._rank(prefix, MAX_SUGGESTIONS))
+            self._short[prefix] = cached
+        return [self._entries[entry_id] for entry_id in cached[1][:limit]]
+
+    def on_event(self, catalog_event: CatalogEvent) -> None:
+        if not self.ready or catalog_event.entity not in KINDS or catalog_event.entity_id is None:
+            return
+        if catalog_event.action == DELETE:
+            self.remove(catalog_event.entity, catalog_event.entity_id)
+        elif 'name' in catalog_event.data:
+            self.set(catalog_event.entity, catalog_event.entity_id, catalog_event.data['name'])
+
+
+async def autocomplete(db: AsyncSession, q: str, limit: int = 10) -> list[Suggestion]:
+    """Prefix matches from the index, topped up by infix matches from the database.
+
+    On Postgres the infix query is served by the trigram indexes on names.
+    """
+    await name_index.ensure_loaded(db)
+    suggestions = name_index.search(q, limit=limit)
+    q = q.strip()
+    if len(suggestions) >= limit or len(q) < MIN_INFIX_LENGTH:
+        autocomplete_requests.inc(source='index')
+        return suggestions
+    autocomplete_requests.inc(source='infix')
+    found = {(suggestion.kind, suggestion.id) for suggestion in suggestions}
+    for kind, model in KINDS.items():
+        statement = select(model.id, model.name).where(
+            model.name.icontains(q, autoescape=True)
+        ).order_by(func.length(model.name), model.name).limit(limit)
+        for obj_id, name in await db.execute(statement):
+            if (kind, str(obj_id)) not in found and len(suggestions) < limit:
+                found.add((kind, str(obj_id)))
+                suggestions.append(Suggestion(kind=kind, id=str(obj_id), name=name))
+    return suggestions
+
+
+name_index = NameIndex()
+for table in KINDS:
+    catalog_events.add_payload_builder(table, lambda obj: {'name': obj.name})
+catalog_events.subscribe(name_index.on_event)
+register_primer(name_index.load)
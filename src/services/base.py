@@ -4,18 +4,21 @@ from src.models.models import (
     Publisher as PublisherModel,
     Developer as DeveloperModel,
     Platform as PlatformModel,
-    Game as GameModel
+    Game as GameModel,
+    PricingCampaign as PricingCampaignModel
 )
 from src.schemas.users import UserRegister, UserUpgrade, ForgetPasswordRequestBody
 from src.schemas.genres import GenreCreate, GenreUpdate
 from src.schemas.pub_dev import PubDevCreate, PubDevUpdate
 from src.schemas.platforms import PlatformCreate, PlatformUpdate
 from src.schemas.games import GameCreate, GameUpdate
+from src.schemas.campaigns import CampaignCreate
 from .users import RepositoryUserDB
 from .genres import RepositoryGenreDB
 from .pub_dev import RepositoryDevPubDB
 from .platforms import RepositoryPlatformDB
 from .games import RepositoryGameDB
+from .campaigns import RepositoryCampaignDB
 
 
 class RepositoryUser(
@@ -69,9 +72,19 @@ class RepositoryGame(
     pass
 
 
+class RepositoryCampaign(
+    RepositoryCampaignDB[
+        PricingCampaignModel,
+        CampaignCreate
+    ]
+):
+    pass
+
+
 user_crud = RepositoryUser(UserModel)
 genre_crud = RepositoryGenre(GenreModel)
 publisher_crud = RepositoryPubDev(PublisherModel)
 developer_crud = RepositoryPubDev(DeveloperModel)
 platform_crud = RepositoryPlatform(PlatformModel)
 game_crud = RepositoryGame(GameModel)
+campaign_crud = RepositoryCampaign(PricingCampaignModel, game_crud)
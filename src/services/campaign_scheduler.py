@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import app_settings
+from src.core.metrics import metrics
+from src.db.db import get_session_maker
+from .base import campaign_crud
+from .campaigns import ACTIVE, FINISHED, MISSED
+from .leases import acquire_lease, release_lease
+
+logger = logging.getLogger('campaigns')
+
+LEASE_NAME = 'campaign_scheduler'
+
+campaign_transitions = metrics.counter(
+    'campaign_transitions_total',
+    'Pricing campaign status changes made by the scheduler, by status.'
+)
+
+
+class CampaignScheduler:
+    """In-process runner of pricing campaign boundaries.
+
+    Every worker runs the loop, but only the holder of the `campaign_scheduler`
+    lease applies boundaries. Each tick compares campaign windows with the
+    current time, so boundaries passed while no worker ran are caught up on
+    the next tick: late starts are applied for the rest of the window, and
+    campaigns whose whole window passed are marked `missed`.
+    """
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            *,
+            interval: float,
+            lease_ttl: float
+    ):
+        self._session_maker = session_maker
+        self.interval = interval
+        self.lease_ttl = lease_ttl
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def tick(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Apply due boundaries, return seconds until the next one if this worker leads."""
+        now = now or datetime.utcnow()
+        async with self._session_maker() as db:
+            leader = await acquire_lease(db, LEASE_NAME, ttl=self.lease_ttl)
+            await db.commit()
+            if not leader:
+                return None
+            ending, starting = await campaign_crud.get_due(db, now)
+            for campaign in ending:
+                updated = await campaign_crud.deactivate(db, campaign)
+                if campaign.status == FINISHED:
+                    campaign_transitions.inc(status=FINISHED)
+                    logger.info('Finish campaign %s, restore discounts of %s games', campaign.id, updated)
+            for campaign in starting:
+                if campaign.ends_at <= now:
+                    if await campaign_crud.skip(db, campaign):
+                        campaign_transitions.inc(status=MISSED)
+                        logger.warning('Campaign %s window passed before it could start', campaign.id)
+                    continue
+                updated = await campaign_crud.activate(db, campaign)
+                if campaign.status == ACTIVE:
+                    campaign_transitions.inc(status=ACTIVE)
+                    logger.info('Start campaign %s, discount %s games', campaign.id, updated)
+            boundary = await campaign_crud.get_next_boundary(db)
+        if boundary is None:
+            return None
+        return max((boundary - datetime.utcnow()).total_seconds(), 0)
+
+    def wake(self) -> None:
+        """Tick now, for example after a campaign was created or cancelled."""
+        self._wake.set()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                delay = await self.tick()
+            except Exception:
+                logger.exception('Campaign scheduler tick failed')
+                delay = None
+            timeout = self.interval if delay is None else min(delay, self.interval)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the loop and hand the lease over to other workers."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        async with self._session_maker() as db:
+            await release_lease(db, LEASE_NAME)
+            await db.commit()
+
+
+@lru_cache()
+def get_campaign_scheduler() -> CampaignScheduler:
+    return CampaignScheduler(
+        get_session_maker(),
+        interval=app_settings.campaign_tick_interval,
+        lease_ttl=app_settings.campaign_lease_ttl
+    )
@@ -0,0 +1,260 @@
+import uuid
+from datetime import datetime
+from typing import TypeVar, Generic, Type, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import select, func, update, delete, insert, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.db.db import Base
+from src.models.models import Game, CampaignGame
+from .events import catalog_events, CatalogEvent, PATCH
+from .lookups import memoized_lookup
+from .games import game_selection, discount_expression
+
+ModelType = TypeVar('ModelType', bound=Base)
+CreateSchemaType = TypeVar('CreateSchemaType', bound=BaseModel)
+
+SCHEDULED = 'scheduled'
+ACTIVE = 'active'
+FINISHED = 'finished'
+MISSED = 'missed'
+# Claimed by delete, the row is gone when its transaction commits.
+CANCELLED = 'cancelled'
+
+
+class RepositoryCampaignDB(Generic[ModelType, CreateSchemaType]):
+    """Pricing campaigns and the set-based discount updates at their boundaries.
+
+    Every status change is claimed by a conditional UPDATE of the campaign
+    row, so a boundary is applied once even if two runners reach it.
+    """
+
+    def __init__(
+            self,
+            model: Type[ModelType],
+            game_crud
+    ):
+        self._model = model
+        self._game_crud = game_crud
+
+    @memoized_lookup('id', 'campaign_id')
+    async def get_by_id(
+            self,
+            db: AsyncSession,
+            campaign_id: str
+    ) -> Optional[ModelType]:
+        statement = select(self._model).where(self._model.id == campaign_id)
+        results = await db.execute(statement=statement)
+        return results.scalar_one_or_none()
+
+    async def get_multi(
+            self,
+            db: AsyncSession,
+            *,
+            skip=0,
+            limit=100,
+            status: Optional[str] = None
+    ) -> list[ModelType]:
+        statement = select(self._model)
+        if status is not None:
+            statement = statement.where(self._model.status == status)
+        statement = statement.order_by(self._model.starts_at, self._model.id).offset(skip).limit(limit)
+        results = await db.execute(statement=statement)
+        return results.scalars().all()
+
+    async def get_due(
+            self,
+            db: AsyncSession,
+            now: datetime
+    ) -> tuple[list[ModelType], list[ModelType]]:
+        """Active campaigns to finish and scheduled campaigns to start at `now`."""
+        ending = await db.execute(
+            select(self._model).where(self._model.status == ACTIVE, self._model.ends_at <= now)
+        )
+        starting = await db.execute(
+            select(self._model).where(
+                self._model.status == SCHEDULED,
+                self._model.starts_at <= now
+            ).order_by(self._model.starts_at)
+        )
+        return ending.scalars().all(), starting.scalars().all()
+
+    async def get_next_boundary(
+            self,
+            db: AsyncSession
+    ) -> Optional[datetime]:
+        statement = select(func.min(self._model.starts_at)).where(self._model.status == SCHEDULED)
+        starts_at = (await db.execute(statement)).scalar_one_or_none()
+        statement = select(func.min(self._model.ends_at)).where(self._model.status == ACTIVE)
+        ends_at = (await db.execute(statement)).scalar_one_or_none()
+        return min((value for value in (starts_at, ends_at) if value is not None), default=None)
+
+    async def create(
+            self,
+            db: AsyncSession,
+            *,
+            obj_in: CreateSchemaType
+    ) -> ModelType:
+        db_obj = self._model(
+            name=obj_in.name,
+            kind=obj_in.kind.value,
+            value=obj_in.value,
+            starts_at=obj_in.starts_at,
+            ends_at=obj_in.ends_at,
+            game_ids=[str(game_id) for game_id in obj_in.ids] if obj_in.ids is not None else None,
+            genre_id=obj_in.genre_id,
+            publisher_id=obj_in.publisher_id,
+            platform_id=obj_in.platform_id,
+            status=SCHEDULED
+        )
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def _claim(
+            self,
+            db: AsyncSession,
+            campaign: ModelType,
+            *,
+            status_from: str,
+            status_to: str
+    ) -> bool:
+        statement = update(self._model).where(
+            self._model.id == campaign.id,
+            self._model.status == status_from
+        ).values(status=status_to).execution_options(synchronize_session=False)
+        if (await db.execute(statement)).rowcount != 1:
+            return False
+        set_committed_value(campaign, 'status', status_to)
+        return True
+
+    def _record(self, db: AsyncSession, campaign: ModelType, updated: int) -> None:
+        if updated:
+            catalog_events.record_event(
+                db,
+                CatalogEvent(
+                    entity=Game.__tablename__,
+                    action=PATCH,
+                    data={'updated': updated, 'campaign_id': str(campaign.id)}
+                )
+            )
+
+    def _members(self, campaign: ModelType):
+        return lambda game_id: [
+            game_id.in_(select(CampaignGame.game_id).where(CampaignGame.campaign_id == campaign.id))
+        ]
+
+    async def activate(
+            self,
+            db: AsyncSession,
+            campaign: ModelType
+    ) -> int:
+        """Discount the selected games, return the number of discounted games.
+
+        Discounts the games had are saved to restore them at the end. Games
+        already discounted by another active campaign are left to it.
+        """
+        if not await self._claim(db, campaign, status_from=SCHEDULED, status_to=ACTIVE):
+            await db.commit()
+            return 0
+        taken = select(CampaignGame.game_id).join(
+            self._model, self._model.id == CampaignGame.campaign_id
+        ).where(
+            self._model.status == ACTIVE,
+            self._model.id != campaign.id
+        )
+        game_ids = [uuid.UUID(game_id) for game_id in campaign.game_ids] if campaign.game_ids is not None else None
+        await db.execute(
+            insert(CampaignGame).from_select(
+                ['campaign_id', 'game_id', 'previous_discount'],
+                select(
+                    literal(campaign.id, self._model.id.type),
+                    Game.id,
+                    Game.discount
+                ).where(
+                    *game_selection(
+                        Game.id,
+                        game_ids=game_ids,
+                        genre_id=campaign.genre_id,
+                        publisher_id=campaign.publisher_id,
+                        platform_id=campaign.platform_id
+                    ),
+                    Game.id.not_in(taken)
+                )
+            )
+        )
+        updated = await self._game_crud.update_discounts(
+            db=db,
+            selection=self._members(campaign),
+            discount=discount_expression(kind=campaign.kind, value=campaign.value)
+        )
+        self._record(db, campaign, updated)
+        await db.commit()
+        return updated
+
+    async def deactivate(
+            self,
+            db: AsyncSession,
+            campaign: ModelType,
+            *,
+            status_to: str = FINISHED
+    ) -> int:
+        """Restore discounts the games had before the campaign, return their number."""
+        if not await self._claim(db, campaign, status_from=ACTIVE, status_to=status_to):
+            await db.commit()
+            return 0
+        updated = await self._restore_discounts(db, campaign)
+        await db.commit()
+        return updated
+
+    async def _restore_discounts(
+            self,
+            db: AsyncSession,
+            campaign: ModelType
+    ) -> int:
+        def previous_discount(price, game_id):
+            return select(CampaignGame.previous_discount).where(
+                CampaignGame.campaign_id == campaign.id,
+                CampaignGame.game_id == game_id
+            ).scalar_subquery()
+
+        updated = await self._game_crud.update_discounts(
+            db=db,
+            selection=self._members(campaign),
+            discount=previous_discount
+        )
+        self._record(db, campaign, updated)
+        return updated
+
+    async def skip(
+            self,
+            db: AsyncSession,
+            campaign: ModelType
+    ) -> bool:
+        """Mark a campaign whose whole window has passed, its games are not touched."""
+        claimed = await self._claim(db, campaign, status_from=SCHEDULED, status_to=MISSED)
+        await db.commit()
+        return claimed
+
+    async def delete(
+            self,
+            db: AsyncSession,
+            *,
+            obj: ModelType
+    ) -> None:
+        """Delete the campaign, restoring discounts of an active one.
+
+        The status read with `obj` may be stale, so it is claimed like a
+        boundary: a campaign the scheduler activates meanwhile fails the
+        scheduled claim and has its discounts restored by the active one.
+        """
+        for status_from in (SCHEDULED, ACTIVE):
+            if await self._claim(db, obj, status_from=status_from, status_to=CANCELLED):
+                if status_from == ACTIVE:
+                    await self._restore_discounts(db, obj)
+                break
+        await db.execute(delete(CampaignGame).where(CampaignGame.campaign_id == obj.id))
+        await db.delete(obj)
+        await db.commit()
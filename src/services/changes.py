@@ -0,0 +1,157 @@
+import asyncio
+import json
+import logging
+import secrets
+import time
+from typing import AsyncIterator, Optional
+
+from src.core.config import app_settings
+from src.core.metrics import metrics
+from .events import CatalogEvent, catalog_events
+
+logger = logging.getLogger('changes')
+
+FEED_ENTITIES = ('games', 'genres', 'publishers', 'developers', 'platforms')
+# Events sent in one chunk at most, so a far behind client still yields often.
+MAX_BATCH = 100
+# Reconnection delay suggested to clients when a stream ends.
+RETRY_MILLISECONDS = 1000
+
+feed_subscribers = metrics.gauge(
+    'change_feed_subscribers',
+    'Clients connected to the catalog change stream.'
+)
+feed_disconnects = metrics.counter(
+    'change_feed_disconnects_total',
+    'Change stream connections closed by the server, by reason (slow, expired, shutdown).'
+)
+
+
+class ChangeFeed:
+    """Per-worker ring buffer of catalog changes streamed as server-sent events.
+
+    Publishing writes the encoded event into a fixed ring slot and resolves one
+    future shared by all idle subscribers, so its cost does not depend on the
+    number of clients. Each client only keeps a cursor into the ring; one that
+    falls more than `client_buffer` events behind is disconnected and may
+    resume with `Last-Event-ID` while it is less than that behind.
+
+    Event ids are `<epoch>-<sequence>`, the epoch changes on every worker
+    start, so an id from another worker or process gets a `reset` event
+    telling the client to reload instead of silently missing changes.
+    """
+
+    def __init__(self, capacity: int, client_buffer: int):
+        self.capacity = capacity
+        self.client_buffer = min(client_buffer, capacity)
+        self.epoch = secrets.token_hex(4)
+        self._ring: list[Optional[str]] = [None] * capacity
+        self._head = 0
+        self._waiter: Optional[asyncio.Future] = None
+        self.subscribers = 0
+        self.closed = False
+
+    @property
+    def last_event_id(self) -> str:
+        return f'{self.epoch}-{self._head}'
+
+    def publish(self, catalog_event: CatalogEvent) -> None:
+        if catalog_event.entity not in FEED_ENTITIES:
+            return
+        self._head += 1
+        change = {
+            'entity': catalog_event.entity,
+            'action': catalog_event.action,
+            'id': catalog_event.entity_id
+        }
+        if catalog_event.entity_id is None:
+            change['data'] = catalog_event.data
+        self._ring[self._head % self.capacity] = (
+            f'id: {self.epoch}-{self._head}\ndata: {json.dumps(change, default=str)}\n\n'
+        )
+        self._wake()
+
+    def close(self) -> None:
+        """End all streams once they sent the published events, for shutdown."""
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter, self._waiter = self._waiter, None
+        if waiter is not None and not waiter.done() and not waiter.get_loop().is_closed():
+            waiter.set_result(None)
+
+    async def _wait(self, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        if self._waiter is None or self._waiter.done() or self._waiter.get_loop() is not loop:
+            self._waiter = loop.create_future()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._waiter), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def resume_from(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Cursor to continue after `last_event_id`, None if it can not be resumed."""
+        if last_event_id is None:
+            return self._head
+        epoch, _, sequence = last_event_id.partition('-')
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        if sequence > self._head or self._head - sequence > self.client_buffer:
+            return None
+        return sequence
+
+    async def stream(
+            self,
+            last_event_id: Optional[str],
+            heartbeat: float,
+            max_duration: float
+    ) -> AsyncIterator[str]:
+        """Server-sent events after `last_event_id`, live changes without it.
+
+        The stream ends after `max_duration` seconds and the client reconnects
+        with the id of the last received event, which bounds how long a worker
+        keeps a connection and lets clients spread over restarted workers.
+        Streams also end when the feed is closed on shutdown.
+        """
+        cursor = self.resume_from(last_event_id)
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        if cursor is None:
+            cursor = self._head
+            yield f'id: {self.last_event_id}\nevent: reset\ndata: {{}}\n\n'
+        expires_at = time.monotonic() + max_duration
+        self.subscribers += 1
+        feed_subscribers.set(self.subscribers)
+        try:
+            while True:
+                if cursor == self._head:
+                    if self.closed:
+                        feed_disconnects.inc(reason='shutdown')
+                        return
+                    remaining = expires_at - time.monotonic()
+                    if remaining <= 0:
+                        feed_disconnects.inc(reason='expired')
+                        return
+                    await self._wait(min(heartbeat, remaining))
+                    if cursor == self._head:
+                        yield ': keepalive\n\n'
+                    continue
+                if self._head - cursor > self.client_buffer:
+                    feed_disconnects.inc(reason='slow')
+                    logger.info('Disconnect change stream client %s events behind', self._head - cursor)
+                    return
+                end = min(self._head, cursor + MAX_BATCH)
+                chunk = ''.join(self._ring[sequence % self.capacity] for sequence in range(cursor + 1, end + 1))
+                cursor = end
+                yield chunk
+        finally:
+            self.subscribers -= 1
+            feed_subscribers.set(self.subscribers)
+
+
+change_feed = ChangeFeed(
+    capacity=app_settings.change_feed_capacity,
+    client_buffer=app_settings.change_feed_client_buffer
+)
+catalog_events.subscribe(change_feed.publish)
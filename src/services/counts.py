@@ -0,0 +1,105 @@
+import time
+from typing import Hashable, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import app_settings
+from src.db.db import Base
+from .events import CatalogEvent, CREATE, DELETE, catalog_events
+
+
+class TotalCounter:
+    """Totals for list endpoints.
+
+    Small tables are counted exactly on every call. Totals of tables listed in
+    `cached_tables` are kept in process: on Postgres the first value comes from
+    planner statistics (`pg_class.reltuples`) once the table is large enough,
+    then it is adjusted by create/delete events of the repositories until it
+    is counted again after `ttl` seconds, which bounds the drift of estimates
+    and of replayed events. Filtered totals are cached for `ttl` seconds, at
+    most `max_filtered` of them; the oldest are dropped first.
+    """
+
+    def __init__(self, cached_tables: set[str], ttl: float, exact_threshold: int, max_filtered: int = 1024):
+        self._cached_tables = cached_tables
+        self._ttl = ttl
+        self._exact_threshold = exact_threshold
+        self._max_filtered = max_filtered
+        self._totals: dict[str, tuple[float, int]] = {}
+        self._filtered: dict[tuple, tuple[float, int]] = {}
+
+    async def _exact(self, db: AsyncSession, model: type[Base], filters: tuple = ()) -> int:
+        statement = select(func.count()).select_from(model).where(*filters)
+        return (await db.execute(statement)).scalar_one()
+
+    async def _estimate(self, db: AsyncSession, model: type[Base]) -> Optional[int]:
+        if db.bind.dialect.name != 'postgresql':
+            return None
+        statement = text(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)'
+        )
+        estimate = (await db.execute(statement, {'table': model.__tablename__})).scalar_one_or_none()
+        if estimate is None or estimate < self._exact_threshold:
+            return None
+        return estimate
+
+    async def total(
+            self,
+            db: AsyncSession,
+            model: type[Base],
+            *,
+            filters: tuple = (),
+            cache_key: Optional[Hashable] = None
+    ) -> int:
+        table = model.__tablename__
+        if filters:
+            key = (table, cache_key)
+            cached = self._filtered.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            value = await self._exact(db, model, filters)
+            self._store_filtered(key, value)
+            return value
+        if table not in self._cached_tables:
+            return await self._exact(db, model)
+        cached = self._totals.get(table)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        estimate = await self._estimate(db, model)
+        value = estimate if estimate is not None else await self._exact(db, model)
+        self._totals[table] = (time.monotonic() + self._ttl, value)
+        return value
+
+    def _store_filtered(self, key: tuple, value: int) -> None:
+        now = time.monotonic()
+        self._filtered.pop(key, None)
+        if len(self._filtered) >= self._max_filtered:
+            for expired in [key for key, (expires_at, _) in self._filtered.items() if expires_at <= now]:
+                del self._filtered[expired]
+        while len(self._filtered) >= self._max_filtered:
+            del self._filtered[next(iter(self._filtered))]
+        self._filtered[key] = (now + self._ttl, value)
+
+    def on_event(self, catalog_event: CatalogEvent) -> None:
+        table = catalog_event.entity
+        if table in self._totals:
+            expires_at, value = self._totals[table]
+            if catalog_event.action == CREATE:
+                self._totals[table] = (expires_at, value + 1)
+            elif catalog_event.action == DELETE:
+                self._totals[table] = (expires_at, max(value - 1, 0))
+        for key in [key for key in self._filtered if key[0] == table]:
+            self._filtered.pop(key, None)
+
+    def reset(self) -> None:
+        self._totals.clear()
+        self._filtered.clear()
+
+
+total_counter = TotalCounter(
+    cached_tables={'games'},
+    ttl=app_settings.count_cache_ttl,
+    exact_threshold=app_settings.exact_count_threshold
+)
+catalog_events.subscribe(total_counter.on_event)
@@ -0,0 +1,98 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.db.db import Base
+
+logger = logging.getLogger('events')
+
+CREATE = 'create'
+PATCH = 'patch'
+DELETE = 'delete'
+
+
+@dataclass(frozen=True)
+class CatalogEvent:
+    entity: str
+    action: str
+    entity_id: str | None = None
+    data: dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+Listener = Callable[[CatalogEvent], None]
+
+
+class CatalogEvents:
+    """In-process bus of committed mutations.
+
+    Repositories record changes in the session; events are published to
+    listeners after the transaction commits and dropped on rollback.
+    """
+
+    def __init__(self):
+        self._listeners: list[Listener] = []
+        self.payload_builders: dict[str, list[Callable[[Base], dict]]] = defaultdict(list)
+
+    def subscribe(self, listener: Listener) -> Listener:
+        self._listeners.append(listener)
+        return listener
+
+    def add_payload_builder(self, entity: str, builder: Callable[[Base], dict]) -> None:
+        """Add fields built from the changed object to event data of `entity`."""
+        self.payload_builders[entity].append(builder)
+
+    def record(self, db: AsyncSession | Session, action: str, obj: Base) -> None:
+        """Queue change of ORM object, its id and payload are read at commit."""
+        db.info.setdefault('catalog_events', []).append((action, obj))
+
+    def record_event(self, db: AsyncSession | Session, catalog_event: CatalogEvent) -> None:
+        db.info.setdefault('catalog_events', []).append(catalog_event)
+
+    def build_event(self, action: str, obj: Base) -> CatalogEvent:
+        entity = obj.__tablename__
+        data = {}
+        for builder in self.payload_builders.get(entity, ()):
+            data.update(builder(obj))
+        return CatalogEvent(
+            entity=entity,
+            action=action,
+            entity_id=str(obj.id),
+            data=data
+        )
+
+    def prepare(self, session: Session) -> list[CatalogEvent]:
+        """Build the events queued in the session, so they can be stored before commit."""
+        items = session.info.get('catalog_events')
+        if not items:
+            return []
+        prepared = [item if isinstance(item, CatalogEvent) else self.build_event(*item) for item in items]
+        session.info['catalog_events'] = prepared
+        return prepared
+
+    def publish(self, catalog_event: CatalogEvent) -> None:
+        for listener in self._listeners:
+            try:
+                listener(catalog_event)
+            except Exception:
+                logger.exception('Listener %s failed on %s', listener, catalog_event)
+
+
+catalog_events = CatalogEvents()
+
+
+@event.listens_for(Session, 'after_commit')
+def publish_recorded_events(session: Session) -> None:
+    prepared = catalog_events.prepare(session)
+    session.info.pop('catalog_events', None)
+    for catalog_event in prepared:
+        catalog_events.publish(catalog_event)
+
+
+@event.listens_for(Session, 'after_rollback')
+def drop_recorded_events(session: Session) -> None:
+    session.info.pop('catalog_events', None)
@@ -0,0 +1,380 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+import time
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import app_settings
+from src.core.metrics import metrics
+from src.models.models import Game, GameCard
+from .events import CatalogEvent, DELETE, catalog_events
+from .game_cards import RELATIONS
+from .warmup import register_primer
+
+logger = logging.getLogger('facets')
+
+RELATION_FACETS = ('genres', 'platforms', 'publishers')
+PRICE_FACET = 'prices'
+YEAR_FACET = 'release_years'
+# Games per whole currency unit of final price, to build price range filters.
+PRICE_UNIT_FACET = 'price_units'
+# Postings at least this long are counted through a bitmap, shorter ones slot by slot.
+DENSE_POSTING = 64
+
+facet_rebuild_seconds = metrics.gauge(
+    'game_facets_rebuild_seconds',
+    'Duration of the last rebuild of the game facets index.'
+)
+
+FacetCount = tuple[str, str, int]
+
+
+class GameFacets:
+    """In-memory posting lists of games per facet value, for sidebar counts.
+
+    Every game gets a dense slot number and every facet value (a genre,
+    platform or publisher id, a final price bucket or a release year) keeps the
+    set of slots of its games. Counts for a price range filter are the sizes of
+    the intersections of each posting with the filter: long postings are
+    intersected as int bitmaps and popcounted, short ones are probed slot by
+    slot. The filter bitmap is the union of the price bucket bitmaps and the
+    whole currency unit bitmaps that the range covers, plus the games of the
+    units at its edges.
+
+    The index is loaded from the game cards and updated in place by catalog
+    events; bulk price changes mark it stale until the next query reloads it.
+    Events that arrive while it loads are queued and applied after the build,
+    since the load may have read the cards before their commits; applying a
+    change the load already saw is harmless.
+    """
+
+    def __init__(self, price_buckets: Iterable[Decimal]):
+        self.bounds = [Decimal(0)] + sorted(Decimal(str(bound)) for bound in price_buckets)
+        self.bucket_labels = [
+            f'{low}-{high}' for low, high in zip(self.bounds, self.bounds[1:])
+        ] + [f'{self.bounds[-1]}+']
+        self._slots: dict[str, int] = {}
+        self._free: list[int] = []
+        # Facet values and final price in cents of the game in each slot.
+        self._rows: list[Optional[frozenset[tuple[str, str]]]] = []
+        self._cents: list[Optional[int]] = []
+        self._postings: dict[str, dict[str, set[int]]] = defaultdict(dict)
+        self._bitmaps: dict[tuple[str, str], int] = {}
+        self._order: dict[str, list[str]] = {}
+        self._names: dict[tuple[str, str], str] = {}
+        self._lock = asyncio.Lock()
+        self._pending: Optional[list[CatalogEvent]] = None
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def price_bucket(self, final_price: Decimal) -> int:
+        return max(bisect.bisect_right(self.bounds, final_price) - 1, 0)
+
+    def _features(
+            self,
+            final_price: Optional[Decimal],
+            release_year: Optional[int],
+            relations: Iterable[tuple[str, str]]
+    ) -> frozenset[tuple[str, str]]:
+        features = {(relation, str(entity_id)) for relation, entity_id in relations if relation in RELATION_FACETS}
+        if final_price is not None:
+            features.add((PRICE_FACET, self.bucket_labels[self.price_bucket(final_price)]))
+            features.add((PRICE_UNIT_FACET, str(int(final_price))))
+        if release_year is not None:
+            features.add((YEAR_FACET, str(release_year)))
+        return frozenset(features)
+
+    def build(self, rows: Iterable[tuple[str, Optional[Decimal], Optional[int], Iterable[tuple[str, str]]]]) -> None:
+        """Replace the index with (game_id, final_price, release_year, relation links) rows."""
+        self._slots.clear()
+        self._free.clear()
+        self._rows = []
+        self._cents = []
+        self._postings = defaultdict(dict)
+        self._bitmaps.clear()
+        self._order.clear()
+        for game_id, final_price, release_year, relations in rows:
+            slot = len(self._rows)
+            final_price = None if final_price is None else Decimal(str(final_price))
+            features = self._features(final_price, release_year, relations)
+            self._slots[str(game_id)] = slot
+            self._rows.append(features)
+            self._cents.append(cents(final_price))
+            for facet, value in features:
+                self._postings[facet].setdefault(value, set()).add(slot)
+        self.ready = True
+
+    async def load(self, db: AsyncSession) -> None:
+        started = time.perf_counter()
+        columns = [GameCard.game_id, GameCard.final_price, GameCard.release_date]
+        for relation in RELATION_FACETS:
+            prefix = RELATIONS[relation]
+            columns += [getattr(GameCard, f'{prefix}_ids'), getattr(GameCard, f'{prefix}_names')]
+        rows = []
+        names = {}
+        self._pending = []
+        try:
+            for game_id, final_price, release_date, *links in await db.execute(select(*columns)):
+                relations = []
+                for relation, ids, entity_names in zip(RELATION_FACETS, links[::2], links[1::2]):
+                    relations.extend((relation, entity_id) for entity_id in ids or ())
+                    names.update(
+                        ((relation, entity_id), name) for entity_id, name in zip(ids or (), entity_names or ())
+                    )
+                rows.append((game_id, final_price, release_date.year if release_date else None, relations))
+            self.build(rows)
+            self._names = names
+            for catalog_event in self._pending:
+                self._apply(catalog_event)
+        finally:
+            self._pending = None
+        duration = time.perf_counter() - started
+        facet_rebuild_seconds.set(duration)
+        logger.info('Game facets index of %s games built in %.3f s', len(self._slots), duration)
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self.ready:
+            return
+        async with self._lock:
+            if not self.ready:
+                await self.load(db)
+
+    def _add(self, feature: tuple[str, str], slot: int) -> None:
+        facet, value = feature
+        self._postings[facet].setdefault(value, set()).add(slot)
+        if feature in self._bitmaps:
+            self._bitmaps[feature] |= 1 << slot
+        self._order.pop(facet, None)
+
+    def _discard(self, feature: tuple[str, str], slot: int) -> None:
+        facet, value = feature
+        posting = self._postings[facet].get(value)
+        if posting is None:
+            return
+        posting.discard(slot)
+        if not posting:
+            del self._postings[facet][value]
+            self._bitmaps.pop(feature, None)
+        elif feature in self._bitmaps:
+            self._bitmaps[feature] &= ~(1 << slot)
+        self._order.pop(facet, None)
+
+    def set_game(
+            self,
+            game_id: str,
+            final_price: Optional[Decimal],
+            release_year: Optional[int],
+            relations: Optional[Iterable[tuple[str, str]]] = None
+    ) -> None:
+        """Index a game; with `relations` None its linked entities are kept."""
+        slot = self._slots.get(game_id)
+        if slot is None:
+            slot = self._free.pop() if self._free else len(self._rows)
+            if slot == len(self._rows):
+                self._rows.append(None)
+                self._cents.append(None)
+            self._slots[game_id] = slot
+        previous = self._rows[slot]
+        if relations is None:
+            relations = [feature for feature in previous if feature[0] in RELATION_FACETS] if previous else []
+        final_price = None if final_price is None else Decimal(str(final_price))
+        features = self._features(final_price, release_year, relations)
+        for feature in (previous or frozenset()) - features:
+            self._discard(feature, slot)
+        for feature in features - (previous or frozenset()):
+            self._add(feature, slot)
+        self._rows[slot] = features
+        self._cents[slot] = cents(final_price)
+
+    def remove_game(self, game_id: str) -> None:
+        slot = self._slots.pop(game_id, None)
+        if slot is None:
+            return
+        for feature in self._rows[slot]:
+            self._discard(feature, slot)
+        self._rows[slot] = None
+        self._cents[slot] = None
+        self._free.append(slot)
+
+    def remove_value(self, facet: str, value: str) -> None:
+        """Drop a deleted genre, platform or publisher from all games."""
+        feature = (facet, value)
+        self._names.pop(feature, None)
+        for slot in list(self._postings[facet].get(value, ())):
+            self._rows[slot] = self._rows[slot] - {feature}
+            self._discard(feature, slot)
+
+    def _bitmap(self, feature: tuple[str, str]) -> int:
+        bitmap = self._bitmaps.get(feature)
+        if bitmap is None:
+            bitmap = bitmap_of(self._postings[feature[0]][feature[1]], len(self._rows))
+            self._bitmaps[feature] = bitmap
+        return bitmap
+
+    def _price_filter(self, min_final_price: Optional[Decimal], max_final_price: Optional[Decimal]) -> int:
+        """Bitmap of games with final price in the range, bounds included."""
+        low = Decimal(0) if min_final_price is None else min_final_price
+        high = max_final_price
+        low_cents = math.ceil(low * 100)
+        high_cents = None if high is None else math.floor(high * 100)
+        mask = 0
+        covered_low = covered_high = None
+        for bucket, label in enumerate(self.bucket_labels):
+            bucket_high = self.bounds[bucket + 1] if bucket + 1 < len(self.bounds) else None
+            within = low <= self.bounds[bucket] and (
+                high is None or bucket_high is not None and bucket_high <= high
+            )
+            if not within:
+                continue
+            if covered_low is None:
+                covered_low = self.bounds[bucket]
+            covered_high = bucket_high
+            if label in self._postings[PRICE_FACET]:
+                mask |= self._bitmap((PRICE_FACET, label))
+        edge_slots = []
+        prices = self._cents
+        for value, posting in self._postings[PRICE_UNIT_FACET].items():
+            unit = int(value)
+            if unit + 1 <= low or high is not None and unit > high:
+                continue
+            if covered_low is not None and covered_low <= unit and (
+                covered_high is None or unit + 1 <= covered_high
+            ):
+                continue
+            if low <= unit and (high is None or unit + 1 <= high) and len(posting) >= DENSE_POSTING:
+                mask |= self._bitmap((PRICE_UNIT_FACET, value))
+                continue
+            edge_slots.extend(
+                slot for slot in posting
+                if low_cents <= prices[slot] and (high_cents is None or prices[slot] <= high_cents)
+            )
+        return mask | bitmap_of(edge_slots, len(self._rows))
+
+    def _ordered(self, facet: str) -> list[str]:
+        """Values of a facet by posting length, longest first."""
+        order = self._order.get(facet)
+        if order is None:
+            postings = self._postings[facet]
+            order = sorted(postings, key=lambda value: len(postings[value]), reverse=True)
+            self._order[facet] = order
+        return order
+
+    def counts(
+            self,
+            *,
+            min_final_price: Optional[Decimal] = None,
+            max_final_price: Optional[Decimal] = None,
+            limit: int = 20
+    ) -> tuple[int, dict[str, list[FacetCount]]]:
+        """Number of matching games and (value, name, count) per facet.
+
+        Relation facets hold the `limit` values with most games, price buckets
+        are all listed in price order and release years newest first.
+        """
+        filtered = min_final_price is not None or max_final_price is not None
+        mask = self._price_filter(min_final_price, max_final_price) if filtered else None
+        mask_bytes = mask.to_bytes(len(self._rows) // 8 + 1, 'little') if filtered else None
+
+        def count(feature: tuple[str, str]) -> int:
+            posting = self._postings[feature[0]].get(feature[1], ())
+            if not filtered:
+                return len(posting)
+            if len(posting) >= DENSE_POSTING:
+                return (self._bitmap(feature) & mask).bit_count()
+            return sum(mask_bytes[slot >> 3] >> (slot & 7) & 1 for slot in posting)
+
+        facets = {}
+        for facet in RELATION_FACETS:
+            best = []
+            postings = self._postings[facet]
+            for value in self._ordered(facet):
+                # Postings are visited longest first, so once the shortest kept
+                # count reaches the posting length no later value can beat it.
+                if len(best) == limit and best[0][0] >= len(postings[value]):
+                    break
+                value_count = count((facet, value))
+                if value_count and (len(best) < limit or value_count > best[0][0]):
+                    item = (value_count, self._names.get((facet, value), ''), value)
+                    if len(best) < limit:
+                        heapq.heappush(best, item)
+                    else:
+                        heapq.heapreplace(best, item)
+            facets[facet] = [
+                (value, name, value_count)
+                for value_count, name, value in sorted(best, key=lambda item: (-item[0], item[1], item[2]))
+            ]
+        facets[PRICE_FACET] = [
+            (label, label, count((PRICE_FACET, label))) for label in self.bucket_labels
+        ]
+        years = sorted(self._postings[YEAR_FACET], key=int, reverse=True)
+        facets[YEAR_FACET] = [
+            (year, year, year_count) for year in years if (year_count := count((YEAR_FACET, year)))
+        ]
+        total = mask.bit_count() if filtered else len(self._slots)
+        return total, facets
+
+    def on_event(self, catalog_event: CatalogEvent) -> None:
+        if self._pending is not None:
+            self._pending.append(catalog_event)
+        elif self.ready:
+            self._apply(catalog_event)
+
+    def _apply(self, catalog_event: CatalogEvent) -> None:
+        if catalog_event.entity == Game.__tablename__:
+            if catalog_event.entity_id is None:
+                # Bulk price changes do not list their games, reload on next query.
+                self.ready = False
+            elif catalog_event.action == DELETE:
+                self.remove_game(catalog_event.entity_id)
+            elif 'release_year' in catalog_event.data:
+                features = catalog_event.data.get('features')
+                self.set_game(
+                    catalog_event.entity_id,
+                    catalog_event.data['final_price'],
+                    catalog_event.data['release_year'],
+                    None if features is None else [tuple(feature) for feature in features]
+                )
+        elif catalog_event.entity in RELATION_FACETS and catalog_event.entity_id is not None:
+            if catalog_event.action == DELETE:
+                self.remove_value(catalog_event.entity, catalog_event.entity_id)
+            elif 'name' in catalog_event.data:
+                self._names[(catalog_event.entity, catalog_event.entity_id)] = catalog_event.data['name']
+
+
+def cents(price: Optional[Decimal]) -> Optional[int]:
+    return None if price is None else int(price * 100)
+
+
+def bitmap_of(slots: Iterable[int], size: int) -> int:
+    """Int with the bits of `slots` set."""
+    bits = bytearray(size // 8 + 1)
+    for slot in slots:
+        bits[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def game_facet_values(game: Game) -> dict:
+    """Final price and release year of a loaded game, for the catalog event."""
+    if 'final_price' not in game.__dict__ or 'release_date' not in game.__dict__:
+        return {}
+    return {
+        'final_price': None if game.final_price is None else str(game.final_price),
+        'release_year': game.release_date.year
+    }
+
+
+game_facets = GameFacets(price_buckets=app_settings.facet_price_buckets)
+catalog_events.add_payload_builder(Game.__tablename__, game_facet_values)
+for table in RELATION_FACETS:
+    catalog_events.add_payload_builder(table, lambda obj: {'name': obj.name})
+catalog_events.subscribe(game_facets.on_event)
+register_primer(game_facets.ensure_loaded)
@@ -0,0 +1,217 @@
+import uuid
+from typing import TypeVar, Generic, Type, Optional, Iterable
+
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.db.db import Base
+from src.models.models import Game, GenreGame, DeveloperGame, PublisherGame, PlatformGame, GameCard
+
+ModelType = TypeVar('ModelType', bound=Base)
+
+RELATIONS = {
+    'genres': 'genre',
+    'developers': 'developer',
+    'publishers': 'publisher',
+    'platforms': 'platform'
+}
+ENTITY_LINKS = {
+    'genres': GenreGame.genre_id,
+    'developers': DeveloperGame.developer_id,
+    'publishers': PublisherGame.publisher_id,
+    'platforms': PlatformGame.platform_id
+}
+CHUNK_SIZE = 500
+
+
+def card_values(game: Game) -> dict:
+    """Build projection row from game with loaded relations."""
+    values = {
+        'game_id': game.id,
+        'name': game.name,
+        'price': game.price,
+        'discount': game.discount,
+        'final_price': game.final_price,
+        'description': game.description,
+        'release_date': game.release_date
+    }
+    for relation, prefix in RELATIONS.items():
+        entities = getattr(game, relation)
+        values[f'{prefix}_ids'] = [str(entity.id) for entity in entities]
+        values[f'{prefix}_names'] = [entity.name for entity in entities]
+    return values
+
+
+class RepositoryGameCardDB(Generic[ModelType]):
+    def __init__(
+            self,
+            model: Type[ModelType]
+    ):
+        self._model = model
+
+    async def get_multi(
+            self,
+            db: AsyncSession,
+            *,
+            skip=0,
+            limit=100,
+            q: Optional[str] = None
+    ) -> list[ModelType]:
+        statement = select(self._model)
+        if q:
+            statement = statement.where(self._model.name.icontains(q, autoescape=True))
+        statement = statement.order_by(self._model.name).offset(skip).limit(limit)
+        results = await db.execute(statement=statement)
+        return results.scalars().all()
+
+    async def upsert(
+            self,
+            db: AsyncSession,
+            *,
+            games: Iterable[Game]
+    ) -> None:
+        rows = [card_values(game) for game in games]
+        if not rows:
+            return
+        insert = postgresql_insert if db.bind.dialect.name == 'postgresql' else sqlite_insert
+        statement = insert(self._model).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self._model.game_id],
+            set_={key: statement.excluded[key] for key in rows[0] if key != 'game_id'}
+        )
+        await db.execute(statement)
+
+    async def delete(
+            self,
+            db: AsyncSession,
+            *,
+            game_id: str
+    ) -> None:
+        await db.execute(delete(self._model).where(self._model.game_id == game_id))
+
+    async def refresh_for_games(
+            self,
+            db: AsyncSession,
+            *,
+            game_ids: list
+    ) -> None:
+        for start in range(0, len(game_ids), CHUNK_SIZE):
+            statement = select(
+                Game
+            ).where(
+                Game.id.in_(game_ids[start:start + CHUNK_SIZE])
+            ).options(
+                selectinload(Game.genres),
+                selectinload(Game.publishers),
+                selectinload(Game.developers),
+                selectinload(Game.platforms)
+            ).execution_options(populate_existing=True)
+            results = await db.execute(statement=statement)
+            await self.upsert(db=db, games=results.scalars().all())
+
+    async def linked_game_ids(
+            self,
+            db: AsyncSession,
+            *,
+            entity: Base
+    ) -> list:
+        column = ENTITY_LINKS[entity.__tablename__]
+        statement = select(column.table.c.game_id).where(column == entity.id)
+        results = await db.execute(statement=statement)
+        return results.scalars().all()
+
+    async def get_multi_by_game_ids(
+            self,
+            db: AsyncSession,
+            *,
+            game_ids: list[uuid.UUID]
+    ) -> list[ModelType]:
+        statement = select(self._model).where(self._model.game_id.in_(game_ids))
+        results = await db.execute(statement=statement)
+        return results.scalars().all()
+
+    async def get_multi_for_entity(
+            self,
+            db: AsyncSession,
+            *,
+            entity: str,
+            entity_id: str,
+            after: Optional[uuid.UUID] = None,
+            limit=50
+    ) -> list[ModelType]:
+        """Page cards of games linked to the entity in game id order.
+
+        The keyset condition and ordering follow the (entity_id, game_id)
+        primary key of the association table, so a page is an index range scan.
+        """
+        column = ENTITY_LINKS[entity]
+        game_id = column.table.c.game_id
+        statement = select(
+            self._model
+        ).join(
+            column.table, game_id == self._model.game_id
+        ).where(
+            column == entity_id
+        )
+        if after is not None:
+            statement = statement.where(game_id > after)
+        statement = statement.order_by(game_id).limit(limit)
+        results = await db.execute(statement=statement)
+        return results.scalars().all()
+
+    async def unlink(
+            self,
+            db: AsyncSession,
+            *,
+            entity: Base
+    ) -> list:
+        """Delete association rows of the entity, return ids of games it was linked to."""
+        game_ids = await self.linked_game_ids(db=db, entity=entity)
+        column = ENTITY_LINKS[entity.__tablename__]
+        await db.execute(delete(column.table).where(column == entity.id))
+        await self.bump_versions(db=db, game_ids=game_ids)
+        return game_ids
+
+    async def bump_versions(
+            self,
+            db: AsyncSession,
+            *,
+            game_ids: list
+    ) -> None:
+        """Change ETags of games whose representation changed with a linked entity."""
+        for start in range(0, len(game_ids), CHUNK_SIZE):
+            statement = update(
+                Game
+            ).where(
+                Game.id.in_(game_ids[start:start + CHUNK_SIZE])
+            ).values(
+                version=Game.version + 1
+            ).execution_options(synchronize_session='evaluate')
+            await db.execute(statement)
+
+    async def refresh_for_entity(
+            self,
+            db: AsyncSession,
+            *,
+            entity: Base,
+            refresh_cards: bool = True
+    ) -> None:
+        """Bump versions of the games embedding a changed entity, refresh their cards if `refresh_cards`."""
+        game_ids = await self.linked_game_ids(db=db, entity=entity)
+        await self.bump_versions(db=db, game_ids=game_ids)
+        if refresh_cards:
+            await self.refresh_for_games(db=db, game_ids=game_ids)
+
+    async def rebuild(
+            self,
+            db: AsyncSession
+    ) -> None:
+        game_ids = (await db.execute(select(Game.id))).scalars().all()
+        await self.refresh_for_games(db=db, game_ids=game_ids)
+        await db.commit()
+
+
+game_card_crud = RepositoryGameCardDB(GameCard)
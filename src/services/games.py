@@ -1,20 +1,66 @@
-from typing import TypeVar, Generic, Type, Optional, Any
+import uuid
+from decimal import Decimal
+from typing import TypeVar, Generic, Type, Optional, Any, Callable
 
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, update, cast, literal, Numeric
 from sqlalchemy.orm import selectinload
 from fastapi.encoders import jsonable_encoder
 
 from src.db.db import Base
 from .repository_base import Repository
-from src.models.models import Genre, Publisher, Platform, Developer
+from .events import catalog_events, CatalogEvent, CREATE, PATCH, DELETE
+from .lookups import memoized_lookup
+from .game_cards import game_card_crud, RELATIONS
+from src.models.models import (
+    Game,
+    Genre,
+    Publisher,
+    Platform,
+    Developer,
+    GameCard,
+    GenreGame,
+    PublisherGame,
+    PlatformGame
+)
 
 ModelType = TypeVar('ModelType', bound=Base)
 CreateSchemaType = TypeVar('CreateSchemaType', bound=BaseModel)
 UpdateSchemaType = TypeVar('UpdateSchemaType', bound=BaseModel)
 
 
+def game_selection(
+        game_id,
+        *,
+        game_ids: Optional[list[uuid.UUID]] = None,
+        genre_id: Optional[uuid.UUID] = None,
+        publisher_id: Optional[uuid.UUID] = None,
+        platform_id: Optional[uuid.UUID] = None
+) -> list:
+    """Conditions on `game_id` column matching all given selectors."""
+    conditions = []
+    if game_ids is not None:
+        conditions.append(game_id.in_(game_ids))
+    for link, entity_id in (
+            (GenreGame.genre_id, genre_id),
+            (PublisherGame.publisher_id, publisher_id),
+            (PlatformGame.platform_id, platform_id)
+    ):
+        if entity_id is not None:
+            conditions.append(game_id.in_(select(link.table.c.game_id).where(link == entity_id)))
+    return conditions
+
+
+def discount_expression(kind: str, value: Decimal) -> Callable[[Any, Any], Any]:
+    """SQL discount of `kind` (`absolute` or `percent`) for a price column."""
+    def discount(price, game_id):
+        if kind == 'percent':
+            return func.round(cast(price * literal(value / 100, Numeric()), Numeric(12, 2)), 2)
+        return literal(value, Game.discount.type)
+    return discount
+
+
 class RepositoryGameDB(
     Repository,
     Generic[
@@ -29,6 +75,7 @@ class RepositoryGameDB(
     ):
         self._model = model
 
+    @memoized_lookup('id', 'game_id', load=RELATIONS)
     async def get_by_id(
             self,
             db: AsyncSession,
@@ -47,6 +94,7 @@ class RepositoryGameDB(
         results = await db.execute(statement=statement)
         return results.scalar_one_or_none()
 
+    @memoized_lookup('name', 'obj_in', field='name', normalize=str.lower, load=RELATIONS)
     async def get_by_name(
             self,
             db: AsyncSession,
@@ -56,7 +104,7 @@ class RepositoryGameDB(
         statement = select(
             self._model
         ).where(
-            self._model.name == obj_in_data['name']
+            func.lower(self._model.name) == obj_in_data['name'].lower()
         ).options(
             selectinload(self._model.genres),
             selectinload(self._model.publishers),
@@ -66,16 +114,84 @@ class RepositoryGameDB(
         results = await db.execute(statement=statement)
         return results.scalar_one_or_none()
 
+    async def get_version(
+            self,
+            db: AsyncSession,
+            game_id: str
+    ) -> Optional[int]:
+        statement = select(self._model.version).where(self._model.id == game_id)
+        results = await db.execute(statement=statement)
+        return results.scalar_one_or_none()
+
+    async def get_multi_by_ids(
+            self,
+            db: AsyncSession,
+            game_ids: list[str]
+    ) -> list[ModelType]:
+        statement = select(
+            self._model
+        ).where(
+            self._model.id.in_(game_ids)
+        ).options(
+            selectinload(self._model.genres),
+            selectinload(self._model.publishers),
+            selectinload(self._model.developers),
+            selectinload(self._model.platforms)
+        )
+        results = await db.execute(statement=statement)
+        return results.scalars().all()
+
+    def price_filters(
+            self,
+            *,
+            min_final_price: Optional[Decimal] = None,
+            max_final_price: Optional[Decimal] = None
+    ) -> tuple:
+        filters = ()
+        if min_final_price is not None:
+            filters += (self._model.final_price >= min_final_price,)
+        if max_final_price is not None:
+            filters += (self._model.final_price <= max_final_price,)
+        return filters
+
     async def get_multi(
             self,
             db: AsyncSession,
             *,
             skip=0,
-            limit=100
+            limit=100,
+            sort: Optional[str] = None,
+            min_final_price: Optional[Decimal] = None,
+            max_final_price: Optional[Decimal] = None,
+            after: Optional[uuid.UUID] = None
     ) -> list[ModelType]:
+        """Page of games.
+
+        `added` sorts follow the primary key, which is time ordered for uuid7
+        ids, and continue after the `after` id as a keyset cursor.
+
+        Games are returned as GameInDB with their version and full related
+        entities, which game cards do not hold, so this list stays on the
+        games table; catalog search and per-entity pages read game cards.
+        """
         statement = select(
             self._model
-        ).offset(skip).limit(limit).options(
+        ).where(
+            *self.price_filters(min_final_price=min_final_price, max_final_price=max_final_price)
+        )
+        if sort == 'final_price':
+            statement = statement.order_by(self._model.final_price.asc(), self._model.id)
+        elif sort == '-final_price':
+            statement = statement.order_by(self._model.final_price.desc(), self._model.id)
+        elif sort == 'added':
+            if after is not None:
+                statement = statement.where(self._model.id > after)
+            statement = statement.order_by(self._model.id.asc())
+        elif sort == '-added':
+            if after is not None:
+                statement = statement.where(self._model.id < after)
+            statement = statement.order_by(self._model.id.desc())
+        statement = statement.offset(skip).limit(limit).options(
             selectinload(self._model.genres),
             selectinload(self._model.publishers),
             selectinload(self._model.developers),
@@ -90,7 +206,8 @@ class RepositoryGameDB(
             obj_in: CreateSchemaType
     ):
         obj_in_data = jsonable_encoder(obj_in, exclude_none=True)
-        obj_in_data['release_date'] = obj_in.release_date
+        if obj_in.release_date is not None:
+            obj_in_data['release_date'] = obj_in.release_date
         name_to_model = {
             'genres': Genre,
             'developers': Developer,
@@ -101,13 +218,13 @@ class RepositoryGameDB(
             if key in name_to_model:
                 model = name_to_model[key]
                 names = obj_in_data[key]
-                print(model, names)
+                if not names:
+                    obj_in_data[key] = []
+                    continue
                 statement = select(
                     model
                 ).filter(
                     model.name.in_(tuple(names))
-                ).options(
-                    selectinload(model.games)
                 )
                 results = await db.execute(statement=statement)
                 obj_in_data[key] = results.scalars().all()
@@ -117,14 +234,25 @@ class RepositoryGameDB(
             self,
             db: AsyncSession,
             *,
-            obj_in: CreateSchemaType
+            obj_in: CreateSchemaType,
+            reload_relations: bool = False
     ) -> ModelType:
+        """Create a game.
+
+        The game and its relations are already loaded, so the response is
+        built without reading them back; `reload_relations` reloads them from
+        the database after commit.
+        """
         obj_in_data = await self._object_in_edit(db=db, obj_in=obj_in)
 
         db_obj = self._model(**obj_in_data)
         db.add(db_obj)
+        await db.flush()
+        await game_card_crud.upsert(db=db, games=[db_obj])
+        catalog_events.record(db, CREATE, db_obj)
         await db.commit()
-        await db.refresh(db_obj)
+        if reload_relations:
+            await db.refresh(db_obj, attribute_names=list(RELATIONS))
         return db_obj
 
     async def patch(
@@ -132,21 +260,102 @@ class RepositoryGameDB(
             db: AsyncSession,
             *,
             obj: ModelType,
-            obj_in: UpdateSchemaType | dict[str, Any]
+            obj_in: UpdateSchemaType | dict[str, Any],
+            reload_relations: bool = False
     ) -> ModelType:
         obj_in_data = await self._object_in_edit(db=db, obj_in=obj_in)
         for key, value in obj_in_data.items():
             setattr(obj, key, value)
+        if RELATIONS.keys() & obj_in_data.keys():
+            # Changed collections alone do not UPDATE the games row, bump the
+            # version explicitly so it still guards and tags the game.
+            obj.version = obj.version + 1
         db.add(obj)
+        await db.flush()
+        await game_card_crud.upsert(db=db, games=[obj])
+        catalog_events.record(db, PATCH, obj)
         await db.commit()
-        await db.refresh(obj)
+        if reload_relations:
+            await db.refresh(obj, attribute_names=list(RELATIONS))
         return obj
 
+    async def update_discounts(
+            self,
+            db: AsyncSession,
+            *,
+            selection: Callable[[Any], list],
+            discount: Callable[[Any, Any], Any]
+    ) -> int:
+        """Set discount of selected games and their cards, return the number of games.
+
+        `selection(game_id)` gives conditions on a game id column and
+        `discount(price, game_id)` the new discount, both are applied to the
+        games and the game cards tables. Final prices are computed in SQL and
+        game versions are bumped; the caller commits.
+        """
+        statement = update(self._model).where(*selection(self._model.id)).values(
+            discount=discount(self._model.price, self._model.id),
+            final_price=self._model.final_price_expression(
+                self._model.price,
+                discount(self._model.price, self._model.id)
+            ),
+            version=self._model.version + 1
+        ).execution_options(synchronize_session=False)
+        updated = (await db.execute(statement)).rowcount
+        await db.execute(
+            update(GameCard).where(*selection(GameCard.game_id)).values(
+                discount=discount(GameCard.price, GameCard.game_id),
+                final_price=self._model.final_price_expression(
+                    GameCard.price,
+                    discount(GameCard.price, GameCard.game_id)
+                )
+            ).execution_options(synchronize_session=False)
+        )
+        return updated
+
+    async def apply_discount(
+            self,
+            db: AsyncSession,
+            *,
+            kind: str,
+            value: Decimal,
+            game_ids: Optional[list[uuid.UUID]] = None,
+            genre_id: Optional[uuid.UUID] = None,
+            publisher_id: Optional[uuid.UUID] = None,
+            platform_id: Optional[uuid.UUID] = None
+    ) -> int:
+        """Set discount of selected games, return the number of updated games.
+
+        Games are selected by ids and by linked genre, publisher and platform,
+        all given selectors must match. A single catalog event is published for
+        the batch, `percent` discounts are rounded to cents.
+        """
+        updated = await self.update_discounts(
+            db=db,
+            selection=lambda game_id: game_selection(
+                game_id,
+                game_ids=game_ids,
+                genre_id=genre_id,
+                publisher_id=publisher_id,
+                platform_id=platform_id
+            ),
+            discount=discount_expression(kind=kind, value=value)
+        )
+        if updated:
+            catalog_events.record_event(
+                db,
+                CatalogEvent(entity=self._model.__tablename__, action=PATCH, data={'updated': updated})
+            )
+        await db.commit()
+        return updated
+
     async def delete(
             self,
             db: AsyncSession,
             *,
             obj: ModelType
     ) -> None:
+        await game_card_crud.delete(db=db, game_id=obj.id)
         await db.delete(obj)
+        catalog_events.record(db, DELETE, obj)
         await db.commit()
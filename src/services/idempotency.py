@@ -0,0 +1,227 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import app_settings
+from src.models.models import IdempotencyKey
+
+POLL_INTERVAL = 0.05
+PURGE_EVERY = 100
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+@dataclass
+class StoredRequest:
+    fingerprint: str
+    response: Optional[StoredResponse] = None
+
+
+class IdempotencyStore(ABC):
+    """Storage of POST outcomes by idempotency key.
+
+    `begin` claims the key for the caller and returns None, or returns the
+    request already stored under it. A claim holds a lock for `lock_timeout`
+    seconds, so a key of a crashed attempt can be claimed again; completed
+    responses are kept for `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float, lock_timeout: float):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    @abstractmethod
+    async def begin(self, key: str, fingerprint: str) -> Optional[StoredRequest]:
+        ...
+
+    @abstractmethod
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        ...
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Forget the claim of a failed attempt, so a retry runs again."""
+
+    @abstractmethod
+    async def wait(self, key: str, timeout: float) -> Optional[StoredRequest]:
+        """Wait for the attempt in progress, None if it is still running or gone."""
+
+
+@dataclass
+class _MemoryEntry:
+    request: StoredRequest
+    expires_at: float
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Per-process store, retries must reach the same worker."""
+
+    def __init__(self, ttl: float, lock_timeout: float):
+        super().__init__(ttl, lock_timeout)
+        self._entries: dict[str, _MemoryEntry] = {}
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry.expires_at <= now]:
+            self._entries.pop(key).done.set()
+
+    async def begin(self, key: str, fingerprint: str) -> Optional[StoredRequest]:
+        self._purge()
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry.request
+        self._entries[key] = _MemoryEntry(
+            request=StoredRequest(fingerprint=fingerprint),
+            expires_at=time.monotonic() + self.lock_timeout
+        )
+        return None
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.request.response = response
+        entry.expires_at = time.monotonic() + self.ttl
+        entry.done.set()
+
+    async def release(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.done.set()
+
+    async def wait(self, key: str, timeout: float) -> Optional[StoredRequest]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            await asyncio.wait_for(entry.done.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return entry.request if entry.request.response is not None else None
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """Store shared by all workers, kept in the `idempotency_keys` table."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], ttl: float, lock_timeout: float):
+        super().__init__(ttl, lock_timeout)
+        self._session_maker = session_maker
+        self._claims = 0
+
+    @staticmethod
+    def _to_request(record: IdempotencyKey) -> StoredRequest:
+        response = None
+        if record.status_code is not None:
+            response = StoredResponse(
+                status_code=record.status_code,
+                headers=[tuple(header) for header in record.headers],
+                body=record.body
+            )
+        return StoredRequest(fingerprint=record.fingerprint, response=response)
+
+    async def _get(self, db: AsyncSession, key: str) -> Optional[IdempotencyKey]:
+        results = await db.execute(select(IdempotencyKey).where(IdempotencyKey.key == key))
+        return results.scalar_one_or_none()
+
+    async def begin(self, key: str, fingerprint: str) -> Optional[StoredRequest]:
+        now = datetime.utcnow()
+        values = {
+            'key': key,
+            'fingerprint': fingerprint,
+            'locked_until': now + timedelta(seconds=self.lock_timeout),
+            'expires_at': now + timedelta(seconds=self.ttl)
+        }
+        async with self._session_maker() as db:
+            insert = postgresql_insert if db.bind.dialect.name == 'postgresql' else sqlite_insert
+            statement = insert(IdempotencyKey).values(values).on_conflict_do_nothing(
+                index_elements=[IdempotencyKey.key]
+            )
+            claimed = (await db.execute(statement)).rowcount == 1
+            if not claimed:
+                # Take over keys that expired or whose attempt died holding the lock.
+                statement = update(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    or_(
+                        IdempotencyKey.expires_at <= now,
+                        (IdempotencyKey.status_code.is_(None)) & (IdempotencyKey.locked_until <= now)
+                    )
+                ).values(status_code=None, headers=None, body=None, **values)
+                claimed = (await db.execute(statement)).rowcount == 1
+            record = None if claimed else await self._get(db, key)
+            await db.commit()
+        if claimed:
+            await self._maybe_purge()
+            return None
+        return self._to_request(record) if record is not None else StoredRequest(fingerprint=fingerprint)
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        async with self._session_maker() as db:
+            await db.execute(
+                update(IdempotencyKey).where(IdempotencyKey.key == key).values(
+                    status_code=response.status_code,
+                    headers=[list(header) for header in response.headers],
+                    body=response.body,
+                    locked_until=None,
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl)
+                )
+            )
+            await db.commit()
+
+    async def release(self, key: str) -> None:
+        async with self._session_maker() as db:
+            await db.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+            )
+            await db.commit()
+
+    async def wait(self, key: str, timeout: float) -> Optional[StoredRequest]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            async with self._session_maker() as db:
+                record = await self._get(db, key)
+            if record is None:
+                return None
+            if record.status_code is not None:
+                return self._to_request(record)
+        return None
+
+    async def _maybe_purge(self) -> None:
+        self._claims += 1
+        if self._claims % PURGE_EVERY:
+            return
+        async with self._session_maker() as db:
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow()))
+            await db.commit()
+
+
+@lru_cache()
+def get_idempotency_store() -> IdempotencyStore:
+    """Store chosen by `idempotency_store` setting: `memory` or `database`."""
+    if app_settings.idempotency_store == 'database':
+        from src.db.db import get_session_maker
+
+        return DatabaseIdempotencyStore(
+            get_session_maker(),
+            ttl=app_settings.idempotency_ttl,
+            lock_timeout=app_settings.idempotency_lock_timeout
+        )
+    return MemoryIdempotencyStore(
+        ttl=app_settings.idempotency_ttl,
+        lock_timeout=app_settings.idempotency_lock_timeout
+    )
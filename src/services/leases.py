@@ -0,0 +1,38 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Lease
+
+WORKER_ID = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+async def acquire_lease(db: AsyncSession, name: str, ttl: float, holder: str = WORKER_ID) -> bool:
+    """Take or renew lease `name` for `ttl` seconds, False if another holder has it.
+
+    The lease row is claimed by one conditional statement, so of several
+    workers exactly one holds it until it stops renewing. The caller commits.
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl)
+    insert = postgresql_insert if db.bind.dialect.name == 'postgresql' else sqlite_insert
+    statement = insert(Lease).values(name=name, holder=holder, expires_at=expires_at).on_conflict_do_nothing(
+        index_elements=[Lease.name]
+    )
+    if (await db.execute(statement)).rowcount == 1:
+        return True
+    statement = update(Lease).where(
+        Lease.name == name,
+        or_(Lease.holder == holder, Lease.expires_at <= now)
+    ).values(holder=holder, expires_at=expires_at)
+    return (await db.execute(statement)).rowcount == 1
+
+
+async def release_lease(db: AsyncSession, name: str, holder: str = WORKER_ID) -> None:
+    await db.execute(delete(Lease).where(Lease.name == name, Lease.holder == holder))
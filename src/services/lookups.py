@@ -0,0 +1,105 @@
+import functools
+import inspect
+import uuid
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import inspect as inspect_state
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from src.core.metrics import metrics
+from src.db.db import Base
+
+STATS_KEY = 'lookup_stats'
+
+repository_lookups = metrics.counter(
+    'repository_lookups_total',
+    'Repository get_by_* calls by table, lookup and result (query, reused).'
+)
+
+
+def lookup_stats(db: AsyncSession | Session) -> dict[str, int]:
+    """Numbers of get_by_* calls of the session that queried and that reused a loaded row."""
+    return db.info.setdefault(STATS_KEY, {'query': 0, 'reused': 0})
+
+
+def _is_usable(session: Session, obj: Base, attributes: Iterable[str]) -> bool:
+    state = inspect_state(obj)
+    if not state.persistent or state.modified or obj in session.deleted:
+        return False
+    return not state.unloaded.intersection(attributes)
+
+
+def find_loaded(
+        db: AsyncSession | Session,
+        model: type[Base],
+        attribute: str,
+        value: Any,
+        *,
+        normalize: Optional[Callable[[Any], Any]] = None,
+        load: Iterable[str] = ()
+) -> Optional[Base]:
+    """Object of the session whose `attribute` equals `value`, with `load` attributes loaded.
+
+    Objects with pending changes or deletes are skipped, a query would flush
+    them first.
+    """
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    attributes = {attribute, *load}
+    if attribute == 'id':
+        try:
+            key = identity_key(model, uuid.UUID(str(value)))
+        except ValueError:
+            return None
+        obj = session.identity_map.get(key)
+        return obj if obj is not None and _is_usable(session, obj, attributes) else None
+    normalize = normalize or (lambda item: item)
+    value = normalize(value)
+    for obj in session.identity_map.values():
+        if not isinstance(obj, model) or not _is_usable(session, obj, attributes):
+            continue
+        if normalize(getattr(obj, attribute)) == value:
+            return obj
+    return None
+
+
+def memoized_lookup(
+        attribute: str,
+        argument: str,
+        *,
+        field: Optional[str] = None,
+        normalize: Optional[Callable[[Any], Any]] = None,
+        load: Iterable[str] = ()
+) -> Callable:
+    """Answer a repository `get_by_<attribute>` from rows loaded earlier in the session.
+
+    The looked up value is the `argument` of the call, or its `field` when
+    the argument is an input schema. `load` names the attributes the query
+    loads eagerly, a loaded row lacking them is queried again. Misses always
+    query, so rows created by other requests are found.
+    """
+    load = tuple(load)
+
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, db: AsyncSession, *args, **kwargs):
+            value = signature.bind(self, db, *args, **kwargs).arguments[argument]
+            if field is not None:
+                value = value.get(field) if isinstance(value, dict) else getattr(value, field, None)
+            table = self._model.__tablename__
+            if value is not None:
+                obj = find_loaded(db, self._model, attribute, value, normalize=normalize, load=load)
+                if obj is not None:
+                    lookup_stats(db)['reused'] += 1
+                    repository_lookups.inc(table=table, lookup=attribute, result='reused')
+                    return obj
+            lookup_stats(db)['query'] += 1
+            repository_lookups.inc(table=table, lookup=attribute, result='query')
+            return await method(self, db, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import delete, event, func, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.core.config import app_settings
+from src.core.metrics import metrics
+from src.db.db import get_session_maker
+from src.models.models import OutboxEvent
+from .events import CatalogEvent, catalog_events
+from .leases import WORKER_ID, acquire_lease
+
+logger = logging.getLogger('outbox')
+
+CHANNEL = 'catalog_outbox'
+PURGE_LEASE = 'catalog_outbox_purge'
+# Missing ids older than this belong to rolled back transactions.
+GAP_TIMEOUT = 10.0
+# Longer gaps are not waited for, sequences only skip that far on restarts.
+MAX_GAP = 1000
+
+outbox_relayed = metrics.counter(
+    'outbox_events_relayed_total',
+    'Catalog events of other workers published from the outbox.'
+)
+outbox_lag = metrics.gauge(
+    'outbox_relay_lag_seconds',
+    'Age of the last outbox row relayed by this worker.'
+)
+
+
+@event.listens_for(Session, 'before_commit')
+def store_recorded_events(session: Session) -> None:
+    """Write the queued catalog events to the outbox in the committing transaction."""
+    if session.info.get('catalog_events'):
+        # Ids of new objects are assigned by the flush commit would run next.
+        session.flush()
+    prepared = catalog_events.prepare(session)
+    if not prepared:
+        return
+    now = datetime.utcnow()
+    session.execute(
+        insert(OutboxEvent),
+        [
+            {
+                'origin': WORKER_ID,
+                'entity': catalog_event.entity,
+                'action': catalog_event.action,
+                'entity_id': catalog_event.entity_id,
+                'data': json.loads(json.dumps(catalog_event.data, default=str)),
+                'created_at': now
+            }
+            for catalog_event in prepared
+        ]
+    )
+    if session.get_bind().dialect.name == 'postgresql':
+        # Delivered to listeners when the transaction commits.
+        session.execute(text(f'NOTIFY {CHANNEL}'))
+
+
+class OutboxRelay:
+    """Publisher of the outbox rows written by other workers.
+
+    Each worker keeps its own cursor, the highest outbox id it has seen, and
+    publishes newer rows of other origins to its catalog event listeners.
+    Postgres wakes the relay with NOTIFY on every commit and it polls
+    `notified_poll_interval` seconds as a fallback; other databases are
+    polled every `poll_interval` seconds.
+
+    Ids are taken before commit, so a row may become visible after a row with
+    a higher id. Skipped ids are queried again until they show up or are
+    `GAP_TIMEOUT` seconds old. Changes of one entity lock its row, so their
+    outbox ids follow commit order and are relayed in order. Delivery is at
+    least once: listeners must tolerate replays.
+    """
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            *,
+            origin: str = WORKER_ID,
+            poll_interval: float,
+            notified_poll_interval: float,
+            batch_size: int = 500,
+            retention: float,
+            purge_interval: float
+    ):
+        self._session_maker = session_maker
+        self.origin = origin
+        self.poll_interval = poll_interval
+        self.notified_poll_interval = notified_poll_interval
+        self.batch_size = batch_size
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self.cursor: Optional[int] = None
+        self._missing: dict[int, float] = {}
+        self._wake = asyncio.Event()
+        self._listening = False
+        self._purged_at = 0.0
+        self.behind = False
+        self._tasks: list[asyncio.Task] = []
+
+    async def seek_head(self) -> None:
+        """Start after the newest row, earlier changes are in the loaded state."""
+        async with self._session_maker() as db:
+            self.cursor = (await db.execute(select(func.max(OutboxEvent.id)))).scalar() or 0
+        self._missing.clear()
+
+    async def poll(self) -> list[CatalogEvent]:
+        """Publish new rows of other workers, return the published events."""
+        if self.cursor is None:
+            await self.seek_head()
+        now = time.monotonic()
+        for missing_id in [key for key, expires_at in self._missing.items() if expires_at <= now]:
+            del self._missing[missing_id]
+        statement = select(OutboxEvent).where(
+            or_(OutboxEvent.id > self.cursor, OutboxEvent.id.in_(list(self._missing)))
+        ).order_by(OutboxEvent.id).limit(self.batch_size)
+        async with self._session_maker() as db:
+            rows = (await db.execute(statement)).scalars().all()
+        published = []
+        for row in rows:
+            if self._missing.pop(row.id, None) is None:
+                if row.id - self.cursor <= MAX_GAP:
+                    self._missing.update((gap, now + GAP_TIMEOUT) for gap in range(self.cursor + 1, row.id))
+                self.cursor = max(self.cursor, row.id)
+            if row.origin == self.origin:
+                continue
+            catalog_event = CatalogEvent(
+                entity=row.entity,
+                action=row.action,
+                entity_id=row.entity_id,
+                data=row.data or {}
+            )
+            catalog_events.publish(catalog_event)
+            published.append(catalog_event)
+        self.behind = len(rows) == self.batch_size
+        if published:
+            outbox_relayed.inc(len(published))
+        if rows:
+            outbox_lag.set(max((datetime.utcnow() - rows[-1].created_at).total_seconds(), 0))
+        return published
+
+    async def purge(self) -> int:
+        """Delete rows older than `retention` seconds, by one worker at a time."""
+        async with self._session_maker() as db:
+            if not await acquire_lease(db, PURGE_LEASE, ttl=self.purge_interval, holder=self.origin):
+                await db.commit()
+                return 0
+            statement = delete(OutboxEvent).where(
+                OutboxEvent.created_at < datetime.utcnow() - timedelta(seconds=self.retention)
+            )
+            deleted = (await db.execute(statement)).rowcount
+            await db.commit()
+        return deleted
+
+    async def listen(self, engine: AsyncEngine) -> None:
+        """Wake the relay on NOTIFY, holds a connection while the relay runs."""
+        try:
+            async with engine.connect() as connection:
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.add_listener(CHANNEL, lambda *args: self._wake.set())
+                self._listening = True
+                await asyncio.Event().wait()
+        except Exception:
+            logger.exception('Outbox LISTEN failed, fall back to polling')
+        finally:
+            self._listening = False
+
+    async def run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.poll()
+                while self.behind:
+                    await self.poll()
+                if time.monotonic() - self._purged_at >= self.purge_interval:
+                    self._purged_at = time.monotonic()
+                    await self.purge()
+            except Exception:
+                logger.exception('Outbox relay poll failed')
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(),
+                    timeout=self.notified_poll_interval if self._listening else self.poll_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        """Take the cursor now, then relay in background.
+
+        Call before caches are loaded, so changes made while they load are
+        relayed again rather than lost.
+        """
+        if self._tasks:
+            return
+        await self.seek_head()
+        engine = self._session_maker.kw['bind']
+        if engine.dialect.name == 'postgresql' and engine.dialect.driver == 'asyncpg':
+            self._tasks.append(asyncio.create_task(self.listen(engine)))
+        self._tasks.append(asyncio.create_task(self.run()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks.clear()
+
+
+@lru_cache()
+def get_outbox_relay() -> OutboxRelay:
+    return OutboxRelay(
+        get_session_maker(),
+        poll_interval=app_settings.outbox_poll_interval,
+        notified_poll_interval=app_settings.outbox_notified_poll_interval,
+        retention=app_settings.outbox_retention,
+        purge_interval=app_settings.outbox_purge_interval
+    )
@@ -3,11 +3,15 @@ from typing import TypeVar, Generic, Type, Optional, Any
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import undefer
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi.encoders import jsonable_encoder
 
 from src.db.db import Base
 from .repository_base import Repository
+from .events import catalog_events, CREATE, PATCH, DELETE
+from .lookups import memoized_lookup
+from .game_cards import game_card_crud
 
 
 ModelType = TypeVar('ModelType', bound=Base)
@@ -29,6 +33,7 @@ class RepositoryPlatformDB(
     ):
         self._model = model
 
+    @memoized_lookup('id', 'platform_id', load=('games_count',))
     async def get_by_id(
             self,
             db: AsyncSession,
@@ -39,11 +44,12 @@ class RepositoryPlatformDB(
         ).where(
             self._model.id == platform_id
         ).options(
-            selectinload(self._model.games)
+            undefer(self._model.games_count)
         )
         results = await db.execute(statement=statement)
         return results.scalar_one_or_none()
 
+    @memoized_lookup('name', 'obj_in', field='name')
     async def get_by_name(
             self,
             db: AsyncSession,
@@ -54,8 +60,6 @@ class RepositoryPlatformDB(
             self._model
         ).where(
             self._model.name == obj_in_data['name']
-        ).options(
-            selectinload(self._model.games)
         )
         results = await db.execute(statement=statement)
         return results.scalar_one_or_none()
@@ -69,8 +73,6 @@ class RepositoryPlatformDB(
             self._model
         ).filter(
             self._model.name.in_(names)
-        ).options(
-            selectinload(self._model.games)
         )
         results = await db.execute(statement=statement)
         return results.scalars().all()
@@ -85,7 +87,7 @@ class RepositoryPlatformDB(
         statement = select(
             self._model
         ).offset(skip).limit(limit).options(
-            selectinload(self._model.games)
+            undefer(self._model.games_count)
         )
         results = await db.execute(statement=statement)
         return results.scalars().all()
@@ -99,8 +101,10 @@ class RepositoryPlatformDB(
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self._model(**obj_in_data)
         db.add(db_obj)
+        catalog_events.record(db, CREATE, db_obj)
         await db.commit()
-        await db.refresh(db_obj)
+        # A new row has no games, the response needs no reload.
+        set_committed_value(db_obj, 'games_count', 0)
         return db_obj
 
     async def patch(
@@ -115,8 +119,19 @@ class RepositoryPlatformDB(
         for key, value in obj_in_data.items():
             setattr(obj, key, value)
         db.add(obj)
+        if obj_in_data:
+            await db.flush()
+            # Reloading the linked games repopulates the entity without its games count.
+            games_count = obj.games_count
+            # Linked games embed every field of the entity, cards its name only.
+            await game_card_crud.refresh_for_entity(
+                db=db,
+                entity=obj,
+                refresh_cards='name' in obj_in_data
+            )
+            set_committed_value(obj, 'games_count', games_count)
+        catalog_events.record(db, PATCH, obj)
         await db.commit()
-        await db.refresh(obj)
         return obj
 
     async def delete(
@@ -125,5 +140,9 @@ class RepositoryPlatformDB(
             *,
             obj: ModelType
     ) -> None:
+        game_ids = await game_card_crud.unlink(db=db, entity=obj)
         await db.delete(obj)
+        await db.flush()
+        await game_card_crud.refresh_for_games(db=db, game_ids=game_ids)
+        catalog_events.record(db, DELETE, obj)
         await db.commit()
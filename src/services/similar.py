@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import logging
+import math
+import time
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import app_settings
+from src.core.metrics import metrics
+from src.models.models import Game
+from .events import CatalogEvent, DELETE, catalog_events
+from .game_cards import ENTITY_LINKS, RELATIONS
+
+logger = logging.getLogger('similar')
+
+similar_rebuild_seconds = metrics.gauge(
+    'similar_games_rebuild_seconds',
+    'Duration of the last rebuild of the similar games index.'
+)
+
+Feature = tuple[str, str]
+
+
+class SimilarGames:
+    """Sparse game by feature matrix for "more like this" ranking.
+
+    A feature is a linked genre, developer, publisher or platform, weighted by
+    its relation weight times inverse document frequency, so sharing a niche
+    developer counts more than sharing the PC platform. Rows are kept as
+    feature tuples per game and columns as postings per feature; a query is a
+    sparse product of the game row with the postings, scored by cosine.
+
+    Features with postings longer than `max_posting` only add to games already
+    reached through rarer features, which bounds the cost of a query on large
+    catalogs. The matrix is rebuilt from the association tables in background
+    and updated in place by catalog events between rebuilds.
+    """
+
+    def __init__(self, weights: dict[str, float], max_posting: int):
+        self.weights = weights
+        self.max_posting = max_posting
+        self._rows: dict[str, frozenset[Feature]] = {}
+        self._postings: dict[Feature, set[str]] = defaultdict(set)
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def build(self, links: Iterable[tuple[str, str, str]], game_ids: Iterable[str] = ()) -> None:
+        """Replace the matrix with (game_id, relation, entity_id) links."""
+        features = defaultdict(set)
+        for game_id in game_ids:
+            features[str(game_id)]
+        for game_id, relation, entity_id in links:
+            features[str(game_id)].add((relation, str(entity_id)))
+        postings = defaultdict(set)
+        for game_id, row in features.items():
+            for feature in row:
+                postings[feature].add(game_id)
+        self._rows = {game_id: frozenset(row) for game_id, row in features.items()}
+        self._postings = postings
+        self.ready = True
+
+    async def load(self, db: AsyncSession) -> None:
+        started = time.perf_counter()
+        game_ids = (await db.execute(select(Game.id))).scalars().all()
+        links = []
+        for relation, column in ENTITY_LINKS.items():
+            results = await db.execute(select(column.table.c.game_id, column))
+            links.extend((game_id, relation, entity_id) for game_id, entity_id in results)
+        self.build(links, game_ids)
+        duration = time.perf_counter() - started
+        similar_rebuild_seconds.set(duration)
+        logger.info('Similar games index of %s games built in %.3f s', len(self._rows), duration)
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self.ready:
+            return
+        async with self._lock:
+            if not self.ready:
+                await self.load(db)
+
+    def set_game(self, game_id: str, features: Iterable[Feature]) -> None:
+        self.remove_game(game_id)
+        row = frozenset(features)
+        self._rows[game_id] = row
+        for feature in row:
+            self._postings[feature].add(game_id)
+
+    def remove_game(self, game_id: str) -> None:
+        for feature in self._rows.pop(game_id, ()):
+            posting = self._postings.get(feature)
+            if posting is not None:
+                posting.discard(game_id)
+                if not posting:
+                    del self._postings[feature]
+
+    def remove_feature(self, feature: Feature) -> None:
+        for game_id in self._postings.pop(feature, ()):
+            self._rows[game_id] = self._rows[game_id] - {feature}
+
+    def weight(self, feature: Feature) -> float:
+        frequency = len(self._postings.get(feature, ())) or 1
+        return self.weights.get(feature[0], 1.0) * math.log(1 + len(self._rows) / frequency)
+
+    def similar(self, game_id: str, limit: int = 10) -> list[tuple[str, float]]:
+        """Games most similar to `game_id` with cosine scores, best first."""
+        row = self._rows.get(game_id)
+        if not row:
+            return []
+        weights = {feature: self.weight(feature) for feature in row}
+        scores: dict[str, float] = defaultdict(float)
+        for feature in sorted(row, key=lambda feature: len(self._postings[feature])):
+            posting = self._postings[feature]
+            contribution = weights[feature] ** 2
+            if len(posting) > self.max_posting and scores:
+                for other_id in scores.keys() & posting:
+                    scores[other_id] += contribution
+                continue
+            for other_id in posting:
+                scores[other_id] += contribution
+        scores.pop(game_id, None)
+        norm = math.sqrt(sum(weight ** 2 for weight in weights.values()))
+
+        def squared_weight(feature: Feature) -> float:
+            if feature not in weights:
+                weights[feature] = self.weight(feature)
+            return weights[feature] ** 2
+
+        ranked = (
+            (score / (norm * (math.sqrt(sum(map(squared_weight, self._rows[other_id]))) or 1.0)), other_id)
+            for other_id, score in scores.items()
+        )
+        return [(other_id, score) for score, other_id in heapq.nlargest(limit, ranked)]
+
+    def on_event(self, catalog_event: CatalogEvent) -> None:
+        if not self.ready or catalog_event.entity_id is None:
+            return
+        if catalog_event.entity == Game.__tablename__:
+            if catalog_event.action == DELETE:
+                self.remove_game(catalog_event.entity_id)
+            elif 'features' in catalog_event.data:
+                self.set_game(
+                    catalog_event.entity_id,
+                    (tuple(feature) for feature in catalog_event.data['features'])
+                )
+        elif catalog_event.entity in ENTITY_LINKS and catalog_event.action == DELETE:
+            self.remove_feature((catalog_event.entity, catalog_event.entity_id))
+
+    async def run(self, session_maker: async_sessionmaker[AsyncSession], interval: float) -> None:
+        while True:
+            try:
+                async with session_maker() as db:
+                    await self.load(db)
+            except Exception:
+                logger.exception('Similar games rebuild failed')
+            await asyncio.sleep(interval)
+
+    def start(self, session_maker: async_sessionmaker[AsyncSession], interval: float) -> None:
+        """Rebuild the matrix now and every `interval` seconds in background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(session_maker, interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def game_features(game: Game) -> dict:
+    """Features of a game whose relations are loaded, for the catalog event."""
+    if any(relation not in game.__dict__ for relation in RELATIONS):
+        return {}
+    return {
+        'features': [
+            (relation, str(entity.id))
+            for relation in RELATIONS
+            for entity in game.__dict__[relation]
+        ]
+    }
+
+
+similar_games = SimilarGames(
+    weights=app_settings.similar_weights,
+    max_posting=app_settings.similar_max_posting
+)
+catalog_events.add_payload_builder(Game.__tablename__, game_features)
+catalog_events.subscribe(similar_games.on_event)
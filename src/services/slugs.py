@@ -0,0 +1,78 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.metrics import metrics
+from src.db.db import Base
+from src.models.models import Genre
+from .events import CatalogEvent, DELETE, catalog_events
+from .warmup import register_primer
+
+slug_lookups = metrics.counter(
+    'slug_lookups_total',
+    'Slug resolutions by table and result (hit, miss).'
+)
+
+
+class SlugIndex:
+    """In-process map of slug to id for a table with unique slugs.
+
+    The map is loaded on startup and kept current by catalog events, so a
+    warm worker resolves slugs without a query. Unknown slugs fall back to the
+    unique slug index and are remembered.
+    """
+
+    def __init__(self, model: type[Base]):
+        self._model = model
+        self._ids: dict[str, str] = {}
+        self._slugs: dict[str, str] = {}
+
+    @property
+    def table(self) -> str:
+        return self._model.__tablename__
+
+    def remember(self, slug: str, obj_id: str) -> None:
+        self.forget(obj_id)
+        self._ids[slug] = obj_id
+        self._slugs[obj_id] = slug
+
+    def forget(self, obj_id: str) -> None:
+        slug = self._slugs.pop(obj_id, None)
+        if slug is not None:
+            self._ids.pop(slug, None)
+
+    async def load(self, db: AsyncSession) -> None:
+        results = await db.execute(select(self._model.id, self._model.slug))
+        self._ids.clear()
+        self._slugs.clear()
+        for obj_id, slug in results:
+            if slug:
+                self.remember(slug, str(obj_id))
+
+    async def resolve(self, db: AsyncSession, slug: str) -> Optional[str]:
+        obj_id = self._ids.get(slug)
+        if obj_id is not None:
+            slug_lookups.inc(table=self.table, result='hit')
+            return obj_id
+        slug_lookups.inc(table=self.table, result='miss')
+        statement = select(self._model.id).where(self._model.slug == slug)
+        obj_id = (await db.execute(statement)).scalar_one_or_none()
+        if obj_id is None:
+            return None
+        self.remember(slug, str(obj_id))
+        return str(obj_id)
+
+    def on_event(self, catalog_event: CatalogEvent) -> None:
+        if catalog_event.entity != self.table or catalog_event.entity_id is None:
+            return
+        if catalog_event.action == DELETE:
+            self.forget(catalog_event.entity_id)
+        elif catalog_event.data.get('slug'):
+            self.remember(catalog_event.data['slug'], catalog_event.entity_id)
+
+
+genre_slugs = SlugIndex(Genre)
+catalog_events.add_payload_builder('genres', lambda genre: {'slug': genre.slug})
+catalog_events.subscribe(genre_slugs.on_event)
+register_primer(genre_slugs.load)
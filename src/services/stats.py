@@ -0,0 +1,129 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import app_settings
+from src.core.metrics import metrics
+from src.models.models import Game, Genre, Publisher, Developer, Platform
+from .events import CatalogEvent, catalog_events
+from .game_cards import ENTITY_LINKS
+
+ENTITY_MODELS = {
+    'genres': Genre,
+    'publishers': Publisher,
+    'developers': Developer,
+    'platforms': Platform
+}
+
+stats_requests = metrics.counter(
+    'catalog_stats_requests_total',
+    'Catalog statistics reads by rollup and result (hit, miss).'
+)
+
+
+def release_month(dialect_name: str):
+    """`YYYY-MM` of the release date, computed from the indexed column only."""
+    if dialect_name == 'postgresql':
+        return func.to_char(Game.release_date, 'YYYY-MM')
+    return func.strftime('%Y-%m', Game.release_date)
+
+
+class CatalogStats:
+    """Aggregates of the catalog for the staff dashboard.
+
+    Rollups are computed by GROUP BY queries and cached for `ttl` seconds.
+    Catalog events drop the rollups built from the changed table, so the next
+    read recomputes them; changes of games drop all of them.
+    """
+
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._tables: dict[str, set[str]] = {}
+
+    async def _cached(
+            self,
+            key: str,
+            tables: set[str],
+            compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            stats_requests.inc(rollup=key, result='hit')
+            return cached[1]
+        stats_requests.inc(rollup=key, result='miss')
+        value = await compute()
+        self._cache[key] = (time.monotonic() + self._ttl, value)
+        self._tables[key] = tables
+        return value
+
+    async def games_per_entity(self, db: AsyncSession, entity: str) -> list[dict]:
+        """Number of games of every entity, most games first."""
+        model = ENTITY_MODELS[entity]
+        link = ENTITY_LINKS[entity]
+
+        async def compute():
+            games_count = func.count(link.table.c.game_id)
+            statement = select(
+                model.id,
+                model.name,
+                games_count.label('games_count')
+            ).outerjoin(
+                link.table, link == model.id
+            ).group_by(
+                model.id, model.name
+            ).order_by(
+                games_count.desc(), model.name
+            )
+            results = await db.execute(statement)
+            return [dict(row._mapping) for row in results]
+
+        return await self._cached(f'games_per_{entity}', {entity, Game.__tablename__}, compute)
+
+    async def prices(self, db: AsyncSession) -> dict:
+        """Count of games with average price, discount and final price."""
+        async def compute():
+            statement = select(
+                func.count(Game.id).label('games'),
+                func.count(Game.id).filter(Game.discount > 0).label('discounted_games'),
+                func.avg(Game.price).label('average_price'),
+                func.avg(func.coalesce(Game.discount, 0)).label('average_discount'),
+                func.avg(Game.final_price).label('average_final_price')
+            )
+            return dict((await db.execute(statement)).one()._mapping)
+
+        return await self._cached('prices', {Game.__tablename__}, compute)
+
+    async def releases_per_month(self, db: AsyncSession) -> list[dict]:
+        """Number of games released in every month, oldest month first.
+
+        The query reads `release_date` only, so it is answered from the
+        release date index without touching the games table.
+        """
+        async def compute():
+            month = release_month(db.bind.dialect.name).label('month')
+            statement = select(
+                month,
+                func.count().label('games')
+            ).select_from(
+                Game
+            ).group_by(month).order_by(month)
+            results = await db.execute(statement)
+            return [dict(row._mapping) for row in results]
+
+        return await self._cached('releases_per_month', {Game.__tablename__}, compute)
+
+    def on_event(self, catalog_event: CatalogEvent) -> None:
+        for key in [key for key, tables in self._tables.items() if catalog_event.entity in tables]:
+            self._cache.pop(key, None)
+            self._tables.pop(key, None)
+
+    def reset(self) -> None:
+        self._cache.clear()
+        self._tables.clear()
+
+
+catalog_stats = CatalogStats(ttl=app_settings.stats_cache_ttl)
+catalog_events.subscribe(catalog_stats.on_event)
@@ -8,6 +8,8 @@ from sqlalchemy import select
 from src.db.db import Base
 from src.tools.password import get_password_hash
 from .repository_base import Repository
+from .events import catalog_events, CREATE, PATCH, DELETE
+from .lookups import memoized_lookup
 
 
 ModelType = TypeVar('ModelType', bound=Base)
@@ -31,6 +33,7 @@ class RepositoryUserDB(
     ):
         self._model = model
 
+    @memoized_lookup('username', 'obj_in', field='username')
     async def get_by_username(
             self,
             db: AsyncSession,
@@ -45,6 +48,7 @@ class RepositoryUserDB(
         results = await db.execute(statement=statement)
         return results.scalar_one_or_none()
 
+    @memoized_lookup('email', 'obj_in', field='email')
     async def get_by_email(
             self,
             db: AsyncSession,
@@ -59,6 +63,7 @@ class RepositoryUserDB(
         results = await db.execute(statement=statement)
         return results.scalar_one_or_none()
 
+    @memoized_lookup('id', 'user_id')
     async def get_by_id(
             self,
             db: AsyncSession,
@@ -97,8 +102,8 @@ class RepositoryUserDB(
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.create_obj(obj_in_data)
         db.add(db_obj)
+        catalog_events.record(db, CREATE, db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def patch(
@@ -113,8 +118,8 @@ class RepositoryUserDB(
         for key, value in obj_in_data.items():
             setattr(user_obj, key, value)
         db.add(user_obj)
+        catalog_events.record(db, PATCH, user_obj)
         await db.commit()
-        await db.refresh(user_obj)
         return user_obj
 
     async def delete(
@@ -124,4 +129,5 @@ class RepositoryUserDB(
             user_obj: ModelType
     ) -> None:
         await db.delete(user_obj)
+        catalog_events.record(db, DELETE, user_obj)
         await db.commit()
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.core.metrics import metrics
+from src.models.models import Genre, Platform
+from src.services.authorization import get_user
+from src.services.base import (
+    user_crud,
+    genre_crud,
+    publisher_crud,
+    developer_crud,
+    platform_crud,
+    game_crud
+)
+from src.services.game_cards import game_card_crud
+
+logger = logging.getLogger('warmup')
+
+NIL_ID = str(uuid.UUID(int=0))
+
+Primer = Callable[[AsyncSession], Awaitable[None]]
+
+primers: list[Primer] = []
+
+warmup_seconds = metrics.gauge(
+    'app_warmup_seconds',
+    'Duration of the startup warmup stage.'
+)
+
+
+def register_primer(primer: Primer) -> Primer:
+    """Register coroutine that fills an in-process cache on startup."""
+    primers.append(primer)
+    return primer
+
+
+@register_primer
+async def prime_reference_tables(db: AsyncSession) -> None:
+    """Read small reference tables so their pages are hot in the DB cache."""
+    await db.execute(select(Genre.id, Genre.name, Genre.slug))
+    await db.execute(select(Platform.id, Platform.name))
+
+
+async def run_hot_statements(db: AsyncSession) -> None:
+    """Execute the statements every request path relies on.
+
+    This fills SQLAlchemy's compiled cache once per engine and the driver's
+    prepared statement cache once per connection.
+    """
+    await db.execute(text('SELECT 1'))
+    await get_user(db=db, username='')
+    await user_crud.get_by_id(db=db, user_id=NIL_ID)
+    await user_crud.get_multi(db=db, limit=1)
+    await genre_crud.get_by_id(db=db, genre_id=NIL_ID)
+    await genre_crud.get_multi(db=db, limit=1)
+    await genre_crud.get_by_slug(db=db, slug='')
+    await publisher_crud.get_by_id(db=db, entity_id=NIL_ID)
+    await publisher_crud.get_multi(db=db, limit=1)
+    await developer_crud.get_by_id(db=db, entity_id=NIL_ID)
+    await developer_crud.get_multi(db=db, limit=1)
+    await platform_crud.get_by_id(db=db, platform_id=NIL_ID)
+    await platform_crud.get_multi(db=db, limit=1)
+    await game_crud.get_by_id(db=db, game_id=NIL_ID)
+    await game_crud.get_multi(db=db, limit=1)
+    await game_card_crud.get_multi(db=db, limit=1)
+
+
+async def _warm_connection(engine: AsyncEngine) -> None:
+    async with engine.connect() as connection:
+        async with AsyncSession(bind=connection) as db:
+            await run_hot_statements(db)
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> float:
+    """Pre-connect pool, prepare hot statements and prime caches.
+
+    Connections are opened concurrently, so the pool really holds
+    `connections` of them afterwards. Returns warmup duration in seconds.
+    """
+    started = time.perf_counter()
+    await asyncio.gather(*(_warm_connection(engine) for _ in range(max(connections, 1))))
+    async with AsyncSession(bind=engine, expire_on_commit=False) as db:
+        for primer in primers:
+            await primer(db)
+    duration = time.perf_counter() - started
+    warmup_seconds.set(duration)
+    logger.info(
+        'Warmup done in %.3f s: %s pool connections, %s primers',
+        duration, connections, len(primers)
+    )
+    return duration
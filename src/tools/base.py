@@ -1,6 +1,17 @@
-from fastapi import HTTPException, status
+from contextlib import asynccontextmanager
+from typing import Hashable, Optional
+
+from fastapi import HTTPException, Request, Response, status
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.core.config import app_settings
+from src.db.db import Base
+from src.services.counts import total_counter
 
 
 def check_required_fields(data: BaseModel | dict, field_names: list):
@@ -16,3 +27,81 @@ def check_required_fields(data: BaseModel | dict, field_names: list):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='\n'.join(errors)
         )
+
+
+async def set_total_count_header(
+        response: Response,
+        db: AsyncSession,
+        model: type[Base],
+        *,
+        filters: tuple = (),
+        cache_key: Hashable = None
+) -> None:
+    total = await total_counter.total(db=db, model=model, filters=filters, cache_key=cache_key)
+    response.headers['X-Total-Count'] = str(total)
+
+
+@asynccontextmanager
+async def unique_violation_as_400(
+        db: AsyncSession,
+        constraint: str | tuple[str, ...],
+        detail: str
+):
+    """Turn violation of `constraint` inside the block into 400 response.
+
+    Drivers word the error differently (Postgres names the index, SQLite names
+    the columns of a plain unique index), so several markers may be given.
+    """
+    markers = (constraint,) if isinstance(constraint, str) else constraint
+    try:
+        yield
+    except IntegrityError as error:
+        await db.rollback()
+        if not any(marker in str(error.orig) for marker in markers):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
+
+
+def entity_tag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag_header(response: Response, obj: Base) -> None:
+    response.headers['ETag'] = entity_tag(obj.version)
+
+
+def etag_matches(header: Optional[str], version: int, *, weak: bool = False) -> bool:
+    """Whether the header lists the tag of `version`; `weak` comparison ignores `W/` prefixes."""
+    tags = {tag.strip() for tag in header.split(',')}
+    if weak:
+        tags = {tag[2:] if tag.startswith('W/') else tag for tag in tags}
+    return '*' in tags or entity_tag(version) in tags
+
+
+def check_if_match(if_match: Optional[str], obj: Base) -> None:
+    """Reject update of an object changed since the client read it."""
+    if if_match is not None and not etag_matches(if_match, obj.version):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail='Object has been changed, reload it and try again.'
+        )
+
+
+async def stale_data_handler(request: Request, exc: StaleDataError) -> JSONResponse:
+    """Versioned UPDATE or DELETE matched no row: a concurrent request won."""
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={'detail': 'Object has been changed by another request, reload it and try again.'}
+    )
+
+
+def check_metrics_enabled() -> None:
+    """Metrics are internal, they are served only where METRICS_ENABLED is set."""
+    if not app_settings.metrics_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Not Found'
+        )
@@ -0,0 +1,15 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from src.models.models import PricingCampaign
+from src.services.base import campaign_crud
+
+
+async def check_campaign_by_id(db: AsyncSession, campaign_id: str) -> PricingCampaign:
+    campaign_obj = await campaign_crud.get_by_id(db=db, campaign_id=campaign_id)
+    if not campaign_obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Campaign not found.'
+        )
+    return campaign_obj
@@ -1,10 +1,19 @@
+import uuid
+
+from decimal import Decimal
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import HTTPException, status
-from fastapi.encoders import jsonable_encoder
+from fastapi import HTTPException, Response, status
 
-from src.models.models import Game
-from src.services.base import game_crud
+from src.models.models import Game, GameCard
 from src.schemas import games as games_schema
+from src.services.base import game_crud
+from src.services.game_cards import game_card_crud
+from src.services.similar import similar_games
+from src.services.facets import game_facets
+
+GAME_NAME_CONSTRAINT = 'uq_games_name_lower'
 
 
 async def check_game_by_id(db: AsyncSession, game_id: str) -> Game:
@@ -17,20 +26,104 @@ async def check_game_by_id(db: AsyncSession, game_id: str) -> Game:
     return game_obj
 
 
-async def check_duplicating_game(
-        game_in: games_schema.GameUpdate,
+async def get_similar_games(db: AsyncSession, game_id: str, limit: int) -> list[dict]:
+    """Cards of games most similar to the game, 404 if there is no such game."""
+    try:
+        game_id = str(uuid.UUID(game_id))
+    except ValueError:
+        game_id = None
+    if game_id is None or await game_crud.get_version(db=db, game_id=game_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='game not found.'
+        )
+    await similar_games.ensure_loaded(db)
+    ranked = similar_games.similar(game_id, limit=limit)
+    cards = await game_card_crud.get_multi_by_game_ids(
+        db=db,
+        game_ids=[uuid.UUID(other_id) for other_id, _ in ranked]
+    )
+    cards_by_id = {str(card.game_id): card for card in cards}
+    return [
+        {'score': score, 'game': cards_by_id[other_id]}
+        for other_id, score in ranked
+        if other_id in cards_by_id
+    ]
+
+
+async def get_game_facets(
+        db: AsyncSession,
+        min_final_price: Optional[Decimal],
+        max_final_price: Optional[Decimal],
+        limit: int
+) -> dict:
+    await game_facets.ensure_loaded(db)
+    total, facets = game_facets.counts(
+        min_final_price=min_final_price,
+        max_final_price=max_final_price,
+        limit=limit
+    )
+    return {
+        'total': total,
+        **{
+            facet: [{'value': value, 'name': name, 'count': count} for value, name, count in counts]
+            for facet, counts in facets.items()
+        }
+    }
+
+
+def check_cursor_sort(sort: Optional[games_schema.GameSort], after: Optional[uuid.UUID]) -> None:
+    if after is not None and sort not in (games_schema.GameSort.ADDED, games_schema.GameSort.RECENTLY_ADDED):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Cursor pagination is available with `added` and `-added` sorting only.'
+        )
+
+
+async def get_games_batch(db: AsyncSession, game_ids: list[str], max_ids: int) -> dict:
+    """Load games by ids in requested order and report ids that were not found."""
+    requested = list(dict.fromkeys(
+        game_id.strip()
+        for value in game_ids
+        for game_id in value.split(',')
+        if game_id.strip()
+    ))
+    if len(requested) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f'At most {max_ids} ids may be requested at once.'
+        )
+    parsed = {}
+    for game_id in requested:
+        try:
+            parsed[game_id] = uuid.UUID(game_id)
+        except ValueError:
+            continue
+    games = await game_crud.get_multi_by_ids(db=db, game_ids=list(parsed.values()))
+    games_by_id = {game.id: game for game in games}
+    return {
+        'games': [games_by_id[parsed[game_id]] for game_id in requested if parsed.get(game_id) in games_by_id],
+        'missing': [game_id for game_id in requested if parsed.get(game_id) not in games_by_id]
+    }
+
+
+async def get_linked_game_cards(
         db: AsyncSession,
-        game_obj: Game
-) -> None:
-    game_in_data = jsonable_encoder(game_in, exclude_none=True)
-    if 'name' in game_in_data:
-        game = await game_crud.get_by_name(db=db, obj_in=game_in)
-        if game and game_obj.id != game.id and [
-            platform.name for platform in game_obj.platforms
-        ].sort() != [
-            platform.name for platform in game.platforms
-        ].sort():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail='Game with this name already exists'
-            )
+        response: Response,
+        *,
+        entity: str,
+        entity_id: str,
+        after: Optional[uuid.UUID],
+        limit: int
+) -> list[GameCard]:
+    """Page of games linked to the entity, cursor of the next page goes to X-Next-Cursor."""
+    cards = await game_card_crud.get_multi_for_entity(
+        db=db,
+        entity=entity,
+        entity_id=entity_id,
+        after=after,
+        limit=limit
+    )
+    if len(cards) == limit:
+        response.headers['X-Next-Cursor'] = str(cards[-1].game_id)
+    return cards
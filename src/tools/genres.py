@@ -5,6 +5,9 @@ from fastapi.encoders import jsonable_encoder
 from src.services.base import genre_crud
 from src.models.models import Genre
 from src.schemas import genres as genre_schema
+from src.services.slugs import genre_slugs
+
+GENRE_SLUG_CONSTRAINT = ('ix_genres_slug', 'genres.slug')
 
 
 async def check_genre_by_id(db: AsyncSession, genre_id: str) -> Genre:
@@ -17,6 +20,23 @@ async def check_genre_by_id(db: AsyncSession, genre_id: str) -> Genre:
     return genre_obj
 
 
+async def check_genre_by_slug(db: AsyncSession, slug: str) -> Genre:
+    genre_id = await genre_slugs.resolve(db=db, slug=slug)
+    genre_obj = await genre_crud.get_by_id(db=db, genre_id=genre_id) if genre_id else None
+    if genre_id and (genre_obj is None or genre_obj.slug != slug):
+        # Renamed or deleted by another worker, ask the slug index directly.
+        genre_slugs.forget(genre_id)
+        genre_obj = await genre_crud.get_by_slug(db=db, slug=slug)
+        if genre_obj:
+            genre_slugs.remember(slug, str(genre_obj.id))
+    if not genre_obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Genre not found.'
+        )
+    return genre_obj
+
+
 async def check_duplicating_genre(
         genre_in: genre_schema.GenreUpdate,
         db: AsyncSession,
@@ -224,7 +224,7 @@ async def new_game(gen_async_session: AsyncSession) -> Game:
         }
     )
     d_data = {
-            'name': 'test_game',
+            'name': 'test_fixture_game',
             'price': 0.11,
             'discount': 0.12,
             'description': 'test_game_description',
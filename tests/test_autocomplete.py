@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.services.autocomplete import NameIndex
+
+
+def test_01_prefix_and_word_start_matches_by_popularity():
+    index = NameIndex()
+    index.build(
+        [
+            ('games', 'witcher', 'The Witcher 3: Wild Hunt'),
+            ('games', 'witch', 'Witch It'),
+            ('publishers', 'wild', 'Wildcard Games'),
+            ('developers', 'switch', 'Switchback Studio')
+        ],
+        popularity={('games', 'witcher'): 5}
+    )
+    assert [item.id for item in index.search('WITCH')] == ['witcher', 'witch'], (
+        'Make sure that names match by the start of any word, most popular first'
+    )
+    assert {item.id for item in index.search('wild')} == {'witcher', 'wild'}
+    assert index.search('itch') == [], 'Make sure that the index matches word starts only'
+
+    index.touch('games', 'witch', amount=10)
+    index.set('games', 'witch', 'Witch It Deluxe')
+    assert index.search('witch', limit=1)[0].name == 'Witch It Deluxe'
+    index.remove('games', 'witcher')
+    assert [item.id for item in index.search('w')] == ['witch', 'wild']
+
+
+@pytest.mark.asyncio
+async def test_02_autocomplete_endpoint(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI
+):
+    url = test_app.url_path_for('get_suggestions')
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_publisher'),
+        json={'name': 'Suggested Publisher', 'country': 'suggested_country'}
+    )
+    publisher_id = response.json()['id']
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_game'),
+        json={
+            'name': 'Suggested Game',
+            'price': 10,
+            'description': 'suggested_game_description',
+            'release_date': '01.01.2020',
+            'genres': [],
+            'developers': [],
+            'publishers': ['Suggested Publisher'],
+            'platforms': []
+        }
+    )
+    game_id = response.json()['id']
+
+    response = await auth_async_client.get(url, params={'q': 'sugges'})
+    assert response.status_code == HTTPStatus.OK
+    assert [(item['kind'], item['id']) for item in response.json()] == [
+        ('publishers', publisher_id), ('games', game_id)
+    ], 'Make sure that companies with more games are suggested first'
+
+    await auth_async_client.get(test_app.url_path_for('get_game', game_id=game_id))
+    await auth_async_client.get(test_app.url_path_for('get_game', game_id=game_id))
+    response = await auth_async_client.get(url, params={'q': 'sugges', 'limit': 1})
+    assert response.json()[0]['id'] == game_id, 'Make sure that viewed games rise in suggestions'
+
+    response = await auth_async_client.get(url, params={'q': 'ested gam'})
+    assert [item['id'] for item in response.json()] == [game_id], (
+        'Make sure that names containing the query are suggested'
+    )
+
+    await auth_async_admin_client.patch(
+        test_app.url_path_for('patch_game', game_id=game_id),
+        json={'name': 'Renamed Game'}
+    )
+    response = await auth_async_client.get(url, params={'q': 'renamed'})
+    assert [item['id'] for item in response.json()] == [game_id]
+
+    await auth_async_admin_client.delete(test_app.url_path_for('delete_game', game_id=game_id))
+    await auth_async_admin_client.delete(test_app.url_path_for('delete_publisher', publisher_id=publisher_id))
+    response = await auth_async_client.get(url, params={'q': 'sugges'})
+    assert response.json() == [], 'Make sure that deleted names are not suggested'
@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.services.base import campaign_crud, game_crud
+from src.services.campaign_scheduler import CampaignScheduler
+from src.services.leases import acquire_lease
+
+
+async def create_game(client: AsyncClient, test_app: FastAPI, name: str, genres: list[str]) -> str:
+    response = await client.post(
+        test_app.url_path_for('create_game'),
+        json={
+            'name': name,
+            'price': 40,
+            'discount': 4,
+            'description': f'{name}_description',
+            'release_date': '01.01.2020',
+            'genres': genres,
+            'developers': [],
+            'publishers': [],
+            'platforms': []
+        }
+    )
+    return response.json()['id']
+
+
+async def discounts(db: AsyncSession, game_ids: list[str]) -> list[tuple[Decimal, Decimal]]:
+    games = await game_crud.get_multi_by_ids(db=db, game_ids=game_ids)
+    by_id = {str(game.id): game for game in games}
+    return [(by_id[game_id].discount, by_id[game_id].final_price) for game_id in game_ids]
+
+
+async def remove(client: AsyncClient, test_app: FastAPI, campaign_ids: list[str], game_ids: list[str]) -> None:
+    for campaign_id in campaign_ids:
+        response = await client.delete(test_app.url_path_for('delete_campaign', campaign_id=campaign_id))
+        assert response.status_code == HTTPStatus.OK
+    for game_id in game_ids:
+        await client.delete(test_app.url_path_for('delete_game', game_id=game_id))
+
+
+@pytest.mark.asyncio
+async def test_01_campaign_window(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        async_session: async_sessionmaker[AsyncSession],
+        test_app: FastAPI
+):
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'campaign_genre', 'description': 'campaign_genre_description'}
+    )
+    genre_id = response.json()['id']
+    game_ids = [
+        await create_game(auth_async_admin_client, test_app, 'campaign_game_0', ['campaign_genre']),
+        await create_game(auth_async_admin_client, test_app, 'campaign_game_1', [])
+    ]
+    now = datetime.utcnow()
+    campaign_in = {
+        'name': 'weekend_sale',
+        'kind': 'percent',
+        'value': 30,
+        'genre_id': genre_id,
+        'starts_at': (now + timedelta(hours=1)).isoformat(),
+        'ends_at': (now + timedelta(hours=3)).isoformat()
+    }
+    url = test_app.url_path_for('create_campaign')
+    response = await auth_async_client.post(url, json=campaign_in)
+    assert response.status_code == HTTPStatus.FORBIDDEN, (
+        'Check that POST request to `/api/v1/campaigns/` by not staff returns 403 status code'
+    )
+    response = await auth_async_admin_client.post(url, json={**campaign_in, 'ends_at': campaign_in['starts_at']})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, (
+        'Check that campaign which does not end after it starts returns 422 status code'
+    )
+    response = await auth_async_admin_client.post(url, json=campaign_in)
+    assert response.status_code == HTTPStatus.CREATED
+    campaign = response.json()
+    assert campaign['status'] == 'scheduled'
+
+    scheduler = CampaignScheduler(async_session, interval=30, lease_ttl=90)
+    delay = await scheduler.tick(now=now)
+    assert 3500 < delay <= 3600, 'Make sure that the scheduler sleeps until the next boundary'
+    async with async_session() as db:
+        assert await discounts(db, game_ids) == [(4, 36), (4, 36)]
+
+    await scheduler.tick(now=now + timedelta(hours=1))
+    async with async_session() as db:
+        assert await discounts(db, game_ids) == [(12, 28), (4, 36)], (
+            'Make sure that a started campaign discounts selected games only'
+        )
+        assert (await campaign_crud.get_by_id(db=db, campaign_id=campaign['id'])).status == 'active'
+
+    await scheduler.tick(now=now + timedelta(hours=5))
+    async with async_session() as db:
+        assert await discounts(db, game_ids) == [(4, 36), (4, 36)], (
+            'Make sure that discounts are restored when a campaign ends'
+        )
+        assert (await campaign_crud.get_by_id(db=db, campaign_id=campaign['id'])).status == 'finished'
+    await remove(auth_async_admin_client, test_app, campaign_ids=[campaign['id']], game_ids=game_ids)
+    await auth_async_admin_client.delete(test_app.url_path_for('delete_genre', genre_id=genre_id))
+
+
+@pytest.mark.asyncio
+async def test_02_campaign_missed_window(
+        auth_async_admin_client: AsyncClient,
+        async_session: async_sessionmaker[AsyncSession],
+        test_app: FastAPI
+):
+    game_id = await create_game(auth_async_admin_client, test_app, 'missed_campaign_game', [])
+    now = datetime.utcnow()
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_campaign'),
+        json={
+            'name': 'missed_sale',
+            'value': 10,
+            'ids': [game_id],
+            'starts_at': (now - timedelta(days=3)).isoformat(),
+            'ends_at': (now - timedelta(days=2)).isoformat()
+        }
+    )
+    campaign_id = response.json()['id']
+    await CampaignScheduler(async_session, interval=30, lease_ttl=90).tick(now=now)
+    async with async_session() as db:
+        assert (await campaign_crud.get_by_id(db=db, campaign_id=campaign_id)).status == 'missed', (
+            'Make sure that a campaign whose window passed while no scheduler ran is marked missed'
+        )
+        assert await discounts(db, [game_id]) == [(4, 36)]
+    await remove(auth_async_admin_client, test_app, campaign_ids=[campaign_id], game_ids=[game_id])
+
+
+@pytest.mark.asyncio
+async def test_03_lease_has_single_holder(
+        async_session: async_sessionmaker[AsyncSession],
+        create_base
+):
+    async with async_session() as db:
+        assert await acquire_lease(db, 'test_lease', ttl=60, holder='first')
+        assert not await acquire_lease(db, 'test_lease', ttl=60, holder='second'), (
+            'Make sure that a lease held by another worker is not taken'
+        )
+        assert await acquire_lease(db, 'test_lease', ttl=0, holder='first')
+        assert await acquire_lease(db, 'test_lease', ttl=60, holder='second'), (
+            'Make sure that an expired lease is taken over'
+        )
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_04_delete_restores_campaign_activated_meanwhile(
+        auth_async_admin_client: AsyncClient,
+        async_session: async_sessionmaker[AsyncSession],
+        test_app: FastAPI
+):
+    game_id = await create_game(auth_async_admin_client, test_app, 'deleted_campaign_game', [])
+    now = datetime.utcnow()
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_campaign'),
+        json={
+            'name': 'deleted_sale',
+            'value': 10,
+            'ids': [game_id],
+            'starts_at': (now + timedelta(hours=1)).isoformat(),
+            'ends_at': (now + timedelta(hours=2)).isoformat()
+        }
+    )
+    campaign_id = response.json()['id']
+    async with async_session() as db:
+        campaign = await campaign_crud.get_by_id(db=db, campaign_id=campaign_id)
+        assert campaign.status == 'scheduled'
+        await db.commit()
+        await CampaignScheduler(async_session, interval=30, lease_ttl=90).tick(now=now + timedelta(hours=1))
+        await campaign_crud.delete(db=db, obj=campaign)
+    async with async_session() as db:
+        assert await discounts(db, [game_id]) == [(4, 36)], (
+            'Make sure that deleting a campaign activated after it was read restores discounts'
+        )
+        assert await campaign_crud.get_by_id(db=db, campaign_id=campaign_id) is None
+    await remove(auth_async_admin_client, test_app, campaign_ids=[], game_ids=[game_id])
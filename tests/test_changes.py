@@ -0,0 +1,90 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.core.config import app_settings
+from src.services.changes import ChangeFeed, change_feed
+from src.services.events import CREATE, DELETE, CatalogEvent
+
+
+def changes(body: str) -> list[dict]:
+    return [json.loads(line[len('data: '):]) for line in body.splitlines() if line.startswith('data: {"')]
+
+
+@pytest.mark.asyncio
+async def test_01_feed_resumes_and_disconnects_slow_clients():
+    feed = ChangeFeed(capacity=8, client_buffer=4)
+    feed.publish(CatalogEvent(entity='users', action=CREATE, entity_id='user'))
+    assert feed.last_event_id == f'{feed.epoch}-0', 'Make sure that only catalog entities are streamed'
+    feed.publish(CatalogEvent(entity='genres', action=CREATE, entity_id='first'))
+    resume_id = feed.last_event_id
+    for number in range(3):
+        feed.publish(CatalogEvent(entity='games', action=CREATE, entity_id=str(number)))
+
+    chunks = []
+    async for chunk in feed.stream(last_event_id=resume_id, heartbeat=0.01, max_duration=0.05):
+        chunks.append(chunk)
+    assert [change['id'] for change in changes(''.join(chunks))] == ['0', '1', '2']
+    assert f'id: {feed.last_event_id}\n' in ''.join(chunks), 'Make sure that events carry resumable ids'
+
+    body = ''.join([chunk async for chunk in feed.stream('unknown-1', heartbeat=0.01, max_duration=0.01)])
+    assert 'event: reset' in body, 'Make sure that unknown ids are answered with a reset event'
+
+    stream = feed.stream(last_event_id=None, heartbeat=1, max_duration=1)
+    await stream.__anext__()
+    waiting = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    feed.publish(CatalogEvent(entity='genres', action=DELETE, entity_id='first'))
+    assert changes(await waiting) == [{'entity': 'genres', 'action': DELETE, 'id': 'first'}]
+    for number in range(5):
+        feed.publish(CatalogEvent(entity='games', action=DELETE, entity_id=str(number)))
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert feed.subscribers == 0, 'Make sure that clients falling behind the buffer are disconnected'
+
+
+@pytest.mark.asyncio
+async def test_02_changes_stream_endpoint(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI,
+        monkeypatch
+):
+    monkeypatch.setattr(app_settings, 'change_feed_max_duration', 0.05)
+    url = test_app.url_path_for('get_changes_stream')
+    last_event_id = change_feed.last_event_id
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'streamed_genre', 'description': 'streamed_genre_description'}
+    )
+    genre_id = response.json()['id']
+    await auth_async_admin_client.delete(test_app.url_path_for('delete_genre', genre_id=genre_id))
+
+    response = await auth_async_client.get(url, headers={'Last-Event-ID': last_event_id})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/event-stream')
+    assert changes(response.text) == [
+        {'entity': 'genres', 'action': CREATE, 'id': genre_id},
+        {'entity': 'genres', 'action': DELETE, 'id': genre_id}
+    ], 'Make sure that the stream continues after the Last-Event-ID'
+
+
+@pytest.mark.asyncio
+async def test_03_closed_feed_ends_streams():
+    feed = ChangeFeed(capacity=8, client_buffer=4)
+    stream = feed.stream(last_event_id=None, heartbeat=60, max_duration=60)
+    await stream.__anext__()
+    waiting = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    feed.publish(CatalogEvent(entity='games', action=CREATE, entity_id='last'))
+    feed.close()
+    assert changes(await waiting) == [{'entity': 'games', 'action': CREATE, 'id': 'last'}], (
+        'Make sure that events published before shutdown are still sent'
+    )
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(stream.__anext__(), timeout=1)
+    assert feed.subscribers == 0, 'Make sure that closing the feed ends the streams'
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.models.models import Game, Platform
+from src.services.counts import TotalCounter
+from src.services.events import CatalogEvent, CREATE, DELETE
+from .test_round_trips import count_statements
+
+
+@pytest.mark.asyncio
+async def test_01_list_total_count_header(
+        auth_async_client: AsyncClient,
+        test_app: FastAPI,
+        new_platform: Platform
+):
+    url = test_app.url_path_for('get_platforms')
+    response = await auth_async_client.get(url)
+    assert 'X-Total-Count' not in response.headers, (
+        'Make sure that total count is returned only on demand'
+    )
+    response = await auth_async_client.get(url, params={'with_total': True, 'limit': 1000})
+    assert response.status_code == HTTPStatus.OK
+    assert int(response.headers['X-Total-Count']) == len(response.json()), (
+        'Check that GET request to `/api/v1/platforms/?with_total=true` returns X-Total-Count header'
+    )
+
+
+@pytest.mark.asyncio
+async def test_02_cached_total_follows_events(gen_async_session: AsyncSession):
+    counter = TotalCounter(cached_tables={'games'}, ttl=60, exact_threshold=10000)
+    total = await counter.total(db=gen_async_session, model=Game)
+    counter.on_event(CatalogEvent(entity='games', action=CREATE, entity_id='1'))
+    counter.on_event(CatalogEvent(entity='games', action=CREATE, entity_id='2'))
+    counter.on_event(CatalogEvent(entity='games', action=DELETE, entity_id='1'))
+    assert await counter.total(db=gen_async_session, model=Game) == total + 1
+
+
+@pytest.mark.asyncio
+async def test_03_filtered_total_is_cached(
+        engine: AsyncEngine,
+        gen_async_session: AsyncSession,
+        new_platform: Platform
+):
+    counter = TotalCounter(cached_tables=set(), ttl=60, exact_threshold=10000)
+    filters = (Platform.name == new_platform.name,)
+
+    async def total() -> int:
+        return await counter.total(
+            db=gen_async_session, model=Platform, filters=filters, cache_key=new_platform.name
+        )
+
+    assert await total() == 1
+    with count_statements(engine) as statements:
+        assert await total() == 1
+    assert statements == [], 'Make sure that filtered totals are cached'
+    counter.on_event(CatalogEvent(entity='platforms', action=CREATE, entity_id='1'))
+    with count_statements(engine) as statements:
+        assert await total() == 1
+    assert statements == ['SELECT'], 'Make sure that events of the table drop its filtered totals'
+
+
+@pytest.mark.asyncio
+async def test_04_cached_totals_are_bounded(
+        engine: AsyncEngine,
+        gen_async_session: AsyncSession,
+        new_platform: Platform
+):
+    counter = TotalCounter(cached_tables=set(), ttl=60, exact_threshold=10000, max_filtered=2)
+
+    async def total(name: str) -> int:
+        return await counter.total(
+            db=gen_async_session, model=Platform, filters=(Platform.name == name,), cache_key=name
+        )
+
+    for name in ('a', 'b', new_platform.name):
+        await total(name)
+    with count_statements(engine) as statements:
+        assert await total(new_platform.name) == 1
+        await total('a')
+    assert statements == ['SELECT'], (
+        'Make sure that the oldest filtered totals are dropped past max_filtered'
+    )
+
+    counter = TotalCounter(cached_tables={'games'}, ttl=0, exact_threshold=10000)
+    total_games = await counter.total(db=gen_async_session, model=Game)
+    counter.on_event(CatalogEvent(entity='games', action=CREATE, entity_id='1'))
+    assert await counter.total(db=gen_async_session, model=Game) == total_games, (
+        'Make sure that cached totals are counted again after ttl'
+    )
@@ -0,0 +1,59 @@
+import asyncio
+import time
+from http import HTTPStatus
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.core.deadline import (
+    DeadlineRoute,
+    deadline,
+    deadline_exceeded,
+    request_deadline,
+    statement_timeout_handler
+)
+
+SLOW_QUERY = text(
+    'WITH RECURSIVE cnt(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM cnt) '
+    'SELECT count(*) FROM cnt'
+)
+
+
+@pytest.mark.asyncio
+async def test_01_route_deadline_returns_504(base_url: str):
+    router = APIRouter(route_class=DeadlineRoute)
+
+    @router.get('/slow')
+    @deadline(0.05)
+    async def slow_endpoint():
+        await asyncio.sleep(1)
+
+    app = FastAPI()
+    app.include_router(router)
+    async with AsyncClient(app=app, base_url=base_url) as client:
+        response = await client.get('/slow')
+    assert response.status_code == HTTPStatus.GATEWAY_TIMEOUT, (
+        'Check that request that outlived its deadline returns 504 status code'
+    )
+    assert deadline_exceeded.value(route='/slow') == 1
+
+
+@pytest.mark.asyncio
+async def test_02_statement_interrupted_by_deadline(async_session: async_sessionmaker):
+    token = request_deadline.set(time.monotonic() + 0.1)
+    try:
+        async with async_session() as db:
+            with pytest.raises(DBAPIError) as error:
+                await db.execute(SLOW_QUERY)
+    finally:
+        request_deadline.reset(token)
+    request = Request({'type': 'http', 'path': '/slow', 'headers': [], 'query_string': b''})
+    response = await statement_timeout_handler(request=request, error=error.value)
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+        'Check that statement cancelled by deadline is answered with 503 status code'
+    )
+
@@ -0,0 +1,129 @@
+import asyncio
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.schemas import games as game_schema
+from src.services.base import game_crud
+from src.services.events import CatalogEvent, DELETE, PATCH
+from src.services.facets import GameFacets
+
+
+def test_01_counts_follow_price_filter_and_updates():
+    index = GameFacets(price_buckets=[Decimal(10), Decimal(20)])
+    index.build([
+        ('cheap', Decimal('4.99'), 2020, [('genres', 'rpg'), ('platforms', 'pc')]),
+        ('middle', Decimal('15.00'), 2021, [('genres', 'rpg')]),
+        ('expensive', Decimal('59.99'), 2021, [('genres', 'action'), ('platforms', 'pc')])
+    ])
+    total, facets = index.counts()
+    assert total == 3
+    assert facets['genres'] == [('rpg', '', 2), ('action', '', 1)]
+    assert facets['prices'] == [('0-10', '0-10', 1), ('10-20', '10-20', 1), ('20+', '20+', 1)]
+    assert facets['release_years'] == [('2021', '2021', 2), ('2020', '2020', 1)]
+
+    total, facets = index.counts(min_final_price=Decimal('4.99'), max_final_price=Decimal('15'))
+    assert total == 2, 'Make sure that price range bounds are included'
+    assert facets['genres'] == [('rpg', '', 2)]
+    assert facets['platforms'] == [('pc', '', 1)]
+
+    index.set_game('middle', Decimal('25.00'), 2021)
+    index.remove_game('cheap')
+    index.remove_value('platforms', 'pc')
+    total, facets = index.counts(min_final_price=Decimal(20))
+    assert total == 2
+    assert facets['genres'] == [('action', '', 1), ('rpg', '', 1)], (
+        'Make sure that a changed price keeps the linked entities of the game'
+    )
+    assert facets['platforms'] == []
+
+
+@pytest.mark.asyncio
+async def test_02_game_facets_endpoint(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI
+):
+    url = test_app.url_path_for('get_games_facets')
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'facet_genre', 'description': 'facet_genre_description'}
+    )
+    genre_id = response.json()['id']
+    game_ids = []
+    for number, price in enumerate((5, 15, 35)):
+        response = await auth_async_admin_client.post(
+            test_app.url_path_for('create_game'),
+            json={
+                'name': f'facet_game_{number}',
+                'price': price,
+                'description': 'facet_game_description',
+                'release_date': '01.01.1971',
+                'genres': ['facet_genre'],
+                'developers': [],
+                'publishers': [],
+                'platforms': []
+            }
+        )
+        game_ids.append(response.json()['id'])
+
+    def genre_count(facets: dict) -> int:
+        return next((item['count'] for item in facets['genres'] if item['value'] == genre_id), 0)
+
+    response = await auth_async_client.get(url, params={'limit': 100})
+    assert response.status_code == HTTPStatus.OK
+    facets = response.json()
+    assert genre_count(facets) == 3
+    assert {'value': genre_id, 'name': 'facet_genre', 'count': 3} in facets['genres']
+    assert {'value': '1971', 'name': '1971', 'count': 3} in facets['release_years']
+
+    response = await auth_async_client.get(url, params={'limit': 100, 'min_final_price': 10, 'max_final_price': 35})
+    assert genre_count(response.json()) == 2, 'Make sure that facets count games of the price filter only'
+
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('apply_games_discount'),
+        json={'kind': 'absolute', 'value': 30, 'ids': [game_ids[2]]}
+    )
+    assert response.json()['updated'] == 1
+    response = await auth_async_client.get(url, params={'limit': 100, 'min_final_price': 10, 'max_final_price': 35})
+    assert genre_count(response.json()) == 1, 'Make sure that bulk discounts are reflected in facets'
+
+    for game_id in game_ids:
+        await auth_async_admin_client.delete(test_app.url_path_for('delete_game', game_id=game_id))
+    await auth_async_admin_client.delete(test_app.url_path_for('delete_genre', genre_id=genre_id))
+    response = await auth_async_client.get(url, params={'limit': 100})
+    assert genre_count(response.json()) == 0
+    assert '1971' not in {item['value'] for item in response.json()['release_years']}
+
+
+@pytest.mark.asyncio
+async def test_03_events_during_load_are_applied(gen_async_session: AsyncSession):
+    game = await game_crud.create(
+        db=gen_async_session,
+        obj_in=game_schema.GameCreate(
+            name='facet_loading_game',
+            price='10.00',
+            description='facet_loading_game',
+            release_date='01.01.1972',
+            genres=[],
+            developers=[],
+            publishers=[],
+            platforms=[]
+        )
+    )
+    index = GameFacets(price_buckets=[Decimal(10)])
+    loading = asyncio.create_task(index.load(gen_async_session))
+    await asyncio.sleep(0)
+    index.on_event(CatalogEvent(entity='games', action=DELETE, entity_id=str(game.id)))
+    await loading
+    _, facets = index.counts()
+    assert ('1972', '1972', 1) not in facets['release_years'], (
+        'Make sure that events published while the index loads are applied after it'
+    )
+    index.on_event(CatalogEvent(entity='games', action=PATCH, data={'updated': 1}))
+    assert not index.ready
+    await game_crud.delete(db=gen_async_session, obj=game)
@@ -1,11 +1,15 @@
+import uuid
 from http import HTTPStatus
 
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
 from src.models.models import Game, Genre, Publisher, Developer, Platform
 from src.schemas import games as game_schema
+from src.services.base import game_crud, genre_crud
 
 
 @pytest.mark.asyncio
@@ -197,3 +201,377 @@ async def test_05_games_delete(
     assert response.status_code == HTTPStatus.NOT_FOUND, (
         'Check that GET request to `/api/v1/games/{game_id}` for deleted game_id returns 404 status code'
     )
+
+
+@pytest.mark.asyncio
+async def test_06_games_batch(
+        auth_async_client: AsyncClient,
+        async_client: AsyncClient,
+        gen_async_session: AsyncSession,
+        test_app: FastAPI
+):
+    games = []
+    for num in range(3):
+        game_in = game_schema.GameCreate(
+            name=f'batch_game_{num}',
+            price=1,
+            description='batch_game_description',
+            release_date='01.01.2020',
+            genres=[],
+            developers=[],
+            publishers=[],
+            platforms=[]
+        )
+        games.append(await game_crud.create(db=gen_async_session, obj_in=game_in))
+    requested = [str(games[2].id), 'not-a-uuid', str(games[0].id), str(uuid.uuid4())]
+    url = test_app.url_path_for('get_games_by_ids')
+    response = await async_client.get(url, params={'ids': requested})
+    assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+        'Check that GET request to `/api/v1/games/batch` with no auth data returns 401 status'
+    )
+    response = await auth_async_client.get(url, params={'ids': ','.join(requested)})
+    assert response.status_code == HTTPStatus.OK, (
+        'Check that GET request to `/api/v1/games/batch` with auth returns 200 status'
+    )
+    response_data = response.json()
+    assert [game['id'] for game in response_data['games']] == [requested[0], requested[2]], (
+        'Make sure that `/api/v1/games/batch` preserves requested order'
+    )
+    assert response_data['missing'] == [requested[1], requested[3]], (
+        'Make sure that `/api/v1/games/batch` reports missing ids'
+    )
+    url = test_app.url_path_for('post_games_by_ids')
+    response = await auth_async_client.post(url, json={'ids': requested})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == response_data, (
+        'Make sure that POST `/api/v1/games/batch` returns the same data as GET'
+    )
+    too_many = ','.join(str(uuid.uuid4()) for _ in range(game_schema.POST_BATCH_MAX_IDS + 1))
+    url = test_app.url_path_for('get_games_by_ids')
+    response = await auth_async_client.get(url, params={'ids': too_many})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, (
+        'Make sure that the ids limit of `/api/v1/games/batch` counts comma separated ids'
+    )
+    url = test_app.url_path_for('post_games_by_ids')
+    response = await auth_async_client.post(url, json={'ids': [too_many]})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_07_game_cards(
+        auth_async_client: AsyncClient,
+        gen_async_session: AsyncSession,
+        test_app: FastAPI
+):
+    db = gen_async_session
+    genre_obj = await genre_crud.create(db=db, obj_in={'name': 'card_genre', 'description': 'card_genre'})
+    game_in = game_schema.GameCreate(
+        name='card_game',
+        price=10,
+        description='card_game_description',
+        release_date='01.01.2020',
+        genres=[genre_obj.name],
+        developers=[],
+        publishers=[],
+        platforms=[]
+    )
+    game_obj = await game_crud.create(db=db, obj_in=game_in)
+    url = test_app.url_path_for('get_game_cards')
+    response = await auth_async_client.get(url, params={'q': 'card_ga'})
+    assert response.status_code == HTTPStatus.OK, (
+        'Check that GET request to `/api/v1/games/catalog/` with auth returns 200 status'
+    )
+    response_data = response.json()
+    assert [card['game_id'] for card in response_data] == [str(game_obj.id)], (
+        'Make sure that `/api/v1/games/catalog/` searches cards by name'
+    )
+    assert response_data[0]['genre_names'] == ['card_genre']
+    assert response_data[0]['genre_ids'] == [str(genre_obj.id)]
+
+    await genre_crud.patch(db=db, genre_obj=genre_obj, obj_in={'name': 'card_genre_renamed'})
+    response = await auth_async_client.get(url, params={'q': 'card_ga'})
+    assert response.json()[0]['genre_names'] == ['card_genre_renamed'], (
+        'Make sure that game cards follow renaming of related entities'
+    )
+
+    await game_crud.delete(db=db, obj=game_obj)
+    response = await auth_async_client.get(url, params={'q': 'card_ga'})
+    assert response.json() == [], (
+        'Make sure that game card is removed with the game'
+    )
+
+
+@pytest.mark.asyncio
+async def test_08_games_final_price(
+        auth_async_client: AsyncClient,
+        gen_async_session: AsyncSession,
+        test_app: FastAPI
+):
+    prices = {'price_game_cheap': (10, 8), 'price_game_middle': (20, 5), 'price_game_expensive': (40, 0)}
+    for name, (price, discount) in prices.items():
+        game_in = game_schema.GameCreate(
+            name=name,
+            price=price,
+            discount=discount,
+            description='price_game_description',
+            release_date='01.01.2020',
+            genres=[],
+            developers=[],
+            publishers=[],
+            platforms=[]
+        )
+        game_obj = await game_crud.create(db=gen_async_session, obj_in=game_in)
+        assert game_obj.final_price == price - discount
+    url = test_app.url_path_for('get_games')
+    response = await auth_async_client.get(
+        url,
+        params={'sort': '-final_price', 'min_final_price': 2, 'max_final_price': 15, 'with_total': True}
+    )
+    assert response.status_code == HTTPStatus.OK
+    response_data = response.json()
+    assert [game['name'] for game in response_data] == ['price_game_middle', 'price_game_cheap'], (
+        'Make sure that `/api/v1/games/` sorts and filters by final price'
+    )
+    assert response.headers['X-Total-Count'] == '2'
+    game_obj = await game_crud.patch(
+        db=gen_async_session,
+        obj=game_obj,
+        obj_in=game_schema.GameUpdate(discount=30)
+    )
+    assert game_obj.final_price == 10, (
+        'Make sure that final price follows discount changes'
+    )
+
+
+@pytest.mark.asyncio
+async def test_09_games_name_case_insensitive_unique(
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI
+):
+    data = {
+        'name': 'Unique_Name_Game',
+        'price': 10,
+        'discount': 0,
+        'description': 'unique_name_game_description',
+        'genres': [],
+        'release_date': '01.01.2020',
+        'publishers': [],
+        'developers': [],
+        'platforms': []
+    }
+    url = test_app.url_path_for('create_game')
+    response = await auth_async_admin_client.post(url, json=data)
+    assert response.status_code == HTTPStatus.CREATED
+    response = await auth_async_admin_client.post(url, json={**data, 'name': 'unique_name_GAME'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        'Make sure that game names are unique regardless of case'
+    )
+    response = await auth_async_admin_client.post(url, json={**data, 'name': 'other_name_game'})
+    assert response.status_code == HTTPStatus.CREATED
+    response = await auth_async_admin_client.patch(
+        test_app.url_path_for('patch_game', game_id=response.json()['id']),
+        json={'name': 'UNIQUE_NAME_GAME'}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        'Make sure that PATCH request can not take name of another game'
+    )
+
+
+@pytest.mark.asyncio
+async def test_10_games_recently_added(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI
+):
+    names = [f'recent_game_{number}' for number in range(3)]
+    for name in names:
+        response = await auth_async_admin_client.post(
+            test_app.url_path_for('create_game'),
+            json={
+                'name': name,
+                'price': 10,
+                'description': 'recent_game_description',
+                'release_date': '01.01.2020',
+                'genres': [],
+                'developers': [],
+                'publishers': [],
+                'platforms': []
+            }
+        )
+        assert response.status_code == HTTPStatus.CREATED
+    url = test_app.url_path_for('get_games')
+    response = await auth_async_client.get(url, params={'sort': '-added', 'limit': 2})
+    assert [game['name'] for game in response.json()] == names[:0:-1], (
+        'Make sure that `-added` sorting returns the newest games first'
+    )
+    response = await auth_async_client.get(
+        url,
+        params={'sort': '-added', 'limit': 1, 'after': response.headers['X-Next-Cursor']}
+    )
+    assert [game['name'] for game in response.json()] == names[:1], (
+        'Make sure that `after` continues from the cursor of the previous page'
+    )
+    response = await auth_async_client.get(url, params={'after': response.headers['X-Next-Cursor']})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_11_games_versions(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        async_session,
+        test_app: FastAPI
+):
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_game'),
+        json={
+            'name': 'versioned_game',
+            'price': 10,
+            'description': 'versioned_game_description',
+            'release_date': '01.01.2020',
+            'genres': [],
+            'developers': [],
+            'publishers': [],
+            'platforms': []
+        }
+    )
+    game_id = response.json()['id']
+    url = test_app.url_path_for('get_game', game_id=game_id)
+    response = await auth_async_client.get(url)
+    assert response.json()['version'] == 1 and response.headers['ETag'] == '"1"'
+    response = await auth_async_client.get(url, headers={'If-None-Match': '"1"'})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Make sure that GET request with current ETag in If-None-Match returns 304'
+    )
+    url = test_app.url_path_for('patch_game', game_id=game_id)
+    response = await auth_async_admin_client.patch(url, json={'price': 20}, headers={'If-Match': '"7"'})
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED, (
+        'Make sure that PATCH request with outdated If-Match returns 412'
+    )
+    response = await auth_async_admin_client.patch(url, json={'price': 20}, headers={'If-Match': '"1"'})
+    assert response.status_code == HTTPStatus.OK and response.headers['ETag'] == '"2"'
+    response = await auth_async_admin_client.patch(url, json={'genres': ['test_genre']})
+    assert response.json()['version'] == 3, (
+        'Make sure that changing relations of a game bumps its version'
+    )
+    async with async_session() as db:
+        game_obj = await game_crud.get_by_id(db=db, game_id=game_id)
+        await auth_async_admin_client.patch(url, json={'price': 30})
+        with pytest.raises(StaleDataError):
+            await game_crud.patch(db=db, obj=game_obj, obj_in=game_schema.GameUpdate(price=40))
+
+
+@pytest.mark.asyncio
+async def test_12_games_bulk_discount(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI
+):
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'sale_genre', 'description': 'sale_genre_description'}
+    )
+    genre_id = response.json()['id']
+    game_ids = []
+    for number, genres in enumerate((['sale_genre'], ['sale_genre'], [])):
+        response = await auth_async_admin_client.post(
+            test_app.url_path_for('create_game'),
+            json={
+                'name': f'sale_game_{number}',
+                'price': 20,
+                'description': 'sale_game_description',
+                'release_date': '01.01.2020',
+                'genres': genres,
+                'developers': [],
+                'publishers': [],
+                'platforms': []
+            }
+        )
+        game_ids.append(response.json()['id'])
+    url = test_app.url_path_for('apply_games_discount')
+    response = await auth_async_client.post(url, json={'kind': 'percent', 'value': 25, 'genre_id': genre_id})
+    assert response.status_code == HTTPStatus.FORBIDDEN, (
+        'Check that POST request to `/api/v1/games/discounts` by not staff returns 403 status code'
+    )
+    response = await auth_async_admin_client.post(url, json={'kind': 'percent', 'value': 25})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, (
+        'Check that bulk discount without selection of games returns 422 status code'
+    )
+
+    response = await auth_async_admin_client.post(url, json={'kind': 'percent', 'value': 25, 'genre_id': genre_id})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'updated': 2}, (
+        'Make sure that bulk discount returns the number of updated games'
+    )
+    games = [
+        (await auth_async_client.get(test_app.url_path_for('get_game', game_id=game_id))).json()
+        for game_id in game_ids
+    ]
+    assert [(float(game['discount']), float(game['final_price'])) for game in games] == [
+        (5.0, 15.0), (5.0, 15.0), (0.0, 20.0)
+    ], 'Make sure that percent discount is applied to games of the genre only'
+    assert [game['version'] for game in games] == [2, 2, 1]
+
+    response = await auth_async_admin_client.post(
+        url,
+        json={'value': 30, 'ids': game_ids[1:], 'genre_id': genre_id}
+    )
+    assert response.json() == {'updated': 1}, (
+        'Make sure that all given selectors must match'
+    )
+    response = await auth_async_client.get(test_app.url_path_for('get_game_cards'), params={'q': 'sale_game_1'})
+    card = response.json()[0]
+    assert (float(card['discount']), float(card['final_price'])) == (30.0, 0.0), (
+        'Make sure that bulk discount updates game cards and keeps final price above zero'
+    )
+
+
+@pytest.mark.asyncio
+async def test_13_games_etag_follows_linked_entities(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI
+):
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'etag_genre', 'description': 'etag_genre_description'}
+    )
+    genre_id = response.json()['id']
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_game'),
+        json={
+            'name': 'etag_game',
+            'price': 10,
+            'description': 'etag_game_description',
+            'release_date': '01.01.2020',
+            'genres': ['etag_genre'],
+            'developers': [],
+            'publishers': [],
+            'platforms': []
+        }
+    )
+    url = test_app.url_path_for('get_game', game_id=response.json()['id'])
+    etag = (await auth_async_client.get(url)).headers['ETag']
+    response = await auth_async_client.get(url, headers={'If-None-Match': f'W/{etag}'})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Make sure that If-None-Match uses weak comparison'
+    )
+    await auth_async_admin_client.patch(
+        test_app.url_path_for('patch_genre', genre_id=genre_id),
+        json={'name': 'renamed_etag_genre'}
+    )
+    response = await auth_async_client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.OK, (
+        'Make sure that renaming a linked genre changes the ETag of the game'
+    )
+    assert [genre['name'] for genre in response.json()['genres']] == ['renamed_etag_genre']
+    etag = response.headers['ETag']
+    await auth_async_admin_client.patch(
+        test_app.url_path_for('patch_genre', genre_id=genre_id),
+        json={'description': 'changed_etag_genre_description'}
+    )
+    response = await auth_async_client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.OK, (
+        'Make sure that changing any embedded field of a linked genre changes the ETag of the game'
+    )
+    assert response.json()['genres'][0]['description'] == 'changed_etag_genre_description'
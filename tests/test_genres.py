@@ -6,6 +6,7 @@ from httpx import AsyncClient
 
 from src.models.models import Genre
 from src.schemas import genres as genre_schema
+from src.services.slugs import genre_slugs
 
 
 @pytest.mark.asyncio
@@ -172,3 +173,101 @@ async def test_05_genres_delete(
     assert response.status_code == HTTPStatus.NOT_FOUND, (
         'Check that GET request to `/api/v1/genres/{genre_id}` for deleted genre_id returns 404 status code'
     )
+
+
+@pytest.mark.asyncio
+async def test_06_genres_get_by_slug(
+        test_app: FastAPI,
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+):
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'Slug Genre', 'description': 'slug_genre_description'}
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    genre_id = response.json()['id']
+    assert await genre_slugs.resolve(db=None, slug='slug-genre') == genre_id, (
+        'Make sure that created genre slug is resolved without a query'
+    )
+    response = await auth_async_client.get(
+        test_app.url_path_for('get_genre_by_slug', slug='slug-genre')
+    )
+    assert response.status_code == HTTPStatus.OK, (
+        'Check that GET request to `/api/v1/genres/by-slug/{slug}` return 200 status code'
+    )
+    assert response.json()['id'] == genre_id
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'slug genre', 'description': 'slug_genre_description'}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        'Make sure that genres with the same slug are rejected'
+    )
+    response = await auth_async_admin_client.patch(
+        test_app.url_path_for('patch_genre', genre_id=genre_id),
+        json={'name': 'Renamed Slug Genre'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    response = await auth_async_client.get(
+        test_app.url_path_for('get_genre_by_slug', slug='slug-genre')
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Make sure that old slug is not resolved after rename'
+    )
+    response = await auth_async_client.get(
+        test_app.url_path_for('get_genre_by_slug', slug='renamed-slug-genre')
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_07_genres_games_pages(
+        test_app: FastAPI,
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+):
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'paged_genre', 'description': 'paged_genre_description'}
+    )
+    genre_id = response.json()['id']
+    for number in range(3):
+        response = await auth_async_admin_client.post(
+            test_app.url_path_for('create_game'),
+            json={
+                'name': f'paged_genre_game_{number}',
+                'price': 10,
+                'description': 'paged_genre_game_description',
+                'release_date': '01.01.2020',
+                'genres': ['paged_genre'],
+                'developers': [],
+                'publishers': [],
+                'platforms': []
+            }
+        )
+        assert response.status_code == HTTPStatus.CREATED
+    response = await auth_async_client.get(test_app.url_path_for('get_genre', genre_id=genre_id))
+    assert response.json()['games_count'] == 3, (
+        'Make sure that genre detail returns number of its games'
+    )
+    url = test_app.url_path_for('get_genre_games', genre_id=genre_id)
+    response = await auth_async_client.get(url, params={'limit': 2})
+    assert response.status_code == HTTPStatus.OK
+    first_page = response.json()
+    assert len(first_page) == 2
+    cursor = response.headers['X-Next-Cursor']
+    response = await auth_async_client.get(url, params={'limit': 2, 'after': cursor})
+    second_page = response.json()
+    assert len(second_page) == 1 and 'X-Next-Cursor' not in response.headers
+    assert sorted(
+        card['name'] for card in first_page + second_page
+    ) == [f'paged_genre_game_{number}' for number in range(3)], (
+        'Make sure that pages of `/api/v1/genres/{genre_id}/games` cover all games of genre'
+    )
+    response = await auth_async_admin_client.delete(test_app.url_path_for('delete_genre', genre_id=genre_id))
+    assert response.status_code == HTTPStatus.OK, (
+        'Make sure that genre linked to games can be deleted'
+    )
+    response = await auth_async_client.get(url)
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,135 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.services.idempotency import DatabaseIdempotencyStore, StoredResponse
+
+
+@pytest.mark.asyncio
+async def test_01_retry_replays_created_object(
+        test_app: FastAPI,
+        auth_async_admin_client: AsyncClient,
+):
+    url = test_app.url_path_for('create_genre')
+    input_data = {
+        'name': 'idempotent_genre',
+        'description': 'idempotent_genre_description'
+    }
+    headers = {'Idempotency-Key': 'create-idempotent-genre'}
+    first = await auth_async_admin_client.post(url, json=input_data, headers=headers)
+    assert first.status_code == HTTPStatus.CREATED
+    retry = await auth_async_admin_client.post(url, json=input_data, headers=headers)
+    assert retry.status_code == HTTPStatus.CREATED, (
+        'Check that a retried POST request returns the status code of the first attempt'
+    )
+    assert retry.json()['id'] == first.json()['id'], (
+        'Make sure that a retried POST request does not create another object'
+    )
+    assert retry.headers.get('Idempotent-Replayed') == 'true'
+
+    response = await auth_async_admin_client.post(
+        url,
+        json={**input_data, 'name': 'other_idempotent_genre'},
+        headers=headers
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, (
+        'Check that reusing Idempotency-Key for another request body returns 422 status code'
+    )
+
+
+@pytest.mark.asyncio
+async def test_02_concurrent_retries_wait_for_first_attempt(
+        test_app: FastAPI,
+        auth_async_admin_client: AsyncClient,
+):
+    url = test_app.url_path_for('create_genre')
+    input_data = {
+        'name': 'concurrent_idempotent_genre',
+        'description': 'concurrent_idempotent_genre_description'
+    }
+    headers = {'Idempotency-Key': 'create-concurrent-idempotent-genre'}
+    responses = await asyncio.gather(*(
+        auth_async_admin_client.post(url, json=input_data, headers=headers) for _ in range(3)
+    ))
+    assert [response.status_code for response in responses] == [HTTPStatus.CREATED] * 3, (
+        'Check that concurrent retries get the response of the first attempt, '
+        f'got {[response.text for response in responses]}'
+    )
+    assert len({response.json()['id'] for response in responses}) == 1
+
+
+@pytest.mark.asyncio
+async def test_03_database_store_locks_and_expires_keys(
+        async_session: async_sessionmaker[AsyncSession],
+        create_base
+):
+    store = DatabaseIdempotencyStore(async_session, ttl=60, lock_timeout=60)
+    assert await store.begin('key', 'fingerprint') is None
+    stored = await store.begin('key', 'fingerprint')
+    assert stored.fingerprint == 'fingerprint' and stored.response is None, (
+        'Make sure that a key stays locked while the first attempt is in progress'
+    )
+    assert await store.wait('key', timeout=0.1) is None
+
+    await store.complete('key', StoredResponse(201, [('content-type', 'application/json')], b'{}'))
+    stored = await store.begin('key', 'fingerprint')
+    assert stored.response == StoredResponse(201, [('content-type', 'application/json')], b'{}')
+
+    await store.release('key')
+    assert (await store.begin('key', 'fingerprint')).response is not None, (
+        'Make sure that completed responses are not released'
+    )
+
+    expired = DatabaseIdempotencyStore(async_session, ttl=0, lock_timeout=0)
+    assert await expired.begin('stale', 'fingerprint') is None
+    assert await expired.begin('stale', 'other') is None, (
+        'Make sure that a key of an attempt that lost its lock can be claimed again'
+    )
+    await expired.release('stale')
+    assert await expired.begin('stale', 'fingerprint') is None
+
+
+@pytest.mark.asyncio
+async def test_04_auth_responses_are_not_stored(
+        test_app: FastAPI,
+        async_client: AsyncClient,
+        auth_async_client: AsyncClient
+):
+    input_data = {
+        'username': 'test_user_auth',
+        'password': 'test_password_auth',
+        'email': 'test_user_auth@example.com'
+    }
+    headers = {'Idempotency-Key': 'idempotent-token'}
+    url = test_app.url_path_for('get_token_for_user')
+    for _ in range(2):
+        response = await async_client.post(url, json=input_data, headers=headers)
+        assert response.status_code == HTTPStatus.OK
+        assert 'Idempotent-Replayed' not in response.headers, (
+            'Make sure that tokens are not stored by the idempotency middleware'
+        )
+
+
+@pytest.mark.asyncio
+async def test_05_retried_signup_replays_created_user(
+        test_app: FastAPI,
+        async_client: AsyncClient
+):
+    input_data = {
+        'username': 'idempotent_user',
+        'password': 'idempotent_password',
+        'email': 'idempotent_user@example.com'
+    }
+    headers = {'Idempotency-Key': 'idempotent-signup'}
+    url = test_app.url_path_for('create_user')
+    first = await async_client.post(url, json=input_data, headers=headers)
+    assert first.status_code == HTTPStatus.CREATED
+    retry = await async_client.post(url, json=input_data, headers=headers)
+    assert retry.status_code == HTTPStatus.CREATED and retry.json() == first.json(), (
+        'Check that a retried signup returns the created user instead of 400'
+    )
+    assert retry.headers.get('Idempotent-Replayed') == 'true'
@@ -0,0 +1,26 @@
+import uuid
+
+import pytest
+
+from src.core.config import app_settings
+from src.models.ids import uuid7, id_generator
+
+
+def test_01_uuid7_is_time_ordered():
+    ids = [uuid7() for _ in range(5000)]
+    assert all(value.version == 7 and value.variant == uuid.RFC_4122 for value in ids)
+    assert ids == sorted(ids), (
+        'Make sure that ids generated later sort after earlier ones'
+    )
+    assert [value.hex for value in ids] == sorted(value.hex for value in ids), (
+        'Make sure that CHAR(32) storage keeps time order'
+    )
+
+
+def test_02_id_generator_per_table(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(app_settings, 'id_generators', {'games': 'uuid1'})
+    assert id_generator('games') is uuid.uuid1
+    assert id_generator('genres') is uuid7
+    monkeypatch.setattr(app_settings, 'id_generators', {'games': 'uuid9'})
+    with pytest.raises(ValueError):
+        id_generator('games')
@@ -0,0 +1,59 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.models.models import (
+    Genre,
+    GenreGame,
+    DeveloperGame,
+    PublisherGame,
+    PlatformGame
+)
+
+
+async def query_plan(engine: AsyncEngine, statement) -> str:
+    compiled = statement.compile(dialect=engine.dialect)
+    parameters = []
+    for name in compiled.positiontup:
+        processor = compiled.binds[name].type.dialect_impl(engine.dialect).bind_processor(engine.dialect)
+        value = compiled.params[name]
+        parameters.append(processor(value) if processor else value)
+    async with engine.connect() as connection:
+        results = await connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', tuple(parameters))
+        return '\n'.join(row[-1] for row in results)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('link', [GenreGame, DeveloperGame, PublisherGame, PlatformGame])
+async def test_01_association_game_id_lookup_uses_index(
+        engine: AsyncEngine,
+        create_base,
+        link
+):
+    entity_column = next(column for column in link.__table__.primary_key if column.name != 'game_id')
+    statement = select(entity_column).where(link.game_id == uuid.uuid1())
+    plan = await query_plan(engine, statement)
+    assert f'ix_{link.__tablename__}_game_id_{entity_column.name}' in plan, (
+        f'Make sure that relations of a game are looked up by index, plan was: {plan}'
+    )
+    assert 'SCAN' not in plan
+
+
+@pytest.mark.asyncio
+async def test_02_game_genres_join_uses_index(
+        engine: AsyncEngine,
+        create_base
+):
+    statement = select(
+        Genre
+    ).join(
+        GenreGame, GenreGame.genre_id == Genre.id
+    ).where(
+        GenreGame.game_id == uuid.uuid1()
+    )
+    plan = await query_plan(engine, statement)
+    assert 'ix_genres_games_game_id_genre_id' in plan, (
+        f'Make sure that genres of a game are joined through the game_id index, plan was: {plan}'
+    )
@@ -0,0 +1,46 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import app_settings
+from src.core.metrics import metrics
+from src.core.middleware import InFlightRequests
+from src.services.warmup import warm_up
+
+
+@pytest.mark.asyncio
+async def test_01_warm_up(engine: AsyncEngine, create_base):
+    duration = await warm_up(engine, connections=2)
+    assert duration > 0
+    assert metrics.gauge('app_warmup_seconds').value() == duration, (
+        'Make sure that warmup duration is reported in metrics'
+    )
+
+
+@pytest.mark.asyncio
+async def test_02_in_flight_drain():
+    tracker = InFlightRequests()
+    assert await tracker.drain(timeout=0.1)
+    tracker.enter()
+    assert not await tracker.drain(timeout=0.05), (
+        'Make sure that drain waits for requests in flight'
+    )
+    asyncio.get_running_loop().call_later(0.05, tracker.leave)
+    assert await tracker.drain(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_03_metrics(async_client: AsyncClient, test_app: FastAPI, monkeypatch: pytest.MonkeyPatch):
+    url = test_app.url_path_for('get_metrics')
+    response = await async_client.get(url)
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Make sure that metrics are not served unless enabled'
+    )
+    monkeypatch.setattr(app_settings, 'metrics_enabled', True)
+    response = await async_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert 'app_warmup_seconds' in response.text
@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.schemas import games as games_schema
+from src.schemas import genres as genre_schema
+from src.services.base import game_crud, genre_crud
+from src.services.lookups import lookup_stats
+from .test_round_trips import count_statements
+
+
+@pytest.mark.asyncio
+async def test_01_loaded_genre_is_reused(
+        engine: AsyncEngine,
+        gen_async_session: AsyncSession,
+        create_base
+):
+    genre = await genre_crud.create(
+        db=gen_async_session,
+        obj_in=genre_schema.GenreCreate(name='lookup_genre', description='lookup_genre')
+    )
+    stats = dict(lookup_stats(gen_async_session))
+    with count_statements(engine) as statements:
+        by_id = await genre_crud.get_by_id(db=gen_async_session, genre_id=str(genre.id))
+        by_name = await genre_crud.get_by_name(db=gen_async_session, obj_in={'name': 'lookup_genre'})
+        by_slug = await genre_crud.get_by_slug(db=gen_async_session, slug='lookup-genre')
+    assert statements == [], f'Make sure that loaded genres are not queried again, got {statements}'
+    assert by_id is genre and by_name is genre and by_slug is genre
+    assert lookup_stats(gen_async_session)['reused'] == stats['reused'] + 3
+    assert lookup_stats(gen_async_session)['query'] == stats['query']
+
+
+@pytest.mark.asyncio
+async def test_02_incomplete_or_changed_rows_are_queried(
+        engine: AsyncEngine,
+        gen_async_session: AsyncSession,
+        create_base
+):
+    genre = await genre_crud.create(
+        db=gen_async_session,
+        obj_in=genre_schema.GenreCreate(name='lookup_expired_genre', description='lookup_expired_genre')
+    )
+    gen_async_session.expire(genre, ['games_count'])
+    with count_statements(engine) as statements:
+        found = await genre_crud.get_by_id(db=gen_async_session, genre_id=str(genre.id))
+    assert statements == ['SELECT'], f'Make sure that a genre without games_count is queried, got {statements}'
+    assert found is genre and genre.games_count == 0
+
+    genre.description = 'changed'
+    with count_statements(engine) as statements:
+        await genre_crud.get_by_slug(db=gen_async_session, slug=genre.slug)
+    assert 'SELECT' in statements, f'Make sure that a changed genre is queried, got {statements}'
+
+    with count_statements(engine) as statements:
+        missing = await genre_crud.get_by_name(db=gen_async_session, obj_in={'name': 'lookup_missing_genre'})
+    assert missing is None and statements == ['SELECT']
+
+
+@pytest.mark.asyncio
+async def test_03_game_lookups_need_loaded_relations(
+        engine: AsyncEngine,
+        gen_async_session: AsyncSession,
+        create_base
+):
+    obj_in = games_schema.GameCreate(
+        name='Lookup_Game',
+        price='10.00',
+        description='lookup_game',
+        release_date='01.01.2020',
+        genres=[],
+        developers=[],
+        publishers=[],
+        platforms=[]
+    )
+    game = await game_crud.create(db=gen_async_session, obj_in=obj_in)
+    with count_statements(engine) as statements:
+        by_name = await game_crud.get_by_name(db=gen_async_session, obj_in={'name': 'lookup_game'})
+        by_id = await game_crud.get_by_id(db=gen_async_session, game_id=str(game.id))
+    assert statements == [], f'Make sure that a loaded game is not queried again, got {statements}'
+    assert by_name is game and by_id is game
+
+    gen_async_session.expire(game, ['platforms'])
+    with count_statements(engine) as statements:
+        await game_crud.get_by_id(db=gen_async_session, game_id=str(game.id))
+    assert statements and statements[0] == 'SELECT', (
+        f'Make sure that a game without loaded relations is queried, got {statements}'
+    )
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.models.models import OutboxEvent
+from src.services.events import CREATE, DELETE
+from src.services.leases import WORKER_ID
+from src.services.outbox import OutboxRelay
+
+
+def relay_for(async_session: async_sessionmaker, origin: str) -> OutboxRelay:
+    return OutboxRelay(
+        async_session,
+        origin=origin,
+        poll_interval=1,
+        notified_poll_interval=1,
+        retention=60,
+        purge_interval=60
+    )
+
+
+@pytest.mark.asyncio
+async def test_01_changes_are_relayed_to_other_workers(
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI,
+        async_session: async_sessionmaker
+):
+    other_worker = relay_for(async_session, 'other_worker')
+    this_worker = relay_for(async_session, WORKER_ID)
+    await other_worker.seek_head()
+    await this_worker.seek_head()
+
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'outbox_genre', 'description': 'outbox_genre_description'}
+    )
+    genre_id = response.json()['id']
+    await auth_async_admin_client.delete(test_app.url_path_for('delete_genre', genre_id=genre_id))
+
+    async with async_session() as db:
+        rows = (await db.execute(
+            select(OutboxEvent).where(OutboxEvent.entity_id == genre_id).order_by(OutboxEvent.id)
+        )).scalars().all()
+    assert [(row.action, row.origin) for row in rows] == [(CREATE, WORKER_ID), (DELETE, WORKER_ID)], (
+        'Make sure that changes are written to the outbox with their transaction'
+    )
+    assert rows[0].data['slug'] == 'outbox-genre'
+
+    relayed = await other_worker.poll()
+    assert [(event.entity_id, event.action) for event in relayed] == [(genre_id, CREATE), (genre_id, DELETE)]
+    assert await other_worker.poll() == [], 'Make sure that each worker keeps its cursor'
+    assert await this_worker.poll() == [], 'Make sure that a worker does not relay its own changes'
+
+
+@pytest.mark.asyncio
+async def test_02_late_commits_behind_the_cursor_are_relayed(
+        async_session: async_sessionmaker,
+        create_base
+):
+    relay = relay_for(async_session, 'late_worker')
+    await relay.seek_head()
+    head = relay.cursor
+
+    def row(offset: int) -> OutboxEvent:
+        return OutboxEvent(
+            id=head + offset,
+            origin='writer',
+            entity='genres',
+            action=CREATE,
+            entity_id=f'late_{offset}',
+            data={},
+            created_at=datetime.utcnow()
+        )
+
+    async with async_session() as db:
+        db.add_all([row(1), row(3)])
+        await db.commit()
+    assert [event.entity_id for event in await relay.poll()] == ['late_1', 'late_3']
+    async with async_session() as db:
+        db.add(row(2))
+        await db.commit()
+    assert [event.entity_id for event in await relay.poll()] == ['late_2'], (
+        'Make sure that an id committed after a higher one is still relayed'
+    )
+    assert relay.cursor == head + 3
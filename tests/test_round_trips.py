@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.schemas import games as games_schema
+from src.schemas import genres as genre_schema
+from src.services.base import game_crud, genre_crud
+
+
+@contextmanager
+def count_statements(engine: AsyncEngine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.mark.asyncio
+async def test_01_genre_writes_do_not_reload(
+        engine: AsyncEngine,
+        gen_async_session: AsyncSession,
+        create_base
+):
+    with count_statements(engine) as statements:
+        genre = await genre_crud.create(
+            db=gen_async_session,
+            obj_in=genre_schema.GenreCreate(name='round_trip_genre', description='round_trip_genre')
+        )
+    assert statements == ['INSERT', 'INSERT'], (
+        f'Make sure that creating a genre takes one statement and the outbox row, got {statements}'
+    )
+    assert genre.games_count == 0 and genre.slug == 'round-trip-genre'
+
+    with count_statements(engine) as statements:
+        genre = await genre_crud.patch(
+            db=gen_async_session,
+            genre_obj=genre,
+            obj_in={'description': 'renamed_round_trip_genre'}
+        )
+    assert statements == ['UPDATE', 'SELECT', 'INSERT'], (
+        'Make sure that patching a genre takes one statement, the lookup of games embedding it '
+        f'and the outbox row, got {statements}'
+    )
+    assert genre.games_count == 0 and genre.version == 2
+
+
+@pytest.mark.asyncio
+async def test_02_game_create_does_not_reload_relations(
+        engine: AsyncEngine,
+        gen_async_session: AsyncSession,
+        create_base
+):
+    await genre_crud.create(
+        db=gen_async_session,
+        obj_in=genre_schema.GenreCreate(name='round_trip_game_genre', description='round_trip_game_genre')
+    )
+    obj_in = games_schema.GameCreate(
+        name='round_trip_game',
+        price='10.00',
+        description='round_trip_game',
+        release_date='01.01.2020',
+        genres=['round_trip_game_genre'],
+        developers=[],
+        publishers=[],
+        platforms=[]
+    )
+    with count_statements(engine) as statements:
+        game = await game_crud.create(db=gen_async_session, obj_in=obj_in)
+    assert 'SELECT' not in statements[statements.index('INSERT'):], (
+        f'Make sure that a created game is not reloaded from the database, got {statements}'
+    )
+    assert [genre.name for genre in game.genres] == ['round_trip_game_genre']
+    assert game.platforms == []
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.services.similar import SimilarGames, similar_games
+
+
+def test_01_rare_shared_features_rank_higher():
+    index = SimilarGames(weights={'genres': 1.0, 'developers': 2.0, 'platforms': 0.5}, max_posting=1000)
+    links = [('game', 'genres', 'rpg'), ('game', 'developers', 'studio'), ('game', 'platforms', 'pc')]
+    links += [('same_studio', 'developers', 'studio'), ('same_studio', 'platforms', 'pc')]
+    links += [('same_genre', 'genres', 'rpg'), ('same_genre', 'platforms', 'pc')]
+    links += [(f'pc_game_{number}', 'platforms', 'pc') for number in range(20)]
+    index.build(links)
+    ranked = [game_id for game_id, _ in index.similar('game', limit=3)]
+    assert ranked[:2] == ['same_studio', 'same_genre'], (
+        'Make sure that a shared developer weighs more than a shared genre'
+    )
+    assert 'game' not in ranked
+
+    index.set_game('same_genre', [('genres', 'rpg'), ('developers', 'studio'), ('platforms', 'pc')])
+    assert index.similar('game', limit=1)[0] == ('same_genre', pytest.approx(1.0)), (
+        'Make sure that updated relations of a game are ranked without a rebuild'
+    )
+    index.remove_feature(('developers', 'studio'))
+    index.remove_game('same_genre')
+    assert [game_id for game_id, _ in index.similar('game', limit=1)] == ['same_studio']
+
+
+@pytest.mark.asyncio
+async def test_02_similar_games_endpoint(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI
+):
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'similar_genre', 'description': 'similar_genre_description'}
+    )
+    genre_id = response.json()['id']
+    game_ids = []
+    for number, genres in enumerate((['similar_genre'], ['similar_genre'], [])):
+        response = await auth_async_admin_client.post(
+            test_app.url_path_for('create_game'),
+            json={
+                'name': f'similar_game_{number}',
+                'price': 10,
+                'description': 'similar_game_description',
+                'release_date': '01.01.2020',
+                'genres': genres,
+                'developers': [],
+                'publishers': [],
+                'platforms': []
+            }
+        )
+        game_ids.append(response.json()['id'])
+    response = await auth_async_client.get(test_app.url_path_for('get_game_similar', game_id=game_ids[0]))
+    assert response.status_code == HTTPStatus.OK
+    assert [item['game']['game_id'] for item in response.json()] == [game_ids[1]], (
+        'Make sure that similar games share relations with the game'
+    )
+    response = await auth_async_admin_client.patch(
+        test_app.url_path_for('patch_game', game_id=game_ids[2]),
+        json={'genres': ['similar_genre']}
+    )
+    assert response.status_code == HTTPStatus.OK
+    response = await auth_async_client.get(test_app.url_path_for('get_game_similar', game_id=game_ids[0]))
+    assert {item['game']['game_id'] for item in response.json()} == set(game_ids[1:]), (
+        'Make sure that similar games follow relation changes without a rebuild'
+    )
+    response = await auth_async_client.get(test_app.url_path_for('get_game_similar', game_id='missing'))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+    for game_id in game_ids:
+        await auth_async_admin_client.delete(test_app.url_path_for('delete_game', game_id=game_id))
+    await auth_async_admin_client.delete(test_app.url_path_for('delete_genre', genre_id=genre_id))
+    assert similar_games.similar(game_ids[0]) == [], (
+        'Make sure that deleted games leave the similar games index'
+    )
@@ -0,0 +1,26 @@
+from src.core.profiling import profile_imports
+
+LAZY_MODULES = (
+    'fastapi_mail',
+    'jinja2',
+    'aiosmtplib',
+    'asyncpg',
+)
+
+
+def test_01_config_import_is_light():
+    profile = profile_imports('src.core.config')
+    for module in LAZY_MODULES:
+        assert not profile.is_imported(module), (
+            f'Make sure that importing `src.core.config` does not import `{module}`'
+        )
+
+
+def test_02_app_import_defers_heavy_subsystems():
+    profile = profile_imports('src.main')
+    for module in LAZY_MODULES:
+        assert not profile.is_imported(module), (
+            f'Make sure that importing `src.main` does not import `{module}`, '
+            'it must be initialized lazily'
+        )
+
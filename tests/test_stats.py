@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.models.models import Game
+from src.services.stats import release_month
+from .test_indexes import query_plan
+
+
+async def create_game(client: AsyncClient, test_app: FastAPI, name: str, genres: list[str]) -> str:
+    response = await client.post(
+        test_app.url_path_for('create_game'),
+        json={
+            'name': name,
+            'price': 30,
+            'discount': 10,
+            'description': f'{name}_description',
+            'release_date': '15.03.1999',
+            'genres': genres,
+            'developers': [],
+            'publishers': [],
+            'platforms': []
+        }
+    )
+    return response.json()['id']
+
+
+@pytest.mark.asyncio
+async def test_01_stats(
+        auth_async_client: AsyncClient,
+        auth_async_admin_client: AsyncClient,
+        test_app: FastAPI
+):
+    response = await auth_async_admin_client.post(
+        test_app.url_path_for('create_genre'),
+        json={'name': 'stats_genre', 'description': 'stats_genre_description'}
+    )
+    genre_id = response.json()['id']
+    game_ids = [await create_game(auth_async_admin_client, test_app, 'stats_game_0', ['stats_genre'])]
+    url = test_app.url_path_for('get_games_per_entity', entity='genres')
+    response = await auth_async_client.get(url)
+    assert response.status_code == HTTPStatus.FORBIDDEN, (
+        'Check that GET request to `/api/v1/stats/games-per/genres` by not staff returns 403 status code'
+    )
+    response = await auth_async_admin_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    counts = {row['id']: row['games_count'] for row in response.json()}
+    assert counts[genre_id] == 1
+
+    game_ids.append(await create_game(auth_async_admin_client, test_app, 'stats_game_1', ['stats_genre']))
+    response = await auth_async_admin_client.get(url)
+    counts = {row['id']: row['games_count'] for row in response.json()}
+    assert counts[genre_id] == 2, (
+        'Make sure that cached statistics are refreshed after games change'
+    )
+
+    response = await auth_async_admin_client.get(test_app.url_path_for('get_release_stats'))
+    months = {row['month']: row['games'] for row in response.json()}
+    assert months['1999-03'] == 2
+
+    response = await auth_async_admin_client.get(test_app.url_path_for('get_price_stats'))
+    prices = response.json()
+    assert prices['games'] >= 2 and prices['discounted_games'] >= 2
+
+    for game_id in game_ids:
+        await auth_async_admin_client.delete(test_app.url_path_for('delete_game', game_id=game_id))
+    await auth_async_admin_client.delete(test_app.url_path_for('delete_genre', genre_id=genre_id))
+
+
+@pytest.mark.asyncio
+async def test_02_release_histogram_uses_index(
+        engine: AsyncEngine,
+        create_base
+):
+    month = release_month(engine.dialect.name).label('month')
+    statement = select(month, func.count()).select_from(Game).group_by(month)
+    plan = await query_plan(engine, statement)
+    assert 'COVERING INDEX ix_games_release_date' in plan, (
+        f'Make sure that the release histogram is read from the release date index, plan was: {plan}'
+    )
@@ -7,7 +7,7 @@ from httpx import AsyncClient
 from fastapi import FastAPI
 
 from src.models.models import User
-from src.main import fast_mail
+from src.core.mail import get_fast_mail
 from src.schemas import users as users_schema
 
 
@@ -146,6 +146,7 @@ async def test_05_users_forget_and_reset_password(
         'email': f'{new_user.email}'
     }
     url_forget_password = test_app.url_path_for('forget_password')
+    fast_mail = get_fast_mail()
     fast_mail.config.SUPPRESS_SEND = 1
     with fast_mail.record_messages() as outbox:
         response = await async_client.post(url_forget_password, json=data)
@@ -0,0 +1,34 @@
+import uuid
+
+import pytest
+from sqlalchemy import Column, MetaData, Table, create_engine, select
+from sqlalchemy.dialects import postgresql
+
+from src.models.types import CompactUUIDType
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_01_compact_uuid_reads_both_storage_forms(binary: bool):
+    table = Table('items', MetaData(), Column('id', CompactUUIDType(binary=binary), primary_key=True))
+    engine = create_engine('sqlite://')
+    table.metadata.create_all(engine)
+    hex_id, bytes_id = uuid.uuid1(), uuid.uuid1()
+    with engine.begin() as connection:
+        connection.exec_driver_sql('INSERT INTO items (id) VALUES (?), (?)', (hex_id.hex, bytes_id.bytes))
+        stored = set(connection.execute(select(table.c.id)).scalars())
+        assert stored == {hex_id, bytes_id}, (
+            'Make sure that ids are read while SQLite data is converted between storage forms'
+        )
+        own_id = bytes_id if binary else hex_id
+        assert connection.execute(select(table.c.id).where(table.c.id == own_id)).scalar_one() == own_id
+
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_02_compact_uuid_lookup_binds_once_on_postgres(binary: bool):
+    table = Table('items', MetaData(), Column('id', CompactUUIDType(binary=binary), primary_key=True))
+    statement = select(table.c.id).where(table.c.id == uuid.uuid1())
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert list(compiled.params) == ['id_1'], (
+        f'Make sure that id lookups bind a single native uuid on Postgres, got {compiled}'
+    )